@@ -0,0 +1,65 @@
+"""
+요청 단위 데이터 로더 (DataLoader / identity map 방식).
+- 한 요청 안에서 같은 (종류, 키) 조회는 처음 한 번만 DB에 가고, 이후에는 메모리 결과를 돌려준다.
+- 현재 요청의 로더는 contextvar로 찾는다. (서비스 함수 시그니처에 request를 넘기지 않아도 됨)
+- 로더가 없으면(배치/관리명령/테스트) load()는 그냥 fetch()를 호출한다.
+- 캐시된 결과는 여러 호출자가 공유하므로 읽기 전용으로 다룬다.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RequestLoader:
+    def __init__(self):
+        self._data: dict[tuple[str, Hashable], object] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, kind: str, key: Hashable, fetch: Callable[[], T]) -> T:
+        cache_key = (kind, key)
+        if cache_key in self._data:
+            self.hits += 1
+            return self._data[cache_key]  # type: ignore[return-value]
+        self.misses += 1
+        value = fetch()
+        self._data[cache_key] = value
+        return value
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+_current: ContextVar[Optional[RequestLoader]] = ContextVar("request_loader", default=None)
+
+
+def current_loader() -> Optional[RequestLoader]:
+    return _current.get()
+
+
+def load(kind: str, key: Hashable, fetch: Callable[[], T]) -> T:
+    """현재 요청 로더가 있으면 (kind, key)로 재사용, 없으면 fetch() 그대로."""
+    loader = _current.get()
+    if loader is None:
+        return fetch()
+    return loader.load(kind, key, fetch)
+
+
+def clear_request_cache() -> None:
+    """현재 요청 로더 비우기 (같은 요청 안에서 원천 데이터가 바뀐 경우)"""
+    loader = _current.get()
+    if loader is not None:
+        loader.clear()
+
+
+@contextmanager
+def request_scope(loader: Optional[RequestLoader] = None):
+    """with 블록 동안 loader(없으면 새로 생성)를 현재 로더로 지정"""
+    loader = loader or RequestLoader()
+    token = _current.set(loader)
+    try:
+        yield loader
+    finally:
+        _current.reset(token)
@@ -1,6 +1,7 @@
 from django.http import Http404, HttpResponseRedirect
 from django.contrib.auth import logout
 from django.utils.http import urlencode
+from common.loader import request_scope
 from common.models import Branch
 
 
@@ -127,3 +128,23 @@ class BranchGuardMiddleware:
             raise Http404("invalid branch")
 
         return self.get_response(request)
+
+
+class RequestLoaderMiddleware:
+    """
+    조회 요청(GET/HEAD)마다 요청 단위 로더를 만들어 request.loader로 붙인다.
+    - 같은 요청 안의 대상 직원/근무표·근태기록/근로모듈/미영업일 조회는 한 번만 DB에 간다.
+    - 저장 요청(POST 등)은 중간에 원천이 바뀌므로 로더를 쓰지 않는다.
+    """
+
+    SAFE_METHODS = ("GET", "HEAD")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in self.SAFE_METHODS:
+            return self.get_response(request)
+        with request_scope() as loader:
+            request.loader = loader
+            return self.get_response(request)
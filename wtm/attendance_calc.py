@@ -8,8 +8,11 @@
 #    DRF API, Django 템플릿 뷰, 백오피스 커맨드, 배치 등 어디서든 같은 결과를 재사용할 수 있다.
 # -----------------------------------------------------------------------------
 
+import threading
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from django.utils import timezone
 from common.context_processors import STATUS_LABELS
 from typing import List, Optional, Sequence, Tuple, TYPE_CHECKING
@@ -20,7 +23,10 @@ if TYPE_CHECKING:
 # 타입 별칭: (start_dt, end_dt) 쌍의 리스트
 Segment = Tuple[datetime, datetime]
 
-@dataclass
+# 타입 별칭: 자정 기준 (start_sec, end_sec) 쌍
+SecondSegment = Tuple[int, int]
+
+@dataclass(slots=True)
 class LogsDay:
     checkin: Optional[str]             # "HH:mm" (최초)
     checkout: Optional[str]            # "HH:mm" (최종)
@@ -60,6 +66,159 @@ def to_dt(day: date, hhmmss: Optional[str]) -> Optional[datetime]:
         return None
 
 
+def to_seconds(hhmmss: Optional[str]) -> Optional[int]:
+    """
+    'HH:mm:ss' 또는 'HH:mm' 문자열을 자정 기준 초(int)로 변환.
+    - 판정 규칙은 to_dt와 동일 (None / "-" / 형식 오류 → None)
+    """
+    if hhmmss is None:
+        return None
+
+    time_str = hhmmss.strip()
+    if time_str in ("", "-"):
+        return None
+
+    try:
+        if len(time_str) == 5:  # HH:mm
+            time_str += ":00"
+        elif len(time_str) != 8:  # HH:mm:ss 아니면 에러 취급
+            return None
+
+        t = datetime.strptime(time_str, "%H:%M:%S").time()
+        return t.hour * 3600 + t.minute * 60 + t.second
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class CompiledModule:
+    """
+    근로모듈 1건을 '자정 기준 초' 구간으로 미리 계산해 둔 불변 표현.
+    - paid: 유급 세그먼트 (시업~종업 - 휴게), 시간순
+    - paid_total_seconds: 유급 세그먼트 전체 길이
+    - last_paid_end: 마지막 유급 종료 시각(초), 유급 세그먼트가 없으면 None
+    """
+    module_id: Optional[int]
+    cat: Optional[str]
+    start: Optional[int]
+    end: Optional[int]
+    paid: Tuple[SecondSegment, ...]
+    paid_total_seconds: int
+    last_paid_end: Optional[int]
+
+
+_MISSING = object()
+
+
+def module_seconds(module, name: str) -> Optional[int]:
+    """
+    근로모듈 시각 1개(name: start/end/rest1_start/...)를 자정 기준 초로.
+    - 저장된 Module은 분 컬럼(<name>_min)을 그대로 쓴다. (문자열 파싱 없음)
+    - 분 컬럼이 없는 모듈-유사 객체는 <name>_time 문자열을 파싱한다.
+    """
+    minutes = getattr(module, f"{name}_min", _MISSING)
+    if minutes is not _MISSING:
+        return None if minutes is None else minutes * 60
+    return to_seconds(getattr(module, f"{name}_time", None))
+
+
+def _build_paid_seconds(module: "Module") -> Tuple[SecondSegment, ...]:
+    """
+    하나의 모듈(근무표)에서 '유급 근로 세그먼트'를 초 단위로 생성.
+    - 근로 전체 구간: (start_time ~ end_time)
+    - 휴게 구간: (rest1_start~rest1_end), (rest2_start~rest2_end) [0~2개]
+    - 유급 = 전체 - 휴게 (겹침/순서는 정렬·클리핑으로 정리)
+    """
+    if not module:
+        return ()
+
+    # 근로 구간
+    S = module_seconds(module, "start")
+    E = module_seconds(module, "end")
+    # 비정상 혹은 0분 근로는 유급세그먼트 없음
+    if S is None or E is None or E <= S:
+        return ()
+
+    # 휴게 구간(있으면 추가)
+    rests: List[SecondSegment] = []
+    r1s, r1e = module_seconds(module, "rest1_start"), module_seconds(module, "rest1_end")
+    r2s, r2e = module_seconds(module, "rest2_start"), module_seconds(module, "rest2_end")
+    if r1s is not None and r1e is not None and r1e > r1s: rests.append((r1s, r1e))
+    if r2s is not None and r2e is not None and r2e > r2s: rests.append((r2s, r2e))
+
+    # 1) 근로 전체에서 시작
+    segments: List[SecondSegment] = [(S, E)]
+
+    # 2) 휴게 구간들을 시간순으로 적용하면서, 그 부분을 잘라낸다.
+    for rs, re in sorted(rests, key=lambda x: x[0]):
+        new_segments: List[SecondSegment] = []
+        for a, b in segments:
+            # (a,b)와 (rs,re)가 겹치지 않으면 그대로 보존
+            if re <= a or b <= rs:
+                new_segments.append((a, b))
+                continue
+
+            # 겹치는 경우, '좌측 잔여' / '우측 잔여'로 잘라서 추가
+            # 예: (09:00~18:00) - (12:00~13:00) => (09:00~12:00), (13:00~18:00)
+            if rs > a:
+                new_segments.append((a, rs))
+            if re < b:
+                new_segments.append((re, b))
+        segments = new_segments
+
+        # 매 스텝 이후에도 (end > start)만 남도록 자연히 보장됨
+
+    # 3) 혹시 모를 0분/역전구간 제거 (안전망)
+    return tuple((a, b) for (a, b) in segments if b > a)
+
+
+# 컴파일된 모듈 캐시: (module_id, mod_date) → CompiledModule
+# - 모듈 수정 시 mod_date가 갱신되므로 키가 자연스럽게 바뀐다(이전 버전은 참조되지 않음).
+# - 지점당 모듈 수십 개 수준이므로 상한을 넘으면 통째로 비운다.
+_COMPILED_CACHE: dict = {}
+_COMPILED_CACHE_MAX = 2048
+
+
+def compile_module(module: "Module | None") -> Optional[CompiledModule]:
+    """
+    모듈을 CompiledModule로 변환 (모듈 버전별 1회만 계산).
+    - id/mod_date가 있는 저장된 Module이면 (id, mod_date) 키로 캐시
+    - SimpleNamespace 등 id가 없는 모듈-유사 객체는 캐시 없이 매번 계산
+    """
+    if not module:
+        return None
+
+    module_id = getattr(module, "id", None)
+    key = None
+    if module_id is not None:
+        key = (module_id, getattr(module, "mod_date", None))
+        compiled = _COMPILED_CACHE.get(key)
+        if compiled is not None:
+            return compiled
+
+    paid = _build_paid_seconds(module)
+    compiled = CompiledModule(
+        module_id=module_id,
+        cat=getattr(module, "cat", None),
+        start=module_seconds(module, "start"),
+        end=module_seconds(module, "end"),
+        paid=paid,
+        paid_total_seconds=sum(b - a for a, b in paid),
+        last_paid_end=max((b for _, b in paid), default=None),
+    )
+
+    if key is not None:
+        if len(_COMPILED_CACHE) >= _COMPILED_CACHE_MAX:
+            _COMPILED_CACHE.clear()
+        _COMPILED_CACHE[key] = compiled
+    return compiled
+
+
+def clear_compiled_modules() -> None:
+    """컴파일된 모듈 캐시 비우기 (테스트/배치용)."""
+    _COMPILED_CACHE.clear()
+
+
 def make_paid_segments(day: date, module: "Module") -> List[Segment]:
     """
     하나의 모듈(근무표)에서 '유급 근로 세그먼트' 리스트를 생성.
@@ -231,11 +390,14 @@ def compute_holiday_seconds(
     return total
 
 
-def compute_seconds_status_for_day(record_day: date, module: "Module | None", log: LogsDay) -> Metrics:
+def compute_seconds_status_for_day(
+    record_day: date, module: "Module | None", log: LogsDay, *, now: Optional[datetime] = None,
+) -> Metrics:
     """
     하루(record_day)에 대해 초(second) 지표 + 상태코드를 계산한다.
     - I/O 없음 (순수 함수)
     - 휴게는 유급 세그먼트에서 제외되어 자연스럽게 반영됨
+    - now: 과거/오늘/미래 판정 기준시각 (생략 시 timezone.now())
     """
     ######### 공통 ##########
 
@@ -289,7 +451,7 @@ def compute_seconds_status_for_day(record_day: date, module: "Module | None", lo
     ######### 상태 정의 ##########
 
     # 오늘 이후의 상태 판정을 위한 변수 설정
-    now = timezone.now()
+    now = now or timezone.now()
     today = now.date()
     is_today = (record_day == today)
     is_future = (record_day > today)
@@ -414,4 +576,520 @@ def compute_seconds_status_for_day(record_day: date, module: "Module | None", lo
         status=status_label,
         status_codes=status_codes,
         status_labels=status_label_list,
-    )
\ No newline at end of file
+    )
+
+# -----------------------------------------------------------------------------
+# 정수(초) 엔진
+# - 위 compute_seconds_status_for_day와 '동일한 규칙'을 자정 기준 초(int)로만 계산한다.
+# - 출퇴근 시각도 문자열/datetime 대신 초(int)로 받으므로, 월 집계처럼
+#   사용자 × 일자 루프에서 datetime 생성/파싱 비용이 들지 않는다.
+# -----------------------------------------------------------------------------
+
+def paid_seconds_before(t: Optional[int], paid: Sequence[SecondSegment]) -> int:
+    """seconds_before의 초 버전: 시각 t '이전'의 유급 근로 누적 초 (지각)."""
+    if t is None:
+        return 0
+    total = 0
+    for a, b in paid:
+        if t <= a:
+            continue
+        if t >= b:
+            total += b - a
+        else:
+            total += t - a
+            break
+    return total
+
+
+def paid_seconds_after(t: Optional[int], paid: Sequence[SecondSegment]) -> int:
+    """seconds_after의 초 버전: 시각 t '이후'의 유급 근로 누적 초 (조퇴)."""
+    if t is None:
+        return 0
+    total = 0
+    for a, b in paid:
+        if t >= b:
+            continue
+        if t <= a:
+            total += b - a
+        else:
+            total += b - t
+    return total
+
+
+def paid_intersection_seconds(a: Optional[int], b: Optional[int], paid: Sequence[SecondSegment]) -> int:
+    """intersection_seconds의 초 버전: 체류 구간 [a, b) ∩ 유급 세그먼트 총 초."""
+    if a is None or b is None or b <= a:
+        return 0
+    total = 0
+    for s, e in paid:
+        x = a if a > s else s
+        y = b if b < e else e
+        if y > x:
+            total += y - x
+    return total
+
+
+def time_to_seconds(t) -> int:
+    """datetime/time의 시:분:초를 자정 기준 초로 변환 (마이크로초는 버림)."""
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+# 날짜 구분 (기준시각 대비 과거/오늘/미래)
+DAY_PAST = 0
+DAY_TODAY = 1
+DAY_FUTURE = 2
+
+
+def classify_day(record_day: date, today: date) -> int:
+    """기준일(today) 대비 record_day의 구분 (DAY_PAST / DAY_TODAY / DAY_FUTURE)."""
+    if record_day < today:
+        return DAY_PAST
+    if record_day == today:
+        return DAY_TODAY
+    return DAY_FUTURE
+
+
+# 상태코드 비트플래그 (셀마다 리스트를 만들지 않고 정수 하나로 보관)
+# - 여러 코드가 함께 붙는 경우는 소정근로의 LATE/EARLY/OVERTIME 조합뿐이며, 코드 순서는 아래 정의 순서를 따른다.
+ST_NOSCHEDULE = 1 << 0
+ST_ERROR = 1 << 1
+ST_NORMAL = 1 << 2
+ST_HOLIDAY = 1 << 3
+ST_OFF = 1 << 4
+ST_PAY = 1 << 5
+ST_NOPAY = 1 << 6
+ST_LATE = 1 << 7
+ST_EARLY = 1 << 8
+ST_OVERTIME = 1 << 9
+
+STATUS_FLAGS = {
+    "NOSCHEDULE": ST_NOSCHEDULE,
+    "ERROR": ST_ERROR,
+    "NORMAL": ST_NORMAL,
+    "HOLIDAY": ST_HOLIDAY,
+    "OFF": ST_OFF,
+    "PAY": ST_PAY,
+    "NOPAY": ST_NOPAY,
+    "LATE": ST_LATE,
+    "EARLY": ST_EARLY,
+    "OVERTIME": ST_OVERTIME,
+}
+
+_ST_REGULAR = {
+    (late, early, over): (
+        (ST_LATE if late else 0) | (ST_EARLY if early else 0) | (ST_OVERTIME if over else 0)
+    ) or ST_NORMAL
+    for late in (False, True) for early in (False, True) for over in (False, True)
+}
+
+# 플래그 → 코드/라벨 튜플 (값 종류가 몇 개 안 되므로 한 번 만든 튜플을 공유)
+_CODES_OF: dict = {}
+_LABELS_OF: dict = {}
+_FLAGS_OF: dict = {}
+
+
+def status_codes_of(flags: int) -> Tuple[str, ...]:
+    """비트플래그 → 상태코드 튜플 (공유 인스턴스, 수정 금지)."""
+    codes = _CODES_OF.get(flags)
+    if codes is None:
+        codes = _CODES_OF[flags] = tuple(c for c, bit in STATUS_FLAGS.items() if flags & bit)
+    return codes
+
+
+def status_labels_of(flags: int) -> Tuple[str, ...]:
+    """비트플래그 → 상태 라벨 튜플 (공유 인스턴스, 수정 금지)."""
+    labels = _LABELS_OF.get(flags)
+    if labels is None:
+        labels = _LABELS_OF[flags] = tuple(STATUS_LABELS.get(c, c) for c in status_codes_of(flags))
+    return labels
+
+
+def status_flags_of(codes: str) -> int:
+    """'LATE,EARLY' 처럼 쉼표로 이은 상태코드 문자열 → 비트플래그 (저장값 복원용)."""
+    flags = _FLAGS_OF.get(codes)
+    if flags is None:
+        flags = 0
+        for c in codes.split(","):
+            flags |= STATUS_FLAGS.get(c, 0)
+        _FLAGS_OF[codes] = flags
+    return flags
+
+
+def decide_status_flags(
+    compiled: Optional[CompiledModule],
+    day_class: int,
+    now_seconds: int,
+    has_checkin: bool,
+    has_checkout: bool,
+    late_seconds: int,
+    early_seconds: int,
+    overtime_seconds: int,
+    presence_paid_seconds: int,
+) -> int:
+    """
+    상태 판정 (compute_seconds_status_for_day의 '상태 정의' 규칙과 동일).
+    - now_seconds: 기준시각의 자정 기준 초 (오늘의 '시업 경과' 판정에만 사용)
+    - 반환: 상태 비트플래그 (코드는 status_codes_of로 변환)
+    """
+    if compiled is None:
+        return ST_NOSCHEDULE
+
+    # 날짜(미래/오늘/과거) 무관: '출근시각' 없이 '퇴근시각'만 있으면 무조건 오류
+    if has_checkout and not has_checkin:
+        return ST_ERROR
+
+    cat = compiled.cat
+    has_any_log = has_checkin or has_checkout
+
+    if cat == "소정근로" or cat == "휴일근로":
+        if day_class == DAY_FUTURE:
+            return ST_NORMAL if cat == "소정근로" else ST_HOLIDAY
+
+        # 오류: 출퇴근 기록 전무(오늘은 시업 경과 후) OR (체류∩유급 0)
+        wrong_logs = (
+            has_checkin and has_checkout
+            and compiled.paid_total_seconds > 0
+            and presence_paid_seconds == 0
+        )
+        if day_class == DAY_TODAY:
+            no_logs = (
+                compiled.start is not None
+                and now_seconds >= compiled.start
+                and not has_any_log
+            )
+        else:
+            no_logs = not has_any_log
+        if no_logs or wrong_logs:
+            return ST_ERROR
+
+        if cat == "휴일근로":
+            return ST_HOLIDAY
+        return _ST_REGULAR[(late_seconds > 0, early_seconds > 0, overtime_seconds > 0)]
+
+    if cat == "OFF":
+        return ST_ERROR if has_any_log else ST_OFF
+    if cat == "유급휴무":
+        return ST_ERROR if has_any_log else ST_PAY
+    if cat == "무급휴무":
+        return ST_ERROR if has_any_log else ST_NOPAY
+    return ST_NOSCHEDULE
+
+
+# 일별 평가 결과: (late, early, overtime, holiday, status_flags) — 불변이라 공유해도 안전
+DayResult = Tuple[int, int, int, int, int]
+
+
+def evaluate_day(
+    compiled: Optional[CompiledModule],
+    checkin: Optional[int],
+    checkout: Optional[int],
+    day_class: int,
+    now_seconds: int,
+) -> DayResult:
+    """
+    하루 평가의 순수 코어. 입력만으로 결과가 정해진다. (시계/DB 접근 없음)
+    - checkin/checkout: 자정 기준 초 (없으면 None, checkout은 보정 반영값)
+    - day_class: DAY_PAST / DAY_TODAY / DAY_FUTURE
+    - now_seconds: 기준시각의 자정 기준 초
+    """
+    has_checkin = checkin is not None
+    has_checkout = checkout is not None
+
+    if compiled is None:
+        paid: Tuple[SecondSegment, ...] = ()
+        last_end = None
+    else:
+        paid = compiled.paid
+        last_end = compiled.last_paid_end
+
+    ######### 시간 계산 ##########
+
+    presence_paid_seconds = (
+        paid_intersection_seconds(checkin, checkout, paid) if (has_checkin and has_checkout) else 0
+    )
+
+    # 1) 지각/조퇴
+    late_seconds = paid_seconds_before(checkin, paid)
+    early_seconds = paid_seconds_after(checkout, paid)
+
+    # 2) 연장: 유급 교집합 0이면 연장 없음, 마지막 유급 종료 이후 퇴근까지
+    overtime_seconds = 0
+    if has_checkin and has_checkout and last_end is not None and checkout > last_end:
+        if paid_intersection_seconds(checkin, last_end, paid) > 0:
+            overtime_seconds = checkout - last_end
+
+    # 3) 휴일근로: 스케줄 유급시간(시업~종업 - 휴게), 지각/조퇴 미차감
+    holiday_seconds = 0
+    if compiled is not None and compiled.cat == "휴일근로" and has_checkin and has_checkout:
+        holiday_seconds = compiled.paid_total_seconds
+
+    ######### 상태 정의 ##########
+
+    status_flags = decide_status_flags(
+        compiled,
+        day_class,
+        now_seconds,
+        has_checkin,
+        has_checkout,
+        late_seconds,
+        early_seconds,
+        overtime_seconds,
+        presence_paid_seconds,
+    )
+    return late_seconds, early_seconds, overtime_seconds, holiday_seconds, status_flags
+
+
+class AttendanceMemo:
+    """
+    evaluate_day 결과 메모 (LRU, 상한 maxsize).
+    - 키: (컴파일 모듈 식별, 출근 초, 퇴근 초, 날짜 구분, 오늘이면 시업 경과 여부)
+      오늘의 결과가 기준시각에 의존하는 부분은 '시업 경과 여부' 뿐이므로 나머지 시각 차이는 같은 키가 된다.
+    - 모듈 식별은 객체 id. 항목이 모듈 객체를 함께 잡고 있어 id가 재사용되지 않는다.
+      (compile_module 캐시 덕분에 같은 모듈 버전은 같은 객체)
+    - hits / misses 카운터로 효과를 확인한다.
+    """
+
+    def __init__(self, maxsize: int = 8192):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[tuple, Tuple[Optional[CompiledModule], DayResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def evaluate(
+        self,
+        compiled: Optional[CompiledModule],
+        checkin: Optional[int],
+        checkout: Optional[int],
+        day_class: int,
+        now_seconds: int,
+    ) -> DayResult:
+        started = (
+            day_class == DAY_TODAY
+            and compiled is not None
+            and compiled.start is not None
+            and now_seconds >= compiled.start
+        )
+        key = (id(compiled), checkin, checkout, day_class, started)
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] is compiled:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        result = evaluate_day(compiled, checkin, checkout, day_class, now_seconds)
+
+        with self._lock:
+            self.misses += 1
+            self._data[key] = (compiled, result)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# 프로세스 공용 메모 (일별 근태 화면 경로에서 사용. 월/기간 배치 경로는 메모 없이 평가한다)
+ATTENDANCE_MEMO = AttendanceMemo()
+
+
+@dataclass(frozen=True, slots=True)
+class DayMetrics:
+    """
+    정수 엔진의 일별 결과 (슬롯 + 정수 상태 플래그).
+    - status_codes / status_labels / status는 접근할 때 만든다. (앱/템플릿 직렬화 시점)
+    """
+    late_seconds: int
+    early_seconds: int
+    overtime_seconds: int
+    holiday_seconds: int
+    status_flags: int
+
+    @property
+    def status_codes(self) -> list[str]:
+        return list(status_codes_of(self.status_flags))
+
+    @property
+    def status_labels(self) -> list[str]:
+        return list(status_labels_of(self.status_flags))
+
+    @property
+    def status(self) -> str:
+        return "+".join(status_labels_of(self.status_flags))
+
+    @property
+    def is_error(self) -> bool:
+        return self.status_flags == ST_ERROR
+
+    def to_metrics(self) -> Metrics:
+        """기존 Metrics 형태로 변환 (비교/하위호환용)."""
+        return Metrics(
+            late_seconds=self.late_seconds,
+            early_seconds=self.early_seconds,
+            overtime_seconds=self.overtime_seconds,
+            holiday_seconds=self.holiday_seconds,
+            status=self.status,
+            status_codes=self.status_codes,
+            status_labels=self.status_labels,
+        )
+
+
+def compute_seconds_status_for_day_int(
+    record_day: date,
+    module: "Module | CompiledModule | None",
+    checkin: Optional[int],
+    checkout: Optional[int],
+    *,
+    now: Optional[datetime] = None,
+    memo: Optional[AttendanceMemo] = None,
+) -> DayMetrics:
+    """
+    compute_seconds_status_for_day의 정수(초) 엔트리포인트.
+    - checkin/checkout: 자정 기준 초 (없으면 None)
+    - module: Module(또는 Module-like) 혹은 compile_module 결과
+    - now: 과거/오늘/미래 판정 기준시각 (생략 시 timezone.now())
+    - memo: 주면 같은 입력의 결과를 재사용
+    - 반환 DayMetrics.to_metrics()는 기존 함수의 Metrics와 동일
+    """
+    compiled = module if isinstance(module, CompiledModule) else compile_module(module)
+
+    now = now or timezone.now()
+    evaluate = memo.evaluate if memo is not None else evaluate_day
+    return DayMetrics(*evaluate(
+        compiled, checkin, checkout, classify_day(record_day, now.date()), time_to_seconds(now),
+    ))
+
+
+# -----------------------------------------------------------------------------
+# 배치(열 단위) 엔진
+# - 월 집계처럼 '사용자 × 일자' 셀이 많은 경우, 셀마다 Metrics 객체를 만들지 않고
+#   입력 배열(모듈 인덱스/출근 초/퇴근 초/날짜 구분)을 한 번에 평가해 결과 배열을 만든다.
+# - 배열의 None 표현은 -1 (array 타입은 None을 담을 수 없음)
+# -----------------------------------------------------------------------------
+
+@dataclass
+class BatchMetrics:
+    late_seconds: "array[int]"
+    early_seconds: "array[int]"
+    overtime_seconds: "array[int]"
+    holiday_seconds: "array[int]"
+    status_flags: "array[int]"
+
+    def status_codes(self, i: int) -> Tuple[str, ...]:
+        """셀 i의 상태코드 (공유 튜플, 수정 금지)."""
+        return status_codes_of(self.status_flags[i])
+
+
+def evaluate_batch(
+    palette: Sequence[Optional[CompiledModule]],
+    module_idx: Sequence[int],
+    checkin: Sequence[int],
+    checkout: Sequence[int],
+    day_class: Sequence[int],
+    now_seconds: int,
+    memo: Optional[AttendanceMemo] = None,
+) -> BatchMetrics:
+    """
+    셀 배열 일괄 평가.
+    - palette: 컴파일된 모듈 목록 (module_idx가 가리키는 대상)
+    - module_idx: 셀별 palette 인덱스 (-1 = 근무표 없음)
+    - checkin / checkout: 셀별 자정 기준 초 (-1 = 기록 없음, checkout은 보정 반영값)
+    - day_class: 셀별 DAY_PAST / DAY_TODAY / DAY_FUTURE
+    - now_seconds: 기준시각의 자정 기준 초
+    - memo: 주면 셀마다 memo.evaluate로 같은 입력의 결과를 재사용
+    결과는 compute_seconds_status_for_day_int를 셀마다 호출한 것과 동일하다.
+    """
+    n = len(module_idx)
+    late_arr = array("l", bytes(array("l").itemsize * n))
+    early_arr = array("l", late_arr)
+    over_arr = array("l", late_arr)
+    hol_arr = array("l", late_arr)
+    flags_arr = array("l", [ST_NOSCHEDULE]) * n
+
+    if memo is not None:
+        evaluate = memo.evaluate
+        for i in range(n):
+            mi = module_idx[i]
+            ci = checkin[i]
+            co = checkout[i]
+            late_arr[i], early_arr[i], over_arr[i], hol_arr[i], flags_arr[i] = evaluate(
+                palette[mi] if mi >= 0 else None,
+                ci if ci >= 0 else None,
+                co if co >= 0 else None,
+                day_class[i],
+                now_seconds,
+            )
+        return BatchMetrics(
+            late_seconds=late_arr,
+            early_seconds=early_arr,
+            overtime_seconds=over_arr,
+            holiday_seconds=hol_arr,
+            status_flags=flags_arr,
+        )
+
+    # 모듈별 상수 미리 꺼내두기
+    consts = [
+        (m, m.paid, m.last_paid_end, m.cat == "휴일근로", m.paid_total_seconds) if m is not None
+        else (None, (), None, False, 0)
+        for m in palette
+    ]
+    no_module = (None, (), None, False, 0)
+
+    for i in range(n):
+        mi = module_idx[i]
+        compiled, paid, last_end, is_hol, paid_total = consts[mi] if mi >= 0 else no_module
+        ci = checkin[i]
+        co = checkout[i]
+        has_ci = ci >= 0
+        has_co = co >= 0
+        if not has_ci:
+            ci = None
+        if not has_co:
+            co = None
+
+        if paid:
+            late = paid_seconds_before(ci, paid)
+            early = paid_seconds_after(co, paid)
+        else:
+            late = early = 0
+
+        presence = 0
+        over = 0
+        if has_ci and has_co and paid:
+            presence = paid_intersection_seconds(ci, co, paid)
+            if co > last_end and paid_intersection_seconds(ci, last_end, paid) > 0:
+                over = co - last_end
+
+        late_arr[i] = late
+        early_arr[i] = early
+        over_arr[i] = over
+        if is_hol and has_ci and has_co:
+            hol_arr[i] = paid_total
+
+        flags_arr[i] = decide_status_flags(
+            compiled, day_class[i], now_seconds, has_ci, has_co, late, early, over, presence,
+        )
+
+    return BatchMetrics(
+        late_seconds=late_arr,
+        early_seconds=early_arr,
+        overtime_seconds=over_arr,
+        holiday_seconds=hol_arr,
+        status_flags=flags_arr,
+    )
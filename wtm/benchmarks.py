@@ -0,0 +1,334 @@
+"""
+근태 엔진/화면 벤치마크.
+- 결과는 JSON으로 그대로 내보낼 수 있는 dict
+- 관리 명령 bench_attendance에서 사용
+"""
+import gc
+import random
+import re
+import statistics
+import time
+import tracemalloc
+from collections import deque
+from datetime import date, datetime
+from types import SimpleNamespace
+
+from django.contrib.messages.storage import default_storage
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from wtm.attendance_calc import (
+    DAY_PAST, ST_ERROR, AttendanceMemo, classify_day, compile_module, compute_seconds_status_for_day_int,
+    evaluate_batch,
+)
+from wtm.models import Schedule
+from wtm.services.attendance import (
+    build_daily_attendance_for_users, build_monthly_attendance_for_user, build_monthly_attendance_summary_for_users,
+    build_monthly_metric_details_for_users, month_range, prepare_month, punch_rows, stream_window,
+)
+
+# prepare_month 출퇴근 조회가 타야 하는 커버링 인덱스 (wtm.Work.Meta.indexes)
+PUNCH_INDEX = "work_branch_user_day_cov_idx"
+
+
+def measure_memory(build) -> dict:
+    """
+    build()가 만든 결과를 잡고 있는 동안의 메모리 측정 (tracemalloc).
+    - retained_bytes: 결과가 살아있는 동안 추적 중인 메모리
+    - peak_bytes: 생성 중 최고치
+    - live_blocks: 살아있는 할당 블록 수 (≒ 객체/버퍼 개수)
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        retained, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    live_blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    del result
+    return {"retained_bytes": retained, "peak_bytes": peak, "live_blocks": live_blocks}
+
+
+def _sample_palette():
+    """휴게 포함 소정근로 / 휴일근로 / 휴무 모듈 조합."""
+    def module(cat, start, end, r1=("-", "-"), r2=("-", "-")):
+        return SimpleNamespace(
+            cat=cat, start_time=start, end_time=end,
+            rest1_start_time=r1[0], rest1_end_time=r1[1],
+            rest2_start_time=r2[0], rest2_end_time=r2[1],
+        )
+
+    return [
+        compile_module(module("소정근로", "09:00", "18:00", ("12:00", "13:00"))),
+        compile_module(module("소정근로", "13:00", "22:00", ("17:00", "17:30"), ("19:30", "20:00"))),
+        compile_module(module("휴일근로", "10:00", "15:00")),
+        compile_module(module("OFF", "-", "-")),
+        compile_module(module("무급휴무", "-", "-")),
+    ]
+
+
+def sample_cells(n: int, *, seed: int = 0):
+    """지각/조퇴/퇴근누락/기록없음이 섞인 과거일 셀 n개 (palette, module_idx, checkin, checkout)."""
+    rng = random.Random(seed)
+    palette = _sample_palette()
+    module_idx, checkin, checkout = [], [], []
+    for _ in range(n):
+        mi = rng.randrange(-1, len(palette))
+        module_idx.append(mi)
+        roll = rng.random()
+        if roll < 0.1:
+            checkin.append(-1)   # 기록 없음
+            checkout.append(-1)
+            continue
+        ci = 8 * 3600 + rng.randrange(0, 2 * 3600)
+        checkin.append(ci)
+        # 퇴근 누락 / 조퇴 / 정상~연장
+        checkout.append(-1 if roll < 0.15 else ci + rng.randrange(4 * 3600, 11 * 3600))
+    return palette, module_idx, checkin, checkout
+
+
+def bench_result_memory(n: int = 50000, *, seed: int = 0) -> dict:
+    """
+    같은 n개 셀을 세 가지 결과 표현으로 만들었을 때의 메모리 비교.
+    - metrics: 셀마다 Metrics(코드/라벨 리스트 + 라벨 문자열) — 기존 표현
+    - day_metrics: 셀마다 슬롯 DayMetrics(정수 5개, 라벨은 지연 생성)
+    - batch: 배치 엔진 결과 배열(BatchMetrics)
+    각 항목에 ERROR 일수 집계 결과(error_count)도 함께 넣어 같은 계산임을 확인한다.
+    """
+    palette, module_idx, checkin, checkout = sample_cells(n, seed=seed)
+    record_day = date(2025, 1, 1)
+    now = datetime(2025, 2, 1, 12, 0)
+    assert classify_day(record_day, now.date()) == DAY_PAST
+
+    def scalar(i):
+        mi = module_idx[i]
+        return compute_seconds_status_for_day_int(
+            record_day,
+            palette[mi] if mi >= 0 else None,
+            checkin[i] if checkin[i] >= 0 else None,
+            checkout[i] if checkout[i] >= 0 else None,
+            now=now,
+        )
+
+    def build_metrics():
+        return [scalar(i).to_metrics() for i in range(n)]
+
+    def build_day_metrics():
+        return [scalar(i) for i in range(n)]
+
+    def build_batch():
+        return evaluate_batch(palette, module_idx, checkin, checkout, [DAY_PAST] * n, 12 * 3600)
+
+    report = {"cells": n}
+    for name, build, count_errors in (
+        ("metrics", build_metrics, lambda rs: sum(1 for m in rs if m.status_codes == ["ERROR"])),
+        ("day_metrics", build_day_metrics, lambda rs: sum(1 for m in rs if m.status_flags == ST_ERROR)),
+        ("batch", build_batch, lambda b: sum(1 for f in b.status_flags if f == ST_ERROR)),
+    ):
+        report[name] = measure_memory(build)
+        report[name]["error_count"] = count_errors(build())
+    return report
+
+
+def bench_batch_memo(n: int = 50000, *, seed: int = 0, repeat: int = 5) -> dict:
+    """
+    배치 엔진을 메모 없이 / 메모(AttendanceMemo)와 함께 돌렸을 때의 비교.
+    - plain_ms / memo_ms: repeat회 중 최소 실행 시간 (메모는 매번 비운 상태에서 시작)
+    - hit_rate: 메모 적중률 (출퇴근 초가 셀마다 달라 주로 기록 없는 셀만 맞는다)
+    - same: 두 결과가 같은지
+    """
+    palette, module_idx, checkin, checkout = sample_cells(n, seed=seed)
+    args = (palette, module_idx, checkin, checkout, [DAY_PAST] * n, 12 * 3600)
+    memo = AttendanceMemo()
+
+    def best_ms(fn):
+        timings = []
+        for _ in range(repeat):
+            memo.clear()
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        return round(min(timings) * 1000, 2)
+
+    plain_ms = best_ms(lambda: evaluate_batch(*args))
+    memo_ms = best_ms(lambda: evaluate_batch(*args, memo=memo))
+    return {
+        "cells": n,
+        "plain_ms": plain_ms,
+        "memo_ms": memo_ms,
+        "hit_rate": memo.stats()["hit_rate"],
+        "same": evaluate_batch(*args) == evaluate_batch(*args, memo=AttendanceMemo()),
+    }
+
+
+# ===== 파이프라인(서비스/화면) 벤치마크 =====
+
+def measure_case(fn, *, repeat: int = 3) -> dict:
+    """
+    fn을 repeat회 실행해 측정.
+    - wall_ms_min / wall_ms_median: 실행 시간
+    - queries: 마지막 실행의 쿼리 수 (첫 실행의 저장값 보정 등이 끝난 정상 상태)
+    - peak_kb: tracemalloc 기준 최고 메모리 (별도 1회 실행)
+    실패하면 {"error": "..."} (예: MySQL 전용 SQL을 SQLite에서 실행)
+    """
+    timings = []
+    queries = 0
+    try:
+        for _ in range(repeat):
+            with transaction.atomic(), CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - started)
+            queries = len(ctx.captured_queries)
+        with transaction.atomic():
+            peak = measure_memory(fn)["peak_bytes"]
+    except Exception as e:  # 벤치마크는 계속 진행하고 결과에 오류를 남긴다
+        return {"error": f"{type(e).__name__}: {e}"}
+
+    return {
+        "wall_ms_min": round(min(timings) * 1000, 2),
+        "wall_ms_median": round(statistics.median(timings) * 1000, 2),
+        "queries": queries,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def explain_punch_query(*, branch, user_ids: list[int], year: int, month: int) -> dict:
+    """
+    prepare_month의 출퇴근 조회 실행계획 확인.
+    - uses_index: PUNCH_INDEX로 범위 조회하는지
+    - covering: 테이블 접근 없이 인덱스만 읽는지 (MySQL "Using index", SQLite "COVERING INDEX")
+    - sorted: 별도 정렬(filesort / temp b-tree) 없이 인덱스 순서로 나오는지
+    """
+    plan = punch_rows(user_ids, *month_range(year, month), branch=branch).explain()
+    if connection.vendor == "mysql":
+        covering = re.search(r"Using index(?! condition)", plan) is not None
+        sorted_ = "Using filesort" not in plan
+    else:
+        covering = f"COVERING INDEX {PUNCH_INDEX}" in plan
+        sorted_ = "TEMP B-TREE" not in plan
+    return {"plan": plan, "uses_index": PUNCH_INDEX in plan, "covering": covering, "sorted": sorted_}
+
+
+def _view_caller(view, *, user, branch, path: str, **kwargs):
+    """미들웨어 없이 뷰를 직접 호출 (request.branch/세션/메시지만 붙여준다)."""
+    factory = RequestFactory()
+
+    def call():
+        request = factory.get(path)
+        request.user = user
+        request.branch = branch
+        request.session = SessionStore()
+        request._messages = default_storage(request)
+        response = view(request, **kwargs)
+        if hasattr(response, "render") and not getattr(response, "is_rendered", True):
+            response.render()
+        return response
+
+    return call
+
+
+def _daily_base_rows(branch, day: date) -> list[dict]:
+    """index 화면 SQL과 같은 형태의 base_rows (ORM 버전)."""
+    col = f"d{day.day}"
+    rows = []
+    qs = (
+        Schedule.objects
+        .filter(branch=branch, year=f"{day.year:04d}", month=f"{day.month:02d}")
+        .select_related("user", col)
+    )
+    for s in qs:
+        m = getattr(s, col)
+        rows.append({
+            "user_id": s.user_id, "dept": s.user.dept, "position": s.user.position, "emp_name": s.user.emp_name,
+            "module_id": m.id if m else None, "cat": m.cat if m else None, "name": m.name if m else None,
+            "start_time": m.start_time if m else None, "end_time": m.end_time if m else None,
+            "rest1_start_time": m.rest1_start_time if m else None, "rest1_end_time": m.rest1_end_time if m else None,
+            "rest2_start_time": m.rest2_start_time if m else None, "rest2_end_time": m.rest2_end_time if m else None,
+        })
+    return rows
+
+
+def bench_pipeline(
+    *, scales: list[int], year: int, month: int, repeat: int = 3, seed: int = 0, keep: bool = False,
+) -> list[dict]:
+    """
+    직원 수(scale)별로 합성 지점을 만들고 주요 경로를 측정.
+    - keep=False면 측정 후 생성 데이터를 롤백한다.
+    """
+    from wtm.synthetic import generate_branch
+    from wtm.views.index import index
+    from wtm.views.schedule import work_schedule
+    from wtm.views.stat import work_status, work_status_excel
+
+    ym = f"{year:04d}{month:02d}"
+    results = []
+    for scale in scales:
+        with transaction.atomic():
+            started = time.perf_counter()
+            synth = generate_branch(
+                f"bench{scale}", employees=scale, start=(year, month), end=(year, month), seed=seed,
+            )
+            setup_s = time.perf_counter() - started
+
+            branch, uids = synth.branch, synth.user_ids
+            first_user = branch.users.filter(id=uids[0]).first() if uids else None
+            day = date(year, month, 15)
+            base_rows = _daily_base_rows(branch, day)
+            view_kwargs = dict(user=synth.admin, branch=branch)
+
+            cases = {
+                "prepare_month": lambda: prepare_month(uids, year, month, branch=branch),
+                # 사용자 단위 스트리밍 평가 (결과는 버림, 최고 메모리 비교용)
+                "stream_window": lambda: deque(
+                    stream_window(uids, *month_range(year, month), branch=branch, user_chunk=50), maxlen=0,
+                ),
+                "build_monthly_attendance_for_user": lambda: build_monthly_attendance_for_user(first_user, year, month),
+                "build_daily_attendance_for_users": lambda: build_daily_attendance_for_users(base_rows, day, branch=branch),
+                "build_monthly_attendance_summary_for_users": lambda: build_monthly_attendance_summary_for_users(
+                    users=uids, year=year, month=month, branch=branch,
+                ),
+                "build_monthly_attendance_summary_for_users:sql": lambda: build_monthly_attendance_summary_for_users(
+                    users=uids, year=year, month=month, branch=branch, engine="sql",
+                ),
+                "build_monthly_metric_details_for_users": lambda: build_monthly_metric_details_for_users(
+                    users=uids, year=year, month=month, metric="late", branch=branch,
+                ),
+                "view:index": _view_caller(index, path="/wtm/index/", stand_day=day.strftime("%Y%m%d"), **view_kwargs),
+                "view:work_schedule": _view_caller(work_schedule, path="/wtm/schedule/", stand_ym=ym, **view_kwargs),
+                "view:work_status": _view_caller(work_status, path="/wtm/status/", stand_ym=ym, **view_kwargs),
+                "view:work_status_excel": _view_caller(
+                    work_status_excel, path="/wtm/status/excel/", stand_ym=ym, **view_kwargs,
+                ),
+            }
+            results.append({
+                "employees": scale,
+                "setup_s": round(setup_s, 2),
+                "punch_plan": explain_punch_query(branch=branch, user_ids=uids, year=year, month=month),
+                "cases": {name: measure_case(fn, repeat=repeat) for name, fn in cases.items()},
+            })
+            if not keep:
+                transaction.set_rollback(True)
+    return results
+
+
+def bench_report(
+    *, scales: list[int], year: int, month: int, repeat: int = 3, seed: int = 0,
+    cells: int = 50000, keep: bool = False, memory: bool = True,
+) -> dict:
+    """bench_attendance 명령 출력 전체."""
+    report = {
+        "generated_at": timezone.now().isoformat(timespec="seconds"),
+        "database": connection.vendor,
+        "ym": f"{year:04d}{month:02d}",
+        "pipeline": bench_pipeline(scales=scales, year=year, month=month, repeat=repeat, seed=seed, keep=keep),
+    }
+    if memory:
+        report["memory"] = bench_result_memory(cells, seed=seed)
+        report["batch_memo"] = bench_batch_memo(cells, seed=seed)
+    return report
@@ -0,0 +1,339 @@
+"""
+근태 계산 기준(reference) vs 빠른 엔진 차등(differential) 비교.
+- 기준: determine_checkout_time + compute_seconds_status_for_day (문자열/datetime 기반 기존 규칙)
+- 비교 대상: 정수 엔진, 메모 엔진, 월 배치 경로(flatten_month + evaluate_batch) 등
+- 모듈/출퇴근/기준시각을 무작위로 만들되 휴게·시업·종업 경계(±1초), 오늘/과거/미래를 집중적으로 섞는다.
+- 불일치가 나오면 더 단순한 입력으로 줄여(shrink) 최소 사례를 돌려준다.
+"""
+import random
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+from wtm.attendance_calc import (
+    AttendanceMemo, LogsDay, compile_module, compute_seconds_status_for_day, compute_seconds_status_for_day_int,
+    evaluate_batch, time_to_seconds, to_dt,
+)
+from wtm.services.attendance import determine_checkout_seconds, determine_checkout_time, flatten_month
+
+CATS = ("소정근로", "휴일근로", "OFF", "유급휴무", "무급휴무", "알수없음")
+
+# 기준일: 오늘(0) / 과거(-1) / 미래(+1)는 이 날짜 기준 오프셋
+BASE_DAY = date(2025, 12, 16)
+DAY_OFFSETS = {-1: -6, 0: 0, 1: 4}
+
+# (late, early, overtime, holiday, status_codes)
+Outcome = tuple[int, int, int, int, tuple[str, ...]]
+
+
+@dataclass(frozen=True)
+class Case:
+    """
+    비교 입력 1건.
+    - cat이 None이면 근무표 없음
+    - 근로모듈 시각은 "HH:MM" 또는 "-" (모듈 화면과 같은 분 단위)
+    - checkin/checkout: 자정 기준 초 (None = 기록 없음), *_us: 마이크로초
+    - day: -1 과거 / 0 오늘 / 1 미래
+    """
+    cat: Optional[str]
+    start_time: str = "-"
+    end_time: str = "-"
+    rest1_start_time: str = "-"
+    rest1_end_time: str = "-"
+    rest2_start_time: str = "-"
+    rest2_end_time: str = "-"
+    checkin: Optional[int] = None
+    checkin_us: int = 0
+    checkout: Optional[int] = None
+    checkout_us: int = 0
+    day: int = -1
+    now_seconds: int = 12 * 3600
+
+    @property
+    def record_day(self) -> date:
+        return BASE_DAY + timedelta(days=DAY_OFFSETS[self.day])
+
+    @property
+    def now(self) -> datetime:
+        return datetime.combine(BASE_DAY, datetime.min.time()) + timedelta(seconds=self.now_seconds)
+
+    def module(self) -> Optional[SimpleNamespace]:
+        if self.cat is None:
+            return None
+        return SimpleNamespace(
+            id=None, mod_date=None, cat=self.cat, name="비교",
+            start_time=self.start_time, end_time=self.end_time,
+            rest1_start_time=self.rest1_start_time, rest1_end_time=self.rest1_end_time,
+            rest2_start_time=self.rest2_start_time, rest2_end_time=self.rest2_end_time,
+        )
+
+    def punch_dt(self, seconds: Optional[int], us: int) -> Optional[datetime]:
+        if seconds is None:
+            return None
+        midnight = datetime.combine(self.record_day, datetime.min.time())
+        return midnight + timedelta(seconds=seconds, microseconds=us)
+
+    def describe(self) -> str:
+        def hms(sec):
+            return "-" if sec is None else f"{sec // 3600:02d}:{sec % 3600 // 60:02d}:{sec % 60:02d}"
+
+        if self.cat is None:
+            module = "근무표 없음"
+        else:
+            module = f"{self.cat} {self.start_time}~{self.end_time}"
+            for rs, re in ((self.rest1_start_time, self.rest1_end_time), (self.rest2_start_time, self.rest2_end_time)):
+                if rs != "-" or re != "-":
+                    module += f" 휴게 {rs}~{re}"
+        day = {-1: "과거", 0: "오늘", 1: "미래"}[self.day]
+        return (
+            f"[{module}] {day} 출근 {hms(self.checkin)}{f'.{self.checkin_us:06d}' if self.checkin_us else ''}"
+            f" 퇴근 {hms(self.checkout)}{f'.{self.checkout_us:06d}' if self.checkout_us else ''}"
+            f" 기준시각 {hms(self.now_seconds)}"
+        )
+
+
+# ===== 기준 / 비교 엔진 =====
+
+def reference_outcome(case: Case) -> Outcome:
+    """
+    기존 규칙 그대로: 퇴근 보정(determine_checkout_time) → compute_seconds_status_for_day.
+    - 유급 구간은 make_paid_segments가 문자열/datetime으로 따로 만든다. (compile_module을 거치지 않음)
+    """
+    day = case.record_day
+    module = case.module()
+    checkin_dt = case.punch_dt(case.checkin, case.checkin_us)
+    checkout_dt = case.punch_dt(case.checkout, case.checkout_us)
+    sched_end_hhmm = module.end_time if (module and module.end_time and module.end_time != "-") else None
+    sched_end_dt = to_dt(day, sched_end_hhmm) if sched_end_hhmm else None
+
+    checkout_time = determine_checkout_time(checkout_dt, day, checkin_dt, sched_end_dt, case.now.date())
+    m = compute_seconds_status_for_day(
+        day, module,
+        LogsDay(checkin=checkin_dt.strftime("%H:%M:%S") if checkin_dt else None, checkout=checkout_time),
+        now=case.now,
+    )
+    return m.late_seconds, m.early_seconds, m.overtime_seconds, m.holiday_seconds, tuple(m.status_codes)
+
+
+def _corrected_checkout(case: Case) -> Optional[int]:
+    compiled = compile_module(case.module())
+    return determine_checkout_seconds(
+        case.punch_dt(case.checkout, case.checkout_us), case.record_day,
+        case.punch_dt(case.checkin, case.checkin_us), compiled.end if compiled else None, case.now.date(),
+    )
+
+
+def _int_engine(memo: Optional[AttendanceMemo] = None) -> Callable[[Case], Outcome]:
+    def run(case: Case) -> Outcome:
+        checkin_dt = case.punch_dt(case.checkin, case.checkin_us)
+        m = compute_seconds_status_for_day_int(
+            case.record_day, case.module(),
+            time_to_seconds(checkin_dt) if checkin_dt else None, _corrected_checkout(case),
+            now=case.now, memo=memo,
+        )
+        return m.late_seconds, m.early_seconds, m.overtime_seconds, m.holiday_seconds, tuple(m.status_codes)
+    return run
+
+
+def _month_engine(memo: Optional[AttendanceMemo] = None) -> Callable[[Case], Outcome]:
+    """월 집계 경로: prepare_month 형태 입력 → flatten_month → evaluate_batch (1인 × 1일)."""
+    def run(case: Case) -> Outcome:
+        day = case.record_day
+        module = case.module()
+        logs = {}
+        if case.checkin is not None:
+            logs["I"] = [case.punch_dt(case.checkin, case.checkin_us)]
+        if case.checkout is not None:
+            logs["O"] = [case.punch_dt(case.checkout, case.checkout_us)]
+        cells = flatten_month(
+            [1], [day], {1: {day: 1}} if module else {}, {1: module} if module else {},
+            {1: {day: logs}} if logs else {}, today=case.now.date(),
+        )
+        b = evaluate_batch(
+            cells.palette, cells.module_idx, cells.checkin, cells.checkout, cells.day_class,
+            case.now_seconds, memo=memo,
+        )
+        return (
+            b.late_seconds[0], b.early_seconds[0], b.overtime_seconds[0], b.holiday_seconds[0], b.status_codes(0),
+        )
+    return run
+
+
+def default_engines() -> dict[str, Callable[[Case], Outcome]]:
+    """비교 대상 엔진 목록. 메모 엔진은 호출마다 새 메모를 만들어 케이스 간에 공유한다."""
+    return {
+        "int": _int_engine(),
+        "int+memo": _int_engine(AttendanceMemo()),
+        "month": _month_engine(),
+        "month+memo": _month_engine(AttendanceMemo()),
+    }
+
+
+# ===== 무작위 입력 생성 =====
+
+def _hhmm(sec: int) -> str:
+    sec = max(0, min(sec, 23 * 3600 + 59 * 60))
+    return f"{sec // 3600:02d}:{sec % 3600 // 60:02d}"
+
+
+def _minutes(value: str) -> Optional[int]:
+    if value == "-":
+        return None
+    h, m = value.split(":")
+    return int(h) * 3600 + int(m) * 60
+
+
+def random_case(rng: random.Random) -> Case:
+    """경계(시업/종업/휴게 ±1초, 자정 근처) 위주로 입력 1건 생성."""
+    day = rng.choice((-1, 0, 1))
+    if rng.random() < 0.08:
+        module_fields = {"cat": None}
+        marks = [9 * 3600, 18 * 3600]
+    else:
+        cat = rng.choice(CATS)
+        start = rng.randrange(5 * 60, 15 * 60) * 60
+        end = start + rng.randrange(-60, 11 * 60) * 60   # 가끔 종업 ≤ 시업 (유급 구간 없음)
+        module_fields = {"cat": cat, "start_time": _hhmm(start), "end_time": _hhmm(end)}
+        if rng.random() < 0.1:
+            module_fields.update(start_time="-", end_time="-")
+        marks = [start, end]
+        for n in (1, 2):
+            roll = rng.random()
+            if roll < 0.4:
+                continue
+            # 근로 구간 안/경계에 걸친/바깥/역전된 휴게
+            rs = start + rng.randrange(-60, max(1, (end - start) // 60) + 60) * 60
+            re = rs + rng.choice((-30, 0, 15, 30, 60, 90)) * 60
+            if roll < 0.5:
+                rs, re = start, start + 30 * 60
+            elif roll < 0.6:
+                rs, re = end - 30 * 60, end
+            module_fields[f"rest{n}_start_time"] = _hhmm(rs)
+            module_fields[f"rest{n}_end_time"] = _hhmm(re)
+            marks += [rs, re]
+
+    def moment() -> int:
+        roll = rng.random()
+        if roll < 0.6:
+            return max(0, min(86399, rng.choice(marks) + rng.choice((-1, 0, 0, 1, -60, 60))))
+        if roll < 0.7:
+            return rng.choice((0, 1, 86398, 86399))
+        return rng.randrange(0, 86400)
+
+    def punch() -> tuple[Optional[int], int]:
+        if rng.random() < 0.25:
+            return None, 0
+        return moment(), (rng.choice((1, 500, 999999)) if rng.random() < 0.1 else 0)
+
+    checkin, checkin_us = punch()
+    checkout, checkout_us = punch()
+    return Case(
+        **module_fields, checkin=checkin, checkin_us=checkin_us, checkout=checkout, checkout_us=checkout_us,
+        day=day, now_seconds=moment(),
+    )
+
+
+# ===== 비교 / 최소화 =====
+
+def _size(case: Case) -> int:
+    """단순함의 척도 (작을수록 단순). shrink는 이 값이 줄어드는 후보만 받아들여 반드시 끝난다."""
+    size = 0
+    for value in (case.checkin, case.checkout, case.now_seconds):
+        if value is None:
+            continue
+        size += 1 + (value % 3600 != 0) + (value % 60 != 0)
+    size += (case.checkin_us != 0) + (case.checkout_us != 0) + (case.day != -1)
+    if case.cat is not None:
+        size += 1 + (case.cat != "소정근로")
+        for field in ("start_time", "end_time", "rest1_start_time", "rest1_end_time", "rest2_start_time", "rest2_end_time"):
+            value = getattr(case, field)
+            if value != "-":
+                size += 1 + (not value.endswith(":00"))
+    return size
+
+
+def _shrink_candidates(case: Case):
+    yield replace(case, cat=None)
+    yield replace(case, rest2_start_time="-", rest2_end_time="-")
+    yield replace(case, rest1_start_time="-", rest1_end_time="-")
+    yield replace(case, checkin=None, checkin_us=0)
+    yield replace(case, checkout=None, checkout_us=0)
+    yield replace(case, checkin_us=0)
+    yield replace(case, checkout_us=0)
+    yield replace(case, day=-1)
+    yield replace(case, cat="소정근로")
+    for field in ("checkin", "checkout", "now_seconds"):
+        value = getattr(case, field)
+        if value is not None:
+            yield replace(case, **{field: value - value % 3600})
+            yield replace(case, **{field: value - value % 60})
+    for field in ("start_time", "end_time", "rest1_start_time", "rest1_end_time", "rest2_start_time", "rest2_end_time"):
+        sec = _minutes(getattr(case, field))
+        if sec is not None:
+            yield replace(case, **{field: _hhmm(sec - sec % 3600)})
+
+
+def _outcome_or_error(fn: Callable[[Case], Outcome], case: Case):
+    try:
+        return fn(case)
+    except Exception as e:  # 엔진 예외도 불일치로 본다
+        return f"{type(e).__name__}: {e}"
+
+
+def shrink(case: Case, fails: Callable[[Case], bool]) -> Case:
+    """fails(case)가 참인 상태를 유지하면서 가능한 한 단순한 입력으로 줄인다 (탐욕적)."""
+    improved = True
+    while improved:
+        improved = False
+        for candidate in _shrink_candidates(case):
+            if _size(candidate) < _size(case) and fails(candidate):
+                case = candidate
+                improved = True
+                break
+    return case
+
+
+@dataclass
+class Mismatch:
+    engine: str
+    case: Case
+    expected: object
+    actual: object
+    original: Case
+
+    def __str__(self) -> str:
+        return (
+            f"{self.engine}: {self.case.describe()}\n"
+            f"  기준 {self.expected}\n  엔진 {self.actual}\n"
+            f"  (최초 발견: {self.original.describe()})"
+        )
+
+
+def find_mismatches(
+    engines: Optional[dict[str, Callable[[Case], Outcome]]] = None,
+    *, cases: int = 2000, seed: int = 0, reference: Callable[[Case], Outcome] = reference_outcome,
+) -> list[Mismatch]:
+    """
+    무작위 cases건을 기준과 각 엔진으로 계산해 비교.
+    - 엔진마다 처음 발견한 불일치 1건을 최소화해서 돌려준다. (빈 리스트 = 모두 일치)
+    """
+    engines = default_engines() if engines is None else engines
+    rng = random.Random(seed)
+    inputs = [random_case(rng) for _ in range(cases)]
+
+    found = []
+    for name, engine in engines.items():
+        def fails(c: Case) -> bool:
+            return _outcome_or_error(engine, c) != _outcome_or_error(reference, c)
+
+        for case in inputs:
+            if fails(case):
+                minimal = shrink(case, fails)
+                found.append(Mismatch(
+                    engine=name, case=minimal,
+                    expected=_outcome_or_error(reference, minimal), actual=_outcome_or_error(engine, minimal),
+                    original=case,
+                ))
+                break
+    return found
@@ -0,0 +1,50 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from wtm.benchmarks import bench_report
+
+
+class Command(BaseCommand):
+    help = (
+        "근태 파이프라인 벤치마크. 직원 수별 합성 지점을 만들어 prepare_month / build_* / 주요 화면의 "
+        "실행시간·쿼리 수·최고 메모리를 측정하고 JSON으로 출력한다. (기본: 측정 후 롤백)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", default="10,50,200", help="직원 수 목록 (쉼표 구분)")
+        parser.add_argument("--ym", help="측정 년월 YYYYMM (기본: 지난 달)")
+        parser.add_argument("--repeat", type=int, default=3, help="케이스별 반복 횟수")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--cells", type=int, default=50000, help="메모리 비교에 사용할 셀(사용자×일자) 수")
+        parser.add_argument("--no-memory", action="store_true", help="결과 표현 메모리 비교 생략")
+        parser.add_argument("--keep", action="store_true", help="생성한 합성 데이터를 남긴다")
+        parser.add_argument("--output", help="JSON 저장 경로 (생략 시 표준출력)")
+
+    def handle(self, *args, **options):
+        try:
+            scales = [int(x) for x in options["scales"].split(",") if x.strip()]
+        except ValueError:
+            raise CommandError("--scales는 쉼표로 구분한 정수여야 합니다.")
+
+        if options["ym"]:
+            ym = options["ym"]
+            if len(ym) != 6 or not ym.isdigit():
+                raise CommandError(f"YYYYMM 형식이 아닙니다: {ym}")
+            year, month = int(ym[:4]), int(ym[4:])
+        else:
+            first = timezone.now().date().replace(day=1)
+            year, month = (first.year - 1, 12) if first.month == 1 else (first.year, first.month - 1)
+
+        report = bench_report(
+            scales=scales, year=year, month=month, repeat=max(1, options["repeat"]), seed=options["seed"],
+            cells=options["cells"], keep=options["keep"], memory=not options["no_memory"],
+        )
+        text = json.dumps(report, ensure_ascii=False, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                f.write(text)
+            self.stdout.write(self.style.SUCCESS(f"저장: {options['output']}"))
+        else:
+            self.stdout.write(text)
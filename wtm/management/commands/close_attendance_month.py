@@ -0,0 +1,88 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from common.models import Branch
+from wtm.services.attendance_store import iter_months, parse_ym
+from wtm.services.month_close import CloseState, CloseUnit, run_close
+
+
+class Command(BaseCommand):
+    help = (
+        "월 마감 배치. (지점, 년월) 단위로 일별 근태와 월 집계를 다시 계산해 저장한다. "
+        "단위들은 프로세스 풀로 병렬 처리하고, --state 파일로 중단 후 이어서 실행할 수 있다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--branch", help="지점코드, 쉼표 구분 (생략 시 활성 지점 전체)")
+        parser.add_argument("--from", dest="ym_from", help="시작 년월 YYYYMM (기본: 지난 달)")
+        parser.add_argument("--to", dest="ym_to", help="종료 년월 YYYYMM (기본: 시작 년월)")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="프로세스 수 (기본: CPU 수)")
+        parser.add_argument("--chunk", type=int, default=200, help="한 번에 조회/저장할 사용자 수 (메모리 상한)")
+        parser.add_argument("--state", help="진행 상태 JSON 경로 (끝난 단위를 기록)")
+        parser.add_argument("--resume", action="store_true", help="--state에 기록된 단위는 건너뛴다")
+
+    def handle(self, *args, **options):
+        if options["resume"] and not options["state"]:
+            raise CommandError("--resume에는 --state가 필요합니다.")
+
+        try:
+            if options["ym_from"]:
+                start = parse_ym(options["ym_from"])
+            else:
+                first = timezone.now().date().replace(day=1)
+                start = (first.year - 1, 12) if first.month == 1 else (first.year, first.month - 1)
+            end = parse_ym(options["ym_to"]) if options["ym_to"] else start
+        except ValueError as e:
+            raise CommandError(str(e))
+        if end < start:
+            raise CommandError("종료 년월이 시작 년월보다 앞설 수 없습니다.")
+
+        branches = Branch.objects.filter(is_active=True).order_by("code")
+        if options["branch"]:
+            codes = [c.strip() for c in options["branch"].split(",") if c.strip()]
+            branches = Branch.objects.filter(code__in=codes).order_by("code")
+            missing = set(codes) - {b.code for b in branches}
+            if missing:
+                raise CommandError(f"지점을 찾을 수 없습니다: {', '.join(sorted(missing))}")
+
+        units = [
+            CloseUnit(branch_id=b.id, branch_code=b.code, year=year, month=month)
+            for b in branches
+            for year, month in iter_months(start, end)
+        ]
+
+        state = CloseState(options["state"])
+        if options["resume"]:
+            state.load()
+        skipped = sum(1 for u in units if u.key in state.done)
+        workers = max(1, options["workers"])
+        self.stdout.write(f"대상 {len(units)}단위 (건너뜀 {skipped}), 프로세스 {workers}개")
+
+        def report(result):
+            self.stdout.write(
+                f"{result.key}: 사용자 {result.users}명, {result.rows}행, {result.ms:.0f}ms (pid {result.pid})"
+            )
+
+        def report_error(unit, error):
+            self.stderr.write(f"{unit.key}: 실패 - {error}")
+
+        started = time.perf_counter()
+        results, failures = run_close(
+            units, workers=workers, user_chunk=max(1, options["chunk"]), state=state,
+            on_done=report, on_error=report_error,
+        )
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        rows = sum(r.rows for r in results)
+        busy_ms = sum(r.ms for r in results)
+        self.stdout.write(
+            f"단위 합계 {busy_ms:.0f}ms / 경과 {wall_ms:.0f}ms"
+            + (f" (병렬 배율 {busy_ms / wall_ms:.1f}x)" if wall_ms and results else "")
+        )
+        if failures:
+            self.stdout.write(f"완료: {len(results)}단위, {rows}행")
+            raise CommandError(f"실패 {len(failures)}단위: {', '.join(sorted(failures))} (--resume로 다시 실행)")
+        self.stdout.write(self.style.SUCCESS(f"완료: {len(results)}단위, {rows}행"))
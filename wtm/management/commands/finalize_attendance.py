@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from common.models import Branch
+from wtm.services.attendance_store import finalize_attendance
+
+
+class Command(BaseCommand):
+    help = (
+        "야간 확정 배치. 어제까지의 일별 근태 중 당일/미래일 기준으로 계산된 채 남은 행을 다시 계산해 "
+        "퇴근 보정값과 출처(퇴근기록/종업시각 보정)를 확정한다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--branch", help="지점코드 (생략 시 활성 지점 전체)")
+        parser.add_argument("--since", help="이 일자(YYYYMMDD)부터만 확정 (생략 시 미확정 전체)")
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            try:
+                since = datetime.strptime(options["since"], "%Y%m%d").date()
+            except ValueError:
+                raise CommandError(f"YYYYMMDD 형식이 아닙니다: {options['since']}")
+
+        branches = Branch.objects.filter(is_active=True)
+        if options["branch"]:
+            branches = Branch.objects.filter(code=options["branch"])
+            if not branches.exists():
+                raise CommandError(f"지점을 찾을 수 없습니다: {options['branch']}")
+
+        now = timezone.now()
+        total = 0
+        for branch in branches.order_by("code"):
+            rows = finalize_attendance(branch=branch, now=now, since=since)
+            total += rows
+            self.stdout.write(f"{branch.code}: {rows}행 확정")
+        self.stdout.write(self.style.SUCCESS(f"완료: {total}행"))
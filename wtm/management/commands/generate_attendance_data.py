@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from common.models import Branch
+from wtm.services.attendance_store import parse_ym
+from wtm.synthetic import generate
+
+
+class Command(BaseCommand):
+    help = "합성 근태 데이터 생성 (지점/직원/근로계약/근로모듈/근무표/출퇴근 기록). 벤치마크·부하 확인용"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--branches", type=int, default=1)
+        parser.add_argument("--employees", type=int, default=50, help="지점당 직원 수")
+        parser.add_argument("--from", dest="ym_from", help="시작 년월 YYYYMM (기본: 이번 달)")
+        parser.add_argument("--to", dest="ym_to", help="종료 년월 YYYYMM (기본: 시작 년월)")
+        parser.add_argument("--prefix", default="bench", help="지점코드 접두어 (예: bench01, bench02 ...)")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--no-materialize", action="store_true", help="일별 근태(AttendanceDay) 계산 생략")
+
+    def handle(self, *args, **options):
+        today = timezone.now().date()
+        try:
+            start = parse_ym(options["ym_from"]) if options["ym_from"] else (today.year, today.month)
+            end = parse_ym(options["ym_to"]) if options["ym_to"] else start
+        except ValueError as e:
+            raise CommandError(str(e))
+        if end < start:
+            raise CommandError("종료 년월이 시작 년월보다 앞설 수 없습니다.")
+
+        prefix = options["prefix"].lower()
+        codes = [f"{prefix}{b:02d}" for b in range(1, options["branches"] + 1)]
+        if Branch.objects.filter(code__in=codes).exists():
+            raise CommandError(f"이미 존재하는 지점코드가 있습니다: {prefix}NN (--prefix로 바꿔주세요)")
+
+        for synth in generate(
+            branches=options["branches"], employees=options["employees"], start=start, end=end,
+            seed=options["seed"], prefix=prefix, materialize=not options["no_materialize"],
+        ):
+            self.stdout.write(
+                f"{synth.branch.code}: 직원 {len(synth.user_ids)}명, {len(synth.months)}개월"
+            )
+        self.stdout.write(self.style.SUCCESS("완료"))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from common.models import Branch
+from wtm.services.attendance_store import iter_months, month_user_ids, parse_ym, refresh_attendance_stream
+from wtm.services.module_usage import rebuild_module_usage
+
+
+class Command(BaseCommand):
+    help = "일별 근태(AttendanceDay)와 지난 달 월 집계(AttendanceMonth)를 원천(Work/Schedule/Module)에서 다시 계산해 저장한다. (백필/복구용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--branch", help="지점코드 (생략 시 전체 지점)")
+        parser.add_argument("--from", dest="ym_from", help="시작 년월 YYYYMM (기본: 이번 달)")
+        parser.add_argument("--to", dest="ym_to", help="종료 년월 YYYYMM (기본: 시작 년월)")
+        parser.add_argument("--chunk", type=int, default=200, help="한 번에 조회/저장할 사용자 수 (메모리 상한)")
+        parser.add_argument("--module-usage", action="store_true", help="근로모듈 역인덱스(ModuleUsage)도 다시 만든다")
+
+    def handle(self, *args, **options):
+        today = timezone.now().date()
+        try:
+            start = parse_ym(options["ym_from"]) if options["ym_from"] else (today.year, today.month)
+            end = parse_ym(options["ym_to"]) if options["ym_to"] else start
+        except ValueError as e:
+            raise CommandError(str(e))
+        if end < start:
+            raise CommandError("종료 년월이 시작 년월보다 앞설 수 없습니다.")
+        chunk = max(1, options["chunk"])
+
+        branches = Branch.objects.all()
+        if options["branch"]:
+            branches = branches.filter(code=options["branch"])
+            if not branches.exists():
+                raise CommandError(f"지점을 찾을 수 없습니다: {options['branch']}")
+
+        total = 0
+        for branch in branches:
+            if options["module_usage"]:
+                usages = rebuild_module_usage(branch=branch)
+                self.stdout.write(f"{branch.code}: 근로모듈 역인덱스 {usages}행")
+            for year, month in iter_months(start, end):
+                # 근무표 또는 근태기록이 있는 사용자만 대상
+                user_ids = month_user_ids(branch=branch, year=year, month=month)
+
+                # 사용자 단위 스트리밍 계산, chunk명씩 저장
+                rows = refresh_attendance_stream(
+                    branch=branch, year=year, month=month, user_ids=user_ids, user_chunk=chunk,
+                )
+                total += rows
+                self.stdout.write(f"{branch.code} {year:04d}{month:02d}: 사용자 {len(user_ids)}명, {rows}행")
+
+        self.stdout.write(self.style.SUCCESS(f"완료: {total}행"))
@@ -0,0 +1,66 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0012_branch_unique_constraints"),
+        ("wtm", "0010_branch_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttendanceDay",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("record_day", models.DateField(verbose_name="근무일자")),
+                ("checkin_seconds", models.IntegerField(blank=True, null=True, verbose_name="최초 출근")),
+                ("last_out_seconds", models.IntegerField(blank=True, null=True, verbose_name="최종 퇴근")),
+                ("checkout_seconds", models.IntegerField(blank=True, null=True, verbose_name="퇴근(보정 반영)")),
+                ("late_seconds", models.PositiveIntegerField(default=0)),
+                ("early_seconds", models.PositiveIntegerField(default=0)),
+                ("overtime_seconds", models.PositiveIntegerField(default=0)),
+                ("holiday_seconds", models.PositiveIntegerField(default=0)),
+                ("status_codes", models.CharField(max_length=100, verbose_name="상태코드")),
+                ("computed_on", models.DateField(verbose_name="계산기준일")),
+                (
+                    "branch",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_days",
+                        to="common.branch",
+                        verbose_name="지점",
+                    ),
+                ),
+                (
+                    "module",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="attendance_days",
+                        to="wtm.module",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_days",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("branch", "user", "record_day"),
+                        name="attendanceday_branch_user_day_uniq",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0012_branch_unique_constraints"),
+        ("wtm", "0011_attendanceday"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttendanceMonth",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("ym", models.CharField(max_length=6, verbose_name="년월")),
+                ("cutoff_day", models.PositiveSmallIntegerField(blank=True, null=True, verbose_name="집계 마지막 일자")),
+                ("late_count", models.PositiveIntegerField(default=0)),
+                ("late_seconds", models.PositiveIntegerField(default=0)),
+                ("early_count", models.PositiveIntegerField(default=0)),
+                ("early_seconds", models.PositiveIntegerField(default=0)),
+                ("overtime_count", models.PositiveIntegerField(default=0)),
+                ("overtime_seconds", models.PositiveIntegerField(default=0)),
+                ("holiday_count", models.PositiveIntegerField(default=0)),
+                ("holiday_seconds", models.PositiveIntegerField(default=0)),
+                ("error_count", models.PositiveIntegerField(default=0)),
+                ("reg_late_count", models.PositiveIntegerField(default=0)),
+                ("reg_late_seconds", models.PositiveIntegerField(default=0)),
+                ("reg_early_count", models.PositiveIntegerField(default=0)),
+                ("reg_early_seconds", models.PositiveIntegerField(default=0)),
+                ("reg_overtime_count", models.PositiveIntegerField(default=0)),
+                ("reg_overtime_seconds", models.PositiveIntegerField(default=0)),
+                ("hol_total_seconds", models.PositiveIntegerField(default=0)),
+                ("hol_work_count", models.PositiveIntegerField(default=0)),
+                ("hol_work_seconds", models.PositiveIntegerField(default=0)),
+                ("hol_late_count", models.PositiveIntegerField(default=0)),
+                ("hol_late_seconds", models.PositiveIntegerField(default=0)),
+                ("hol_early_count", models.PositiveIntegerField(default=0)),
+                ("hol_early_seconds", models.PositiveIntegerField(default=0)),
+                ("hol_overtime_count", models.PositiveIntegerField(default=0)),
+                ("hol_overtime_seconds", models.PositiveIntegerField(default=0)),
+                ("nopay_count", models.PositiveIntegerField(default=0)),
+                (
+                    "branch",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_months",
+                        to="common.branch",
+                        verbose_name="지점",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_months",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("branch", "user", "ym"),
+                        name="attendancemonth_branch_user_ym_uniq",
+                    ),
+                ],
+            },
+        ),
+    ]
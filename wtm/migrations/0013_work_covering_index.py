@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wtm", "0012_attendancemonth"),
+    ]
+
+    operations = [
+        # (branch, user_id, record_day)는 새 인덱스의 앞부분이라 대체된다
+        migrations.RemoveIndex(
+            model_name="work",
+            name="work_branch_user_day_idx",
+        ),
+        migrations.AddIndex(
+            model_name="work",
+            index=models.Index(
+                fields=["branch", "user_id", "record_day", "work_code", "record_date"],
+                name="work_branch_user_day_cov_idx",
+            ),
+        ),
+    ]
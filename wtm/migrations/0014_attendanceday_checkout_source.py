@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+def backfill_checkout_source(apps, schema_editor):
+    AttendanceDay = apps.get_model("wtm", "AttendanceDay")
+    AttendanceDay.objects.filter(last_out_seconds__isnull=False).update(checkout_source="R")
+    AttendanceDay.objects.filter(last_out_seconds__isnull=True, checkout_seconds__isnull=False).update(
+        checkout_source="S",
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wtm", "0013_work_covering_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attendanceday",
+            name="checkout_source",
+            field=models.CharField(
+                blank=True,
+                choices=[("", "없음"), ("R", "퇴근기록"), ("S", "종업시각 보정")],
+                default="",
+                max_length=1,
+                verbose_name="퇴근 출처",
+            ),
+        ),
+        migrations.RunPython(backfill_checkout_source, migrations.RunPython.noop),
+    ]
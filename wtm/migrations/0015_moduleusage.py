@@ -0,0 +1,92 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_module_usage(apps, schema_editor):
+    Schedule = apps.get_model("wtm", "Schedule")
+    ModuleUsage = apps.get_model("wtm", "ModuleUsage")
+    day_fields = [f"d{d}_id" for d in range(1, 32)]
+
+    rows = []
+    for sid, branch_id, user_id, year, month, *module_ids in (
+        Schedule.objects.filter(user__isnull=False)
+        .values_list("id", "branch_id", "user_id", "year", "month", *day_fields)
+        .iterator(chunk_size=2000)
+    ):
+        masks = {}
+        for d, mid in enumerate(module_ids):
+            if mid:
+                masks[mid] = masks.get(mid, 0) | (1 << d)
+        rows.extend(
+            ModuleUsage(
+                module_id=mid, schedule_id=sid, branch_id=branch_id, user_id=user_id,
+                year=int(year), month=int(month), days=mask,
+            )
+            for mid, mask in masks.items()
+        )
+        if len(rows) >= 2000:
+            ModuleUsage.objects.bulk_create(rows)
+            rows = []
+    ModuleUsage.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0012_branch_unique_constraints"),
+        ("wtm", "0014_attendanceday_checkout_source"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ModuleUsage",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("year", models.PositiveSmallIntegerField(verbose_name="년")),
+                ("month", models.PositiveSmallIntegerField(verbose_name="월")),
+                ("days", models.PositiveIntegerField(verbose_name="사용 일자")),
+                (
+                    "branch",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="module_usages",
+                        to="common.branch",
+                        verbose_name="지점",
+                    ),
+                ),
+                (
+                    "module",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="usages",
+                        to="wtm.module",
+                    ),
+                ),
+                (
+                    "schedule",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="module_usages",
+                        to="wtm.schedule",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="module_usages",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["module", "year", "month"], name="moduleusage_module_ym_idx")],
+                "constraints": [
+                    models.UniqueConstraint(fields=("schedule", "module"), name="moduleusage_schedule_module_uniq"),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_module_usage, migrations.RunPython.noop),
+    ]
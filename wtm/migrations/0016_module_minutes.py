@@ -0,0 +1,74 @@
+from django.db import migrations, models
+
+MINUTE_FIELDS = {
+    "start_time": "start_min",
+    "end_time": "end_min",
+    "rest1_start_time": "rest1_start_min",
+    "rest1_end_time": "rest1_end_min",
+    "rest2_start_time": "rest2_start_min",
+    "rest2_end_time": "rest2_end_min",
+}
+
+
+def hhmm_to_minutes(value):
+    value = (value or "").strip()
+    if len(value) != 5 or value[2] != ":":
+        return None
+    hh, mm = value[:2], value[3:]
+    if not (hh.isdigit() and mm.isdigit()) or int(hh) > 23 or int(mm) > 59:
+        return None
+    return int(hh) * 60 + int(mm)
+
+
+def backfill_minutes(apps, schema_editor):
+    Module = apps.get_model("wtm", "Module")
+    modules = list(Module.objects.all())
+    for module in modules:
+        for time_field, min_field in MINUTE_FIELDS.items():
+            setattr(module, min_field, hhmm_to_minutes(getattr(module, time_field)))
+    Module.objects.bulk_update(modules, list(MINUTE_FIELDS.values()), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wtm", "0015_moduleusage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="module",
+            name="start_min",
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name="시업(분)"),
+        ),
+        migrations.AddField(
+            model_name="module",
+            name="end_min",
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name="종업(분)"),
+        ),
+        migrations.AddField(
+            model_name="module",
+            name="rest1_start_min",
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name="휴게1시작(분)"),
+        ),
+        migrations.AddField(
+            model_name="module",
+            name="rest1_end_min",
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name="휴게1종료(분)"),
+        ),
+        migrations.AddField(
+            model_name="module",
+            name="rest2_start_min",
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name="휴게2시작(분)"),
+        ),
+        migrations.AddField(
+            model_name="module",
+            name="rest2_end_min",
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name="휴게2종료(분)"),
+        ),
+        migrations.AddIndex(
+            model_name="module",
+            index=models.Index(fields=["branch", "start_min", "end_min"], name="module_branch_minutes_idx"),
+        ),
+        migrations.RunPython(backfill_minutes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0012_branch_unique_constraints"),
+        ("wtm", "0016_module_minutes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduleGridVersion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("ym", models.CharField(blank=True, max_length=6, verbose_name="년월")),
+                ("version", models.PositiveIntegerField(default=0, verbose_name="버전")),
+                (
+                    "branch",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="schedule_grid_versions",
+                        to="common.branch",
+                        verbose_name="지점",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("branch", "ym"), name="schedulegridversion_branch_ym_uniq"),
+                ],
+            },
+        ),
+    ]
@@ -1,13 +1,35 @@
 from django.db import models
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from common.models import Branch, User
+from common.loader import clear_request_cache
+from common.models import Branch, Business, Dept, Holiday, Position, User
+
+
+def hhmm_to_minutes(value) -> "int | None":
+    """'HH:MM' → 자정 기준 분. '-' / 빈 값 / 형식 오류는 None (attendance_calc.to_seconds와 같은 판정)"""
+    value = (value or "").strip()
+    if len(value) != 5 or value[2] != ":":
+        return None
+    hh, mm = value[:2], value[3:]
+    if not (hh.isdigit() and mm.isdigit()) or int(hh) > 23 or int(mm) > 59:
+        return None
+    return int(hh) * 60 + int(mm)
 
 
 # 근로모듈
 class Module(models.Model):
+    # 문자열 시각(HH:MM, '-'=없음) → 분 컬럼 (save 때 함께 저장, 정수 비교/인덱스용)
+    MINUTE_FIELDS = {
+        "start_time": "start_min",
+        "end_time": "end_min",
+        "rest1_start_time": "rest1_start_min",
+        "rest1_end_time": "rest1_end_min",
+        "rest2_start_time": "rest2_start_min",
+        "rest2_end_time": "rest2_end_min",
+    }
+
     cat = models.CharField("구분", max_length=20)
     name = models.CharField("근로명", max_length=50)
     start_time = models.CharField("시업시각", max_length=5)
@@ -16,6 +38,12 @@ class Module(models.Model):
     rest1_end_time = models.CharField("휴게1종료시각", max_length=5)
     rest2_start_time = models.CharField("휴게2시작시각", max_length=5)
     rest2_end_time = models.CharField("휴게2종료시각", max_length=5)
+    start_min = models.PositiveSmallIntegerField("시업(분)", null=True, blank=True, editable=False)
+    end_min = models.PositiveSmallIntegerField("종업(분)", null=True, blank=True, editable=False)
+    rest1_start_min = models.PositiveSmallIntegerField("휴게1시작(분)", null=True, blank=True, editable=False)
+    rest1_end_min = models.PositiveSmallIntegerField("휴게1종료(분)", null=True, blank=True, editable=False)
+    rest2_start_min = models.PositiveSmallIntegerField("휴게2시작(분)", null=True, blank=True, editable=False)
+    rest2_end_min = models.PositiveSmallIntegerField("휴게2종료(분)", null=True, blank=True, editable=False)
     meal_amount = models.PositiveIntegerField("식대(원)", null=True, blank=True)
     color = models.IntegerField()
     reg_id = models.ForeignKey(User, on_delete=models.PROTECT, related_name='reg_id')
@@ -39,11 +67,22 @@ class Module(models.Model):
                 Module.objects.filter(branch=self.branch).aggregate(m=Max('order'))['m'] or 0
             )
             self.order = max_order + 1
+        self.sync_minutes()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = set(update_fields) | {
+                self.MINUTE_FIELDS[f] for f in update_fields if f in self.MINUTE_FIELDS
+            }
         super().save(*args, **kwargs)
 
+    def sync_minutes(self):
+        for time_field, min_field in self.MINUTE_FIELDS.items():
+            setattr(self, min_field, hhmm_to_minutes(getattr(self, time_field)))
+
     class Meta:
         indexes = [
             models.Index(fields=["branch", "order"], name="module_branch_order_idx"),
+            models.Index(fields=["branch", "start_min", "end_min"], name="module_branch_minutes_idx"),
         ]
 
 
@@ -156,7 +195,11 @@ class Work(models.Model):
         ]
         indexes = [
             models.Index(fields=["branch", "record_day"], name="work_branch_day_idx"),
-            models.Index(fields=["branch", "user_id", "record_day"], name="work_branch_user_day_idx"),
+            # 기간 조회(prepare_month 등)가 테이블 접근 없이 인덱스만으로 끝나도록 코드/시각까지 포함
+            models.Index(
+                fields=["branch", "user_id", "record_day", "work_code", "record_date"],
+                name="work_branch_user_day_cov_idx",
+            ),
         ]
 
 # Work 저장시 항상 record_day를 record_date에 맞춰 설정해줌
@@ -167,6 +210,230 @@ def set_record_day(sender, instance: Work, **kwargs):
         instance.record_date = timezone.now()
     # 항상 record_day 동기화
     instance.record_day = instance.record_date.date()
+
+
+# 일별 근태 (Work/Schedule/Module에서 계산해 저장해 두는 값)
+class AttendanceDay(models.Model):
+    class CheckoutSource(models.TextChoices):
+        NONE = '', '없음'
+        REAL = 'R', '퇴근기록'
+        INFERRED = 'S', '종업시각 보정'
+
+    branch = models.ForeignKey(
+        Branch,
+        verbose_name="지점",
+        on_delete=models.CASCADE,
+        related_name="attendance_days",
+    )
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="attendance_days")
+    record_day = models.DateField("근무일자")
+    module = models.ForeignKey(
+        Module, on_delete=models.SET_NULL, null=True, blank=True, related_name="attendance_days",
+    )
+    # 시각은 자정 기준 초
+    checkin_seconds = models.IntegerField("최초 출근", null=True, blank=True)
+    last_out_seconds = models.IntegerField("최종 퇴근", null=True, blank=True)
+    checkout_seconds = models.IntegerField("퇴근(보정 반영)", null=True, blank=True)
+    checkout_source = models.CharField(
+        "퇴근 출처", max_length=1, choices=CheckoutSource.choices, blank=True, default=CheckoutSource.NONE,
+    )
+    late_seconds = models.PositiveIntegerField(default=0)
+    early_seconds = models.PositiveIntegerField(default=0)
+    overtime_seconds = models.PositiveIntegerField(default=0)
+    holiday_seconds = models.PositiveIntegerField(default=0)
+    status_codes = models.CharField("상태코드", max_length=100)  # 예: "REGULAR,LATE"
+    # 계산 기준일: record_day < computed_on 이면 과거일로 확정 계산된 값
+    computed_on = models.DateField("계산기준일")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["branch", "user", "record_day"], name="attendanceday_branch_user_day_uniq",
+            ),
+        ]
+
+    @property
+    def is_finalized(self) -> bool:
+        """다음 날 이후에 계산된 행 (퇴근 보정까지 확정)"""
+        return self.computed_on > self.record_day
+
+
+# 월별 근태 집계 (AttendanceDay 월 합계. 지난 달만 저장)
+class AttendanceMonth(models.Model):
+    branch = models.ForeignKey(
+        Branch,
+        verbose_name="지점",
+        on_delete=models.CASCADE,
+        related_name="attendance_months",
+    )
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="attendance_months")
+    ym = models.CharField("년월", max_length=6)  # YYYYMM
+    # 퇴사월이면 퇴사일까지만 합산 (None = 월 전체)
+    cutoff_day = models.PositiveSmallIntegerField("집계 마지막 일자", null=True, blank=True)
+
+    # 합계
+    late_count = models.PositiveIntegerField(default=0)
+    late_seconds = models.PositiveIntegerField(default=0)
+    early_count = models.PositiveIntegerField(default=0)
+    early_seconds = models.PositiveIntegerField(default=0)
+    overtime_count = models.PositiveIntegerField(default=0)
+    overtime_seconds = models.PositiveIntegerField(default=0)
+    holiday_count = models.PositiveIntegerField(default=0)
+    holiday_seconds = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+
+    # 소정근로
+    reg_late_count = models.PositiveIntegerField(default=0)
+    reg_late_seconds = models.PositiveIntegerField(default=0)
+    reg_early_count = models.PositiveIntegerField(default=0)
+    reg_early_seconds = models.PositiveIntegerField(default=0)
+    reg_overtime_count = models.PositiveIntegerField(default=0)
+    reg_overtime_seconds = models.PositiveIntegerField(default=0)
+
+    # 휴일근로
+    hol_total_seconds = models.PositiveIntegerField(default=0)
+    hol_work_count = models.PositiveIntegerField(default=0)
+    hol_work_seconds = models.PositiveIntegerField(default=0)
+    hol_late_count = models.PositiveIntegerField(default=0)
+    hol_late_seconds = models.PositiveIntegerField(default=0)
+    hol_early_count = models.PositiveIntegerField(default=0)
+    hol_early_seconds = models.PositiveIntegerField(default=0)
+    hol_overtime_count = models.PositiveIntegerField(default=0)
+    hol_overtime_seconds = models.PositiveIntegerField(default=0)
+
+    # 무급휴무
+    nopay_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["branch", "user", "ym"], name="attendancemonth_branch_user_ym_uniq",
+            ),
+        ]
+
+
+# 근로모듈 역인덱스 (근로모듈 → 근무표 셀). 근무표 저장 시 갱신, 근로모듈 수정 시 사용 셀만 다시 계산
+class ModuleUsage(models.Model):
+    module = models.ForeignKey(Module, on_delete=models.CASCADE, related_name="usages")
+    schedule = models.ForeignKey(Schedule, on_delete=models.CASCADE, related_name="module_usages")
+    branch = models.ForeignKey(
+        Branch,
+        verbose_name="지점",
+        on_delete=models.CASCADE,
+        related_name="module_usages",
+    )
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="module_usages")
+    year = models.PositiveSmallIntegerField("년")
+    month = models.PositiveSmallIntegerField("월")
+    days = models.PositiveIntegerField("사용 일자")  # 비트마스크: (1 << (일 - 1))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["schedule", "module"], name="moduleusage_schedule_module_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["module", "year", "month"], name="moduleusage_module_ym_idx"),
+        ]
+
+
+# 근무표 화면 캐시 버전 (wtm.services.schedule_cache)
+class ScheduleGridVersion(models.Model):
+    branch = models.ForeignKey(
+        Branch,
+        verbose_name="지점",
+        on_delete=models.CASCADE,
+        related_name="schedule_grid_versions",
+    )
+    ym = models.CharField("년월", max_length=6, blank=True)  # "" = 지점 전체 (근로모듈/직원/공휴일/영업일)
+    version = models.PositiveIntegerField("버전", default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["branch", "ym"], name="schedulegridversion_branch_ym_uniq"),
+        ]
+
+
+# Work 저장 전 기존 근무일자 보관 (근태시간 수정으로 일자가 바뀌면 이전 일자도 다시 계산)
+@receiver(pre_save, sender=Work)
+def remember_prev_record_day(sender, instance: Work, **kwargs):
+    instance._prev_record_day = None
+    if instance.pk:
+        instance._prev_record_day = (
+            Work.objects.filter(pk=instance.pk).values_list("record_day", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Work)
+@receiver(post_delete, sender=Work)
+def sync_attendance_for_work(sender, instance: Work, **kwargs):
+    from wtm.services.attendance_store import on_work_changed
+    clear_request_cache()
+    days = {instance.record_day}
+    prev = getattr(instance, "_prev_record_day", None)
+    if prev:
+        days.add(prev)
+    on_work_changed(branch=instance.branch_id, user_id=instance.user_id, days=days)
+
+
+@receiver(post_save, sender=Schedule)
+@receiver(post_delete, sender=Schedule)
+def sync_attendance_for_schedule(sender, instance: Schedule, **kwargs):
+    from wtm.services.attendance_store import on_schedule_changed
+    from wtm.services.module_usage import sync_module_usage
+    from wtm.services.schedule_cache import bump_schedule_grid
+    clear_request_cache()
+    bump_schedule_grid(instance.branch_id, f"{int(instance.year):04d}{int(instance.month):02d}")
+    if kwargs.get("signal") is post_save:
+        sync_module_usage(instance)  # 삭제 시에는 CASCADE로 함께 지워짐
+    on_schedule_changed(instance)
+
+
+# Module 저장 전 근태 계산에 쓰이는 필드 보관 (식대/색상/순서만 바뀌면 다시 계산하지 않음)
+MODULE_ATTENDANCE_FIELDS = (
+    "cat", "start_time", "end_time", "rest1_start_time", "rest1_end_time", "rest2_start_time", "rest2_end_time",
+)
+
+
+@receiver(pre_save, sender=Module)
+def remember_prev_module(sender, instance: Module, **kwargs):
+    instance._prev_attendance_fields = None
+    if instance.pk:
+        instance._prev_attendance_fields = (
+            Module.objects.filter(pk=instance.pk).values_list(*MODULE_ATTENDANCE_FIELDS).first()
+        )
+
+
+@receiver(post_save, sender=Module)
+def sync_attendance_for_module(sender, instance: Module, created, **kwargs):
+    from wtm.services.schedule_cache import bump_schedule_grid
+    clear_request_cache()
+    bump_schedule_grid(instance.branch_id)
+    if created:
+        return
+    prev = getattr(instance, "_prev_attendance_fields", None)
+    if prev is not None and prev == tuple(getattr(instance, f) for f in MODULE_ATTENDANCE_FIELDS):
+        return
+    from wtm.services.attendance_store import on_module_changed
+    on_module_changed(instance)
+
+
+# 근무표 화면에 보이는 지점 공통 데이터(근로모듈 삭제, 직원/부서/직위, 공휴일/영업일)가 바뀌면 화면 캐시 무효화
+@receiver(post_delete, sender=Module)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Dept)
+@receiver(post_delete, sender=Dept)
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+@receiver(post_save, sender=Holiday)
+@receiver(post_delete, sender=Holiday)
+@receiver(post_save, sender=Business)
+@receiver(post_delete, sender=Business)
+def invalidate_schedule_grid(sender, instance, **kwargs):
+    from wtm.services.schedule_cache import bump_schedule_grid
+    if set(kwargs.get("update_fields") or ()) == {"last_login"}:
+        return  # 로그인 시각만 바뀐 경우
+    bump_schedule_grid(instance.branch_id)
 
 
 # 비콘정보
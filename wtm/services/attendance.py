@@ -1,14 +1,23 @@
-from datetime import date, datetime
+from array import array
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
 from calendar import monthrange
-from typing import Optional
+from typing import Iterator, Optional, TYPE_CHECKING
 
+from django.db.models import Q
 from django.utils import timezone
+from common.loader import load
 from wtm.models import Work, Schedule, Module
 from wtm.attendance_calc import (
-    LogsDay, to_dt, compute_seconds_status_for_day
+    ATTENDANCE_MEMO, ST_ERROR, BatchMetrics, DayMetrics, classify_day, compile_module,
+    compute_seconds_status_for_day_int, evaluate_batch, status_codes_of, status_flags_of, status_labels_of,
+    time_to_seconds,
 )
 from types import SimpleNamespace
 
+if TYPE_CHECKING:
+    from wtm.models import AttendanceDay
+
 
 # 퇴근시간 결정 헬퍼 함수
 def determine_checkout_time(
@@ -44,98 +53,84 @@ def determine_checkout_time(
     return None
 
 
+def determine_checkout_seconds(
+    checkout_dt: Optional[datetime],
+    record_day: date,
+    checkin_dt: Optional[datetime],
+    sched_end_sec: Optional[int],
+    today: date,
+) -> Optional[int]:
+    """
+    determine_checkout_time의 초(int) 버전. 정책은 동일하다.
+    - 반환: 자정 기준 초 (실제 퇴근 or 근무표 종업시각 보정), 없으면 None
+    - 출근 ≤ 종업 비교는 마이크로초까지 포함해 datetime 비교와 같은 결과를 낸다.
+    """
+    if checkout_dt:
+        return time_to_seconds(checkout_dt)
+
+    if (
+        record_day < today
+        and sched_end_sec is not None
+        and checkin_dt is not None
+        and (time_to_seconds(checkin_dt), checkin_dt.microsecond) <= (sched_end_sec, 0)
+    ):
+        return sched_end_sec
+
+    return None
+
+
+def seconds_to_hhmmss(sec: Optional[int]) -> Optional[str]:
+    """자정 기준 초 → 'HH:MM:SS' (None이면 None). 화면/앱 응답용."""
+    if sec is None:
+        return None
+    return f"{sec // 3600:02d}:{sec % 3600 // 60:02d}:{sec % 60:02d}"
+
+
 # 앱 캘린더에서 사용. 1인 * 1개월
 def build_monthly_attendance_for_user(user, year: int, month: int) -> list[dict]:
-    """한 사용자에 대한 '월간 근태' 리스트를 생성."""
-    branch = getattr(user, "branch", None)
-    # 1. 근무표 조회 : Schedule 가져올 때 한 방에 join → 이후 schedule.d1… 접근 시 추가 쿼리 없음
-    try:
-        schedule = (
-            Schedule.objects
-            .select_related(*[f'd{i}' for i in range(1, 32)])
-            .get(user=user, year=str(year), month=f"{month:02d}", branch=branch)
-        )
-    except Schedule.DoesNotExist:
-        schedule = None
+    """
+    한 사용자에 대한 '월간 근태' 리스트를 생성.
+    - 일별 근태(AttendanceDay)를 범위 조회 1회로 읽는다. (유효하지 않은 셀만 재계산)
+    """
+    from wtm.services.attendance_store import read_attendance_month
 
-    # 2. 근태기록 조회
-    works = (
-        Work.objects
-        .filter(user=user, branch=branch, record_day__year=year, record_day__month=month)
-        .values('record_day', 'work_code', 'record_date')
-        .order_by('record_day', 'record_date')
+    branch = getattr(user, "branch", None)
+    now = timezone.now()
+    cells, metrics = read_attendance_month(
+        branch=branch, year=year, month=month, user_ids=[user.id], now=now,
     )
 
-    # 날짜별로 출퇴근 매핑
-    work_map: dict[date, dict[str, list[datetime]]] = {}
-    for w in works:
-        day = w["record_day"]
-        code = w["work_code"]  # "I" 또는 "O"
-        if day not in work_map:
-            work_map[day] = {"I": [], "O": []}
-        work_map[day][code].append(w["record_date"])
-
-    # 3. 월간 루프 돌면서 데이터 구성
-    results: list[dict] = []
-    days_in_month = monthrange(year, month)[1]
-    today = timezone.now().date()
-
     # 최종근로일자 이후는 NOSCHEDULE로 처리
     out_date = getattr(user, "out_date", None)
+    cutoff_metrics = None
 
-    for day in range(1, days_in_month + 1):
-        record_day = date(year, month, day)
-
+    results: list[dict] = []
+    for i, record_day in enumerate(cells.days):
         # 최종근로일자 다음날부터는 근무표/로그 무시하고 NOSCHEDULE 로 처리하기 위한 작업을 cutoff를 통해 수행
         cutoff = (out_date is not None and record_day > out_date)
 
         module: Module | None = None
-        if not cutoff and schedule:
-            module = getattr(schedule, f"d{day}", None)
-
-        # 근태기록 목록 (이미 record_date 기준 정렬됨)
+        checkout_inferred = False
         if cutoff:
-            ins, outs = [], []
+            checkin_time = checkout_time = None
+            if cutoff_metrics is None:
+                cutoff_metrics = compute_seconds_status_for_day_int(record_day, None, None, None, now=now)
+            m = cutoff_metrics
+            late, early, over, hol = m.late_seconds, m.early_seconds, m.overtime_seconds, m.holiday_seconds
+            status_codes, status_labels, status = m.status_codes, m.status_labels, m.status
         else:
-            ins = work_map.get(record_day, {}).get("I", [])
-            outs = work_map.get(record_day, {}).get("O", [])
-
-        # 출근 시각 (가장 이른 I)
-        checkin_dt: datetime | None = ins[0] if ins else None
-        checkin_time: str | None = (
-            checkin_dt.strftime("%H:%M:%S") if checkin_dt else None
-        )
-
-        # 근무표 종업시각 파싱
-        sched_end_hhmm: str | None = (
-            module.end_time
-            if (module and module.end_time and module.end_time != "-")
-            else None
-        )
-        sched_end_dt: datetime | None = (
-            to_dt(record_day, sched_end_hhmm) if sched_end_hhmm else None
-        )
-
-        # 퇴근 datetime (가장 늦은 O)
-        checkout_dt: datetime | None = outs[-1] if outs else None
-
-        # 퇴근시각 결정 (공통 헬퍼 사용)
-        checkout_time: str | None = determine_checkout_time(
-            checkout_dt=checkout_dt,
-            record_day=record_day,
-            checkin_dt=checkin_dt,
-            sched_end_dt=sched_end_dt,
-            today=today,
-        )
-
-        # 최종 로그 (보정 결과 포함)
-        log = LogsDay(
-            checkin=checkin_time,
-            checkout=checkout_time,
-        )
-
-        # compute_seconds_status_for_day 로 초 단위 계산
-        metrics = compute_seconds_status_for_day(record_day, module, log)
+            mi = cells.module_idx[i]
+            if mi >= 0:
+                module = cells.modules.get(cells.palette[mi].module_id)
+            checkin_time = seconds_to_hhmmss(cells.checkin[i] if cells.checkin[i] >= 0 else None)
+            checkout_time = seconds_to_hhmmss(cells.checkout[i] if cells.checkout[i] >= 0 else None)
+            checkout_inferred = cells.checkout[i] >= 0 and cells.last_out[i] < 0
+            late, early = metrics.late_seconds[i], metrics.early_seconds[i]
+            over, hol = metrics.overtime_seconds[i], metrics.holiday_seconds[i]
+            flags = metrics.status_flags[i]
+            status_codes = list(status_codes_of(flags))
+            status_labels = list(status_labels_of(flags))
+            status = "+".join(status_labels)
 
         results.append({
             "record_day": record_day,
@@ -145,24 +140,25 @@ def build_monthly_attendance_for_user(user, year: int, month: int) -> list[dict]
             "checkout_time": checkout_time,
 
             # 상태(앱은 status_codes/labels 배열을 쓰면 됨)
-            "status": metrics.status,
-            "status_codes": metrics.status_codes,  # ["REGULAR","LATE",...]
-            "status_labels": metrics.status_labels,  # ["소정근로","지각",...]
+            "status": status,
+            "status_codes": status_codes,  # ["REGULAR","LATE",...]
+            "status_labels": status_labels,  # ["소정근로","지각",...]
 
             # 근로모듈
             "work_cat": module.cat if module else None,
             "work_name": module.name if module else None,
 
             # 초 단위 지표(휴게 반영)
-            "late_seconds": metrics.late_seconds,
-            "early_seconds": metrics.early_seconds,
-            "overtime_seconds": metrics.overtime_seconds,
-            "holiday_seconds": metrics.holiday_seconds,
+            "late_seconds": late,
+            "early_seconds": early,
+            "overtime_seconds": over,
+            "holiday_seconds": hol,
 
             # 프런트 편의
-            "is_late": metrics.late_seconds > 0,
-            "is_early_checkout": metrics.early_seconds > 0,
-            "is_overtime": metrics.overtime_seconds > 0,
+            "is_late": late > 0,
+            "is_early_checkout": early > 0,
+            "is_overtime": over > 0,
+            "is_checkout_inferred": checkout_inferred,  # 퇴근기록 없이 종업시각으로 보정
         })
 
     return results
@@ -176,6 +172,7 @@ def build_daily_attendance_for_users(base_rows: list[dict], day: date, *, branch
     - day: 기준 일자 (datetime.date)
     정책:
       - 퇴근시각 보정: 오늘은 보정 안 함. 과거일이고 (출근시각 ≤ 근무표 종업시각)일 때만 종업시각으로 보정.
+      - 지난 일자는 확정된 일별 근태(AttendanceDay)를 그대로 쓰고, 확정 전인 사용자만 근태기록으로 계산한다.
       - 초/상태 계산은 compute_seconds_status_for_day 재사용.
     반환:
       - 템플릿(index.html)의 컬럼명에 맞춘 dict 리스트.
@@ -183,7 +180,8 @@ def build_daily_attendance_for_users(base_rows: list[dict], day: date, *, branch
     if not base_rows:
         return []
 
-    today = timezone.now().date()
+    now = timezone.now()
+    today = now.date()
 
     # 1) 사용자 id 수집 (순서 보존)
     user_ids = []
@@ -194,10 +192,23 @@ def build_daily_attendance_for_users(base_rows: list[dict], day: date, *, branch
             user_ids.append(uid)
             seen.add(uid)
 
-    # 2) 해당 일자 근태기록 일괄 조회 → 최초 IN / 최종 OUT
+    # 2) 지난 일자: 확정 행 사용 (근무표 모듈이 같을 때만)
+    frozen: dict[int, "AttendanceDay"] = {}
+    if day < today:
+        from wtm.services.attendance_store import read_finalized_days
+
+        module_of = {r.get("user_id"): r.get("module_id") for r in base_rows}
+        frozen = {
+            uid: row
+            for uid, row in read_finalized_days(branch=branch, day=day, user_ids=user_ids).items()
+            if row.module_id == module_of.get(uid)
+        }
+    live_ids = [uid for uid in user_ids if uid not in frozen]
+
+    # 3) 나머지 사용자: 해당 일자 근태기록 일괄 조회 → 최초 IN / 최종 OUT
     works = (
         Work.objects
-        .filter(user_id__in=user_ids, branch=branch, record_day=day)
+        .filter(user_id__in=live_ids, branch=branch, record_day=day)
         .only("user_id", "work_code", "record_date")
         .order_by("record_date")
     )
@@ -211,15 +222,32 @@ def build_daily_attendance_for_users(base_rows: list[dict], day: date, *, branch
             if prev is None or w.record_date > prev:
                 last_out[w.user_id] = w.record_date
 
-    # 3) 공통 코어 호출하여 분/상태 계산
+    # 4) 공통 코어 호출하여 분/상태 계산 (근로모듈은 지점 캐시의 Module → 컴파일 캐시 재사용)
+    modules = branch_modules(branch) if live_ids else {}
     work_list: list[dict] = []
     for r in base_rows:
         uid = r["user_id"]
-
-        # 근로모듈 래핑(코어가 기대하는 속성만 제공)
+        row = frozen.get(uid)
+        if row is not None:
+            work_list.append(_daily_row(
+                r,
+                checkin_sec=row.checkin_seconds,
+                checkout_sec=row.checkout_seconds,
+                checkout_inferred=row.checkout_source == row.CheckoutSource.INFERRED,
+                metrics=DayMetrics(
+                    late_seconds=row.late_seconds,
+                    early_seconds=row.early_seconds,
+                    overtime_seconds=row.overtime_seconds,
+                    holiday_seconds=row.holiday_seconds,
+                    status_flags=status_flags_of(row.status_codes),
+                ),
+            ))
+            continue
+
+        # 근로모듈 (지점 캐시에 없으면 SQL 결과를 래핑해 코어가 기대하는 속성만 제공)
         mod = None
         if r.get("start_time") and r.get("end_time") and r.get("cat"):
-            mod = SimpleNamespace(
+            mod = modules.get(r.get("module_id")) or SimpleNamespace(
                 cat=r["cat"],
                 name=r.get("name"),
                 start_time=r["start_time"],
@@ -230,94 +258,158 @@ def build_daily_attendance_for_users(base_rows: list[dict], day: date, *, branch
                 rest2_end_time=r.get("rest2_end_time"),
             )
 
-        checkin_dt = first_in.get(uid)
-        checkin_time = checkin_dt.strftime("%H:%M:%S") if checkin_dt else None
-
-        sched_end_hhmm = r["end_time"] if r.get("end_time") and r["end_time"] != "-" else None
-        sched_end_dt = to_dt(day, sched_end_hhmm) if sched_end_hhmm else None
+        compiled = compile_module(mod)
 
+        checkin_dt = first_in.get(uid)
         checkout_dt = last_out.get(uid)
+        checkin_sec = time_to_seconds(checkin_dt) if checkin_dt else None
 
-        checkout_time = determine_checkout_time(
+        checkout_sec = determine_checkout_seconds(
             checkout_dt=checkout_dt,
             record_day=day,
             checkin_dt=checkin_dt,
-            sched_end_dt=sched_end_dt,
+            sched_end_sec=compiled.end if compiled else None,
             today=today,
         )
 
-        metrics = compute_seconds_status_for_day(
-            record_day=day,
-            module=mod,
-            log=LogsDay(checkin=checkin_time, checkout=checkout_time),
+        metrics = compute_seconds_status_for_day_int(
+            day, compiled, checkin_sec, checkout_sec, now=now, memo=ATTENDANCE_MEMO,
         )
-
-        work_list.append({
-            "user_id": uid,
-            "dept": r["dept"],
-            "position": r["position"],
-            "emp_name": r["emp_name"],
-            "cat": r.get("cat"),
-            "module_id": r.get("module_id"),
-            "start_time": r.get("start_time"),
-            "end_time": r.get("end_time"),
-            "checkin_time": checkin_time,
-            "checkout_time": checkout_time,
-            "late_seconds": metrics.late_seconds,
-            "early_seconds": metrics.early_seconds,
-            "overtime_seconds": metrics.overtime_seconds,
-            "holiday_seconds": metrics.holiday_seconds,
-            "status": metrics.status,
-            "status_codes": metrics.status_codes,
-            "status_labels": metrics.status_labels,
-        })
+        work_list.append(_daily_row(
+            r,
+            checkin_sec=checkin_sec,
+            checkout_sec=checkout_sec,
+            checkout_inferred=checkout_dt is None and checkout_sec is not None,
+            metrics=metrics,
+        ))
 
     return work_list
 
 
-def prepare_month(users: list[int], year: int, month: int, *, branch):
+def _daily_row(r: dict, *, checkin_sec, checkout_sec, checkout_inferred: bool, metrics: DayMetrics) -> dict:
+    """build_daily_attendance_for_users 1행 (index.html 컬럼명 기준)"""
+    return {
+        "user_id": r["user_id"],
+        "dept": r["dept"],
+        "position": r["position"],
+        "emp_name": r["emp_name"],
+        "cat": r.get("cat"),
+        "module_id": r.get("module_id"),
+        "start_time": r.get("start_time"),
+        "end_time": r.get("end_time"),
+        "checkin_time": seconds_to_hhmmss(checkin_sec),
+        "checkout_time": seconds_to_hhmmss(checkout_sec),
+        "is_checkout_inferred": checkout_inferred,
+        "late_seconds": metrics.late_seconds,
+        "early_seconds": metrics.early_seconds,
+        "overtime_seconds": metrics.overtime_seconds,
+        "holiday_seconds": metrics.holiday_seconds,
+        "status": metrics.status,
+        "status_codes": metrics.status_codes,
+        "status_labels": metrics.status_labels,
+    }
+
+
+def month_range(year: int, month: int) -> tuple[date, date]:
+    """[해당 월 1일, 다음 달 1일) 반열림 구간. 날짜 컬럼은 YEAR()/MONTH() 대신 이 범위로 조회한다."""
+    first = date(year, month, 1)
+    return first, (date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1))
+
+
+def punch_rows(users: list[int], start: date, end: date, *, branch):
     """
-    (단일 함수) 월 화면 공통 준비:
-      - days: 월의 모든 일자 리스트
-      - sched_map: {user_id: {date: module_id|None}}
-      - modules: {module_id: Module}
-      - logs_map: {user_id: {date: {"I":[dt...], "O":[dt...]}}}
-    ORM 왕복: Schedule(1) + Module in_bulk(1) + Work(1)
+    [start, end) 기간 출퇴근 기록 (values 쿼리셋).
+    - record_day 범위 조건이라 (branch, user, record_day, work_code, record_date) 커버링 인덱스만으로 응답한다.
+    - 정렬도 인덱스 순서(사용자 → 일자 → 코드 → 시각)와 같아 별도 정렬이 없다.
     """
-    # 1) 월 일자
-    last = monthrange(year, month)[1]
-    days = [date(year, month, d) for d in range(1, last + 1)]
+    return (
+        Work.objects
+        .filter(branch=branch, user_id__in=users, record_day__gte=start, record_day__lt=end)
+        .values("user_id", "record_day", "work_code", "record_date")
+        .order_by("user_id", "record_day", "work_code", "record_date")
+    )
+
+
+def branch_modules(branch) -> dict[int, Module]:
+    """지점 근로모듈 전체 {module_id: Module}. 같은 요청 안에서는 한 번만 조회한다. (읽기 전용)"""
+    return load("modules", getattr(branch, "id", branch), lambda: Module.objects.filter(branch=branch).in_bulk())
+
 
-    # 2) 근무표 bulk (d1_id ~ dN_id)
-    cols = [f"d{d}_id" for d in range(1, last + 1)]
+def window_days(start: date, end: date) -> list[date]:
+    """[start, end) 일자 리스트"""
+    return [start + timedelta(days=n) for n in range((end - start).days)]
+
+
+def schedule_window(users: list[int], start: date, end: date, *, branch):
+    """
+    [start, end) 기간의 근무표를 일자 기준으로 펼친다. 기간이 걸친 월의 Schedule을 한 번에 조회.
+      - days: 기간의 모든 일자 리스트
+      - sched_map: {user_id: {date: module_id|None}} (근무표가 없는 월의 일자는 키 없음)
+      - module_ids: 기간에 쓰인 근로모듈 id
+    ORM 왕복: Schedule(1)
+    """
+    days = window_days(start, end)
+    sched_map: dict[int, dict[date, int | None]] = {uid: {} for uid in users}
+    module_ids: set[int] = set()
+    if not days:
+        return days, sched_map, module_ids
+
+    # 월별로 해당 기간 일자만 (일자 → dN 컬럼)
+    by_month: dict[tuple[str, str], list[date]] = {}
+    for rd in days:
+        by_month.setdefault((f"{rd.year:04d}", f"{rd.month:02d}"), []).append(rd)
+
+    months_q = Q()
+    for year, month in by_month:
+        months_q |= Q(year=year, month=month)
+    max_day = max(rd.day for rd in days)
     sched_rows = (
         Schedule.objects
-        .filter(user_id__in=users, year=f"{year:04d}", month=f"{month:02d}", branch=branch)
-        .values("user_id", *cols)
+        .filter(months_q, user_id__in=users, branch=branch)
+        .values("user_id", "year", "month", *[f"d{d}_id" for d in range(1, max_day + 1)])
     )
-    sched_map: dict[int, dict[date, int | None]] = {uid: {} for uid in users}
-    module_ids: set[int] = set()
     for r in sched_rows:
-        uid = int(r["user_id"])
-        for i, rd in enumerate(days, start=1):
-            mid = r.get(f"d{i}_id")
-            sched_map[uid][rd] = mid
+        user_sched = sched_map.setdefault(int(r["user_id"]), {})
+        for rd in by_month[(r["year"], r["month"])]:
+            mid = r[f"d{rd.day}_id"]
+            user_sched[rd] = mid
             if mid:
                 module_ids.add(mid)
+    return days, sched_map, module_ids
 
-    # 3) 근로모듈 캐시
-    modules: dict[int, Module] = (
-        Module.objects.filter(branch=branch).in_bulk(module_ids) if module_ids else {}
-    )
 
-    # 4) 근태기록 bulk
-    works = (
-        Work.objects
-        .filter(user_id__in=users, branch=branch, record_day__year=year, record_day__month=month)
-        .values("user_id", "record_day", "work_code", "record_date")
-        .order_by("user_id", "record_day", "record_date")
+def prepare_window(users: list[int], start: date, end: date, *, branch):
+    """
+    임의 기간 [start, end) 공통 준비 (주 단위 점검, 월을 걸친 급여기간, 분기 등).
+      - days: 기간의 모든 일자 리스트
+      - sched_map: {user_id: {date: module_id|None}}
+      - modules: {module_id: Module}
+      - logs_map: {user_id: {date: {"I":[dt...], "O":[dt...]}}}
+    ORM 왕복: 기간 길이와 무관하게 Schedule(1) + Module(1) + Work(1)
+    결과는 evaluate_month / flatten_month에 그대로 넘길 수 있다. (일자 목록만 다를 뿐 형태가 같음)
+    같은 요청 안에서 같은 (지점, 사용자들, 기간)은 한 번만 조회한다. (결과는 읽기 전용)
+    """
+    return load(
+        "window",
+        (getattr(branch, "id", branch), tuple(users), start, end),
+        lambda: _prepare_window(users, start, end, branch),
     )
 
+
+def _prepare_window(users: list[int], start: date, end: date, branch):
+    # 1) 근무표 bulk
+    days, sched_map, module_ids = schedule_window(users, start, end, branch=branch)
+
+    # 2) 근로모듈 캐시
+    if module_ids:
+        all_modules = branch_modules(branch)
+        modules: dict[int, Module] = {mid: all_modules[mid] for mid in module_ids if mid in all_modules}
+    else:
+        modules = {}
+
+    # 3) 근태기록 bulk
+    works = punch_rows(users, start, end, branch=branch)
+
     logs_map: dict[int, dict[date, dict[str, list]]] = {}
     for w in works:
         uid = int(w["user_id"])
@@ -334,160 +426,460 @@ def prepare_month(users: list[int], year: int, month: int, *, branch):
     return days, sched_map, modules, logs_map
 
 
+def prepare_month(users: list[int], year: int, month: int, *, branch):
+    """
+    (단일 함수) 월 화면 공통 준비. prepare_window의 한 달 버전.
+    ORM 왕복: Schedule(1) + Module(1) + Work(1)
+    """
+    return prepare_window(users, *month_range(year, month), branch=branch)
+
+
+@dataclass
+class MonthCells:
+    """
+    월 셀 배열(사용자 × 일자, 사용자 우선 순서). 배치 엔진 입력 + 저장용 원본 시각.
+    - 셀 인덱스: users.index(uid) * len(days) + days.index(rd)
+    - 시각은 자정 기준 초, -1 = 없음
+    """
+    users: list[int]
+    days: list[date]
+    modules: dict[int, Module]  # {module_id: Module}
+    palette: list               # 컴파일된 모듈 목록
+    module_idx: "array[int]"    # 셀별 palette 인덱스(-1 = 근무표 없음)
+    checkin: "array[int]"       # 최초 출근
+    last_out: "array[int]"      # 최종 퇴근(실제 로그)
+    checkout: "array[int]"      # 퇴근(종업시각 보정 반영)
+    day_class: "array[int]"
+
+
+def flatten_month(users: list[int], days: list[date], sched_map, modules, logs_map, *, today: date) -> MonthCells:
+    """prepare_month 결과를 셀 배열로 펼친다. (계산 없음)"""
+    day_classes = [classify_day(rd, today) for rd in days]
+
+    palette: list = []
+    palette_idx: dict[int, int] = {}
+
+    n = len(users) * len(days)
+    module_idx = array("l", [-1]) * n
+    checkin = array("l", [-1]) * n
+    last_out = array("l", [-1]) * n
+    checkout = array("l", [-1]) * n
+    day_class = array("l", day_classes * len(users))
+
+    i = 0
+    for uid in users:
+        user_sched = sched_map.get(uid, {})
+        user_logs = logs_map.get(uid, {})
+        for rd in days:
+            compiled = None
+            mid = user_sched.get(rd)
+            if mid:
+                mi = palette_idx.get(mid)
+                if mi is None:
+                    compiled = compile_module(modules.get(mid))
+                    if compiled is not None:
+                        mi = palette_idx[mid] = len(palette)
+                        palette.append(compiled)
+                else:
+                    compiled = palette[mi]
+                if mi is not None:
+                    module_idx[i] = mi
+
+            day_log = user_logs.get(rd)
+            if day_log:
+                ins = day_log.get("I")
+                outs = day_log.get("O")
+                checkin_dt = min(ins) if ins else None
+                checkout_dt = max(outs) if outs else None
+                if checkin_dt:
+                    checkin[i] = time_to_seconds(checkin_dt)
+                if checkout_dt:
+                    last_out[i] = time_to_seconds(checkout_dt)
+                checkout_sec = determine_checkout_seconds(
+                    checkout_dt=checkout_dt,
+                    record_day=rd,
+                    checkin_dt=checkin_dt,
+                    sched_end_sec=compiled.end if compiled else None,
+                    today=today,
+                )
+                if checkout_sec is not None:
+                    checkout[i] = checkout_sec
+            i += 1
+
+    return MonthCells(
+        users=list(users),
+        days=list(days),
+        modules=modules,
+        palette=palette,
+        module_idx=module_idx,
+        checkin=checkin,
+        last_out=last_out,
+        checkout=checkout,
+        day_class=day_class,
+    )
+
+
+def evaluate_month(users: list[int], days: list[date], sched_map, modules, logs_map, *, now: datetime):
+    """
+    prepare_month 결과를 셀 배열로 펼쳐(flatten_month) 배치 엔진으로 한 번에 평가.
+    - now: 기준시각 (과거/오늘/미래 판정, 퇴근 보정 기준)
+    - 메모(ATTENDANCE_MEMO)는 쓰지 않는다. 출퇴근 초가 셀마다 달라 거의 맞지 않고 배치 루프보다 느리다.
+      (benchmarks.bench_batch_memo)
+    반환: (MonthCells, BatchMetrics)
+    """
+    cells = flatten_month(users, days, sched_map, modules, logs_map, today=now.date())
+    metrics = evaluate_batch(
+        cells.palette, cells.module_idx, cells.checkin, cells.checkout, cells.day_class,
+        time_to_seconds(now),
+    )
+    return cells, metrics
+
+
+def fold_punches(rows) -> Iterator[tuple[int, dict[date, dict[str, list]]]]:
+    """
+    (사용자 → 일자 → 코드 → 시각) 순서의 출퇴근 행을 사용자 단위로 접는다.
+    - 일자별로 최초 출근/최종 퇴근만 남긴다: {date: {"I": [최초], "O": [최종]}} (prepare_window logs_map과 같은 형태)
+    - 한 사용자의 행이 끝나면 바로 내보내므로, 들고 있는 것은 사용자 1명분뿐이다.
+    """
+    uid = None
+    logs: dict[date, dict[str, list]] = {}
+    for w in rows:
+        row_uid = int(w["user_id"])
+        if row_uid != uid:
+            if uid is not None:
+                yield uid, logs
+            uid, logs = row_uid, {}
+
+        code = (w["work_code"] or "").upper()
+        if code not in ("I", "O"):
+            continue  # 방어: I/O 외의 값이 있으면 무시
+        day_map = logs.setdefault(w["record_day"], {"I": [], "O": []})
+        if code == "I":
+            if not day_map["I"]:
+                day_map["I"].append(w["record_date"])  # 시각 순이므로 첫 행이 최초 출근
+        else:
+            day_map["O"][:] = [w["record_date"]]       # 마지막 행이 최종 퇴근
+    if uid is not None:
+        yield uid, logs
+
+
+def stream_window(
+    users: list[int], start: date, end: date, *, branch, now: Optional[datetime] = None,
+    user_chunk: int = 200, chunk_size: int = 2000,
+) -> Iterator[tuple[int, MonthCells, BatchMetrics]]:
+    """
+    [start, end) 기간을 사용자 단위로 평가하며 내보내는 스트리밍 버전. (user_id 오름차순)
+    - 출퇴근은 iterator(chunk_size)로 흘려 읽으며 fold_punches로 사용자별 최초 출근/최종 퇴근만 접는다.
+    - 근무표/출퇴근 조회는 user_chunk명씩 끊어서 한다. MySQL 드라이버는 결과셋을 클라이언트에 받아두므로
+      메모리 상한은 user_chunk명분(user_chunk=1이면 1명의 기간분)이다.
+    - yield: (user_id, 1명분 MonthCells, BatchMetrics) — evaluate_month를 사용자 1명으로 부른 것과 같다
+    ORM 왕복: Module(1) + 사용자 묶음마다 Schedule(1) + Work(1)
+    """
+    now = now or timezone.now()
+    today = now.date()
+    now_seconds = time_to_seconds(now)
+    modules = branch_modules(branch)
+
+    users = sorted(set(int(uid) for uid in users))
+    for pos in range(0, len(users), max(1, user_chunk)):
+        chunk = users[pos:pos + max(1, user_chunk)]
+        days, sched_map, _ = schedule_window(chunk, start, end, branch=branch)
+        punches = fold_punches(punch_rows(chunk, start, end, branch=branch).iterator(chunk_size=chunk_size))
+        pending = next(punches, None)
+
+        for uid in chunk:
+            logs: dict = {}
+            if pending is not None and pending[0] == uid:
+                logs = pending[1]
+                pending = next(punches, None)
+            cells = flatten_month([uid], days, {uid: sched_map.get(uid, {})}, modules, {uid: logs}, today=today)
+            metrics = evaluate_batch(
+                cells.palette, cells.module_idx, cells.checkin, cells.checkout, cells.day_class,
+                now_seconds,
+            )
+            yield uid, cells, metrics
+            sched_map.pop(uid, None)
+
+
+_METRIC_KEYS = {
+    "late": "late_seconds",
+    "early": "early_seconds",
+    "overtime": "overtime_seconds",
+    "holiday": "holiday_seconds",
+}
+
+
+def empty_summary() -> dict:
+    return {
+        # ===== 합계 키(하위호환) =====
+        "late_count": 0, "late_seconds": 0,
+        "early_count": 0, "early_seconds": 0,
+        "overtime_count": 0, "overtime_seconds": 0,
+        "holiday_count": 0, "holiday_seconds": 0,
+        "error_count": 0,
+
+        # ===== 추가: 소정근로 =====
+        "reg_late_count": 0, "reg_late_seconds": 0,
+        "reg_early_count": 0, "reg_early_seconds": 0,
+        "reg_overtime_count": 0, "reg_overtime_seconds": 0,
+
+        # ===== 추가: 휴일 TOTAL(근로-지각-조퇴+연장) =====
+        "hol_total_seconds": 0,
+
+        # ===== 추가: 휴일근로 =====
+        "hol_work_count": 0, "hol_work_seconds": 0,   # holiday_seconds 누적
+        "hol_late_count": 0, "hol_late_seconds": 0,
+        "hol_early_count": 0, "hol_early_seconds": 0,
+        "hol_overtime_count": 0, "hol_overtime_seconds": 0,
+
+        # ===== 무급휴무(횟수만) =====
+        "nopay_count": 0,
+    }
+
+
+# 월간집계 키 (AttendanceMonth 필드명과 같음)
+SUMMARY_KEYS = tuple(empty_summary())
+
+
+@dataclass
+class MonthAttendanceCube:
+    """
+    전체 사용자 × 1개월 근태를 한 번에 계산해 둔 결과(큐브).
+    - 셀 순서: users 순서 × days 순서 (사용자 우선)
+    - 월간집계(전체), 지표별 상세, 엑셀 시트가 모두 이 큐브를 읽기만 한다.
+    """
+    year: int
+    month: int
+    users: list[int]
+    days: list[date]
+    palette: list
+    module_idx: "array[int]"
+    metrics: BatchMetrics
+    out_ymd_map: dict[int, str | None]
+    _user_pos: dict[int, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._user_pos = {uid: pos for pos, uid in enumerate(self.users)}
+
+    def _span(self, u_pos: int) -> range:
+        n_days = len(self.days)
+        return range(u_pos * n_days, (u_pos + 1) * n_days)
+
+    def cells(self, uid: int) -> list[dict]:
+        """사용자 1명의 일자별 셀(모듈/초 지표/상태코드) 목록."""
+        u_pos = self._user_pos[uid]
+        m = self.metrics
+        result = []
+        for rd, i in zip(self.days, self._span(u_pos)):
+            mi = self.module_idx[i]
+            result.append({
+                "record_day": rd,
+                "module": self.palette[mi] if mi >= 0 else None,
+                "late_seconds": m.late_seconds[i],
+                "early_seconds": m.early_seconds[i],
+                "overtime_seconds": m.overtime_seconds[i],
+                "holiday_seconds": m.holiday_seconds[i],
+                "status_codes": list(status_codes_of(m.status_flags[i])),
+            })
+        return result
+
+    def summary(self) -> dict[int, dict]:
+        """build_monthly_attendance_summary_for_users와 같은 형태의 사용자별 집계."""
+        stand_ym = f"{self.year:04d}{self.month:02d}"
+        last_day_num = len(self.days)
+        cats = [m.cat for m in self.palette]
+        module_idx = self.module_idx
+        late_arr, early_arr = self.metrics.late_seconds, self.metrics.early_seconds
+        over_arr, hol_arr = self.metrics.overtime_seconds, self.metrics.holiday_seconds
+        flags_arr = self.metrics.status_flags
+
+        summary: dict[int, dict] = {}
+        for u_pos, uid in enumerate(self.users):
+            agg = empty_summary()
+
+            # out_date가 해당 월에 있으면 그 날짜까지만 합산
+            end_day = last_day_num
+            out_ymd = self.out_ymd_map.get(uid)  # 'YYYYMMDD' or None
+            if out_ymd and out_ymd[:6] == stand_ym:
+                out_day = int(out_ymd[6:8])
+                end_day = min(end_day, out_day)
+
+            base_i = u_pos * last_day_num
+            for i in range(base_i, base_i + end_day):
+                late = late_arr[i]
+                early = early_arr[i]
+                over = over_arr[i]
+                hol = hol_arr[i]
+
+                # 1) 기존 합계(하위호환)
+                if late > 0:
+                    agg["late_count"] += 1
+                if early > 0:
+                    agg["early_count"] += 1
+                if over > 0:
+                    agg["overtime_count"] += 1
+                if hol > 0:
+                    agg["holiday_count"] += 1
+                if flags_arr[i] == ST_ERROR:
+                    agg["error_count"] += 1
+
+                agg["late_seconds"] += late
+                agg["early_seconds"] += early
+                agg["overtime_seconds"] += over
+                agg["holiday_seconds"] += hol
+
+                # 2) 분해 누적(소정근로/휴일근로 기준)
+                mi = module_idx[i]
+                cat = cats[mi] if mi >= 0 else None
+
+                if cat == "소정근로":
+                    if late > 0:
+                        agg["reg_late_count"] += 1
+                    if early > 0:
+                        agg["reg_early_count"] += 1
+                    if over > 0:
+                        agg["reg_overtime_count"] += 1
+
+                    agg["reg_late_seconds"] += late
+                    agg["reg_early_seconds"] += early
+                    agg["reg_overtime_seconds"] += over
+
+                elif cat == "휴일근로":
+                    # 휴일 TOTAL = (근로-지각-조퇴) + 연장근로
+                    base = hol - late - early
+                    if base < 0:
+                        base = 0
+                    agg["hol_total_seconds"] += (base + over)
+
+                    # 휴일 "근로"는 holiday_seconds(휴일근로 인정시간)
+                    if hol > 0:
+                        agg["hol_work_count"] += 1
+                    agg["hol_work_seconds"] += hol
+
+                    if late > 0:
+                        agg["hol_late_count"] += 1
+                    if early > 0:
+                        agg["hol_early_count"] += 1
+                    if over > 0:
+                        agg["hol_overtime_count"] += 1
+
+                    agg["hol_late_seconds"] += late
+                    agg["hol_early_seconds"] += early
+                    agg["hol_overtime_seconds"] += over
+
+                # ===== 무급휴무 3종 횟수 =====
+                elif cat == "무급휴무":
+                    agg["nopay_count"] += 1
+
+            summary[uid] = agg
+
+        return summary
+
+    def metric_details(self, metric: str) -> dict[int, dict]:
+        """build_monthly_metric_details_for_users와 같은 형태의 지표별 상세."""
+        key = _METRIC_KEYS.get(metric)
+        if not key:
+            raise ValueError("metric must be one of: late, early, overtime, holiday")
+
+        values = getattr(self.metrics, key)
+        result: dict[int, dict] = {}
+        for u_pos, uid in enumerate(self.users):
+            span = self._span(u_pos)
+            user_values = values[span.start:span.stop]
+            positives = [sec for sec in user_values if sec > 0]
+            result[uid] = {
+                "days": dict(zip(self.days, user_values)),
+                "count": len(positives),
+                "total_seconds": sum(positives),
+            }
+        return result
+
+
+def build_month_attendance_cube(
+    *, users: list[int], year: int, month: int, branch,
+    out_ymd_map: dict[int, str | None] | None = None,
+    from_store: bool = True,
+) -> MonthAttendanceCube:
+    """
+    전체 사용자 × 1개월 근태 큐브 생성.
+    - from_store=True(기본): 일별 근태(AttendanceDay) 범위 조회 1회 + 모듈 조회 1회
+      (저장값이 없거나 유효하지 않은 셀만 재계산)
+    - from_store=False: 원천(Work/Schedule)에서 직접 계산. prepare_month 1회(3쿼리) + 배치 엔진 1회
+    """
+    if users:
+        if from_store:
+            from wtm.services.attendance_store import read_attendance_month
+            cells, metrics = read_attendance_month(
+                branch=branch, year=year, month=month, user_ids=list(users), now=timezone.now(),
+            )
+        else:
+            days, sched_map, modules, logs_map = prepare_month(users, year, month, branch=branch)
+            cells, metrics = evaluate_month(
+                users, days, sched_map, modules, logs_map, now=timezone.now(),
+            )
+        days, palette, module_idx = cells.days, cells.palette, cells.module_idx
+    else:
+        days = [date(year, month, d) for d in range(1, monthrange(year, month)[1] + 1)]
+        palette, module_idx = [], array("l")
+        metrics = evaluate_batch([], module_idx, array("l"), array("l"), array("l"), 0)
+
+    return MonthAttendanceCube(
+        year=year,
+        month=month,
+        users=list(users),
+        days=days,
+        palette=palette,
+        module_idx=module_idx,
+        metrics=metrics,
+        out_ymd_map=out_ymd_map or {},
+    )
+
+
 # 웹 근태기록-월간집계(전체)에서 활용. 전체 사용자 * 1개월
 def build_monthly_attendance_summary_for_users(
     *, users: list[int], year: int, month: int, branch,
     out_ymd_map: dict[int, str | None] | None = None,
+    engine: str = "store",
 ) -> dict[int, dict]:
     """
     웹 근태기록-월간집계(전체)에서 활용. 전체 사용자 * 1개월
     - 기존 집계 키 유지(하위호환)
     - 추가로 소정/휴일 분해 + TOTAL(연장 누계) 제공
+    - engine="store"(기본): 지난 달은 월 집계(AttendanceMonth)를 읽는다
+    - engine="sql": 원천(근무표/근태기록)에서 DB가 바로 집계 (MySQL/SQLite, 쿼리 1회)
     """
+    if engine not in ("store", "sql"):
+        raise ValueError("engine must be one of: store, sql")
     if not users:
         return {}
 
-    out_ymd_map = out_ymd_map or {}
-    stand_ym = f"{year:04d}{month:02d}"
-    last_day_num = monthrange(year, month)[1]
-
-    today = timezone.now().date()
-    days, sched_map, modules, logs_map = prepare_month(users, year, month, branch=branch)
-
-    summary: dict[int, dict] = {}
-    for uid in users:
-        agg = {
-            # ===== 합계 키(하위호환) =====
-            "late_count": 0, "late_seconds": 0,
-            "early_count": 0, "early_seconds": 0,
-            "overtime_count": 0, "overtime_seconds": 0,
-            "holiday_count": 0, "holiday_seconds": 0,
-            "error_count": 0,
-
-            # ===== 추가: 소정근로 =====
-            "reg_late_count": 0, "reg_late_seconds": 0,
-            "reg_early_count": 0, "reg_early_seconds": 0,
-            "reg_overtime_count": 0, "reg_overtime_seconds": 0,
-
-            # ===== 추가: 휴일 TOTAL(근로-지각-조퇴+연장) =====
-            "hol_total_seconds": 0,
-
-            # ===== 추가: 휴일근로 =====
-            "hol_work_count": 0, "hol_work_seconds": 0,   # holiday_seconds 누적
-            "hol_late_count": 0, "hol_late_seconds": 0,
-            "hol_early_count": 0, "hol_early_seconds": 0,
-            "hol_overtime_count": 0, "hol_overtime_seconds": 0,
-
-            # ===== 무급휴무(횟수만) =====
-            "nopay_count": 0,
-        }
-
-        # out_date가 해당 월에 있으면 그 날짜까지만 합산
-        end_day = last_day_num
-        out_ymd = out_ymd_map.get(uid)  # 'YYYYMMDD' or None
-        if out_ymd and out_ymd[:6] == stand_ym:
-            out_day = int(out_ymd[6:8])
-            end_day = min(end_day, out_day)
-
-        for rd in days[:end_day]:
-            mid = sched_map.get(uid, {}).get(rd)
-            module = modules.get(mid) if mid else None
-
-            ins = logs_map.get(uid, {}).get(rd, {}).get("I", [])
-            outs = logs_map.get(uid, {}).get(rd, {}).get("O", [])
-
-            # --- 출근 dt / 시간 ---
-            checkin_dt = min(ins) if ins else None
-            checkin_time = checkin_dt.strftime("%H:%M:%S") if checkin_dt else None
-
-            # --- 근무표 종업 dt ---
-            sched_end_hhmm = None
-            if module and getattr(module, "end_time", None) and module.end_time != "-":
-                sched_end_hhmm = module.end_time
-            sched_end_dt = to_dt(rd, sched_end_hhmm) if sched_end_hhmm else None
-
-            # --- 실제 근태기록상 퇴근 dt ---
-            checkout_dt = max(outs) if outs else None
-
-            # --- 공통 퇴근 보정 정책 적용 ---
-            checkout_time = determine_checkout_time(
-                checkout_dt=checkout_dt,
-                record_day=rd,
-                checkin_dt=checkin_dt,
-                sched_end_dt=sched_end_dt,
-                today=today,
-            )
+    if engine == "sql":
+        from wtm.services.attendance_sql import summary_sql
+        return summary_sql(users=list(users), year=year, month=month, branch=branch, out_ymd_map=out_ymd_map)
 
-            # --- 코어 계산 ---
-            metrics = compute_seconds_status_for_day(
-                record_day=rd,
-                module=module,
-                log=LogsDay(checkin=checkin_time, checkout=checkout_time),
-            )
-
-            # 1) 기존 합계(하위호환)
-            if metrics.late_seconds > 0:
-                agg["late_count"] += 1
-            if metrics.early_seconds > 0:
-                agg["early_count"] += 1
-            if metrics.overtime_seconds > 0:
-                agg["overtime_count"] += 1
-            if metrics.holiday_seconds > 0:
-                agg["holiday_count"] += 1
-            if metrics.status_codes == ["ERROR"]:
-                agg["error_count"] += 1
-
-            agg["late_seconds"] += metrics.late_seconds
-            agg["early_seconds"] += metrics.early_seconds
-            agg["overtime_seconds"] += metrics.overtime_seconds
-            agg["holiday_seconds"] += metrics.holiday_seconds
-
-            # 2) 분해 누적(소정근로/휴일근로 기준)
-            cat = module.cat if module else None
-
-            if cat == "소정근로":
-                if metrics.late_seconds > 0:
-                    agg["reg_late_count"] += 1
-                if metrics.early_seconds > 0:
-                    agg["reg_early_count"] += 1
-                if metrics.overtime_seconds > 0:
-                    agg["reg_overtime_count"] += 1
-
-                agg["reg_late_seconds"] += metrics.late_seconds
-                agg["reg_early_seconds"] += metrics.early_seconds
-                agg["reg_overtime_seconds"] += metrics.overtime_seconds
-
-            elif cat == "휴일근로":
-                # 휴일 TOTAL = (근로-지각-조퇴) + 연장근로
-                base = metrics.holiday_seconds - metrics.late_seconds - metrics.early_seconds
-                if base < 0:
-                    base = 0
-                agg["hol_total_seconds"] += (base + metrics.overtime_seconds)
-
-                # 휴일 "근로"는 holiday_seconds(휴일근로 인정시간)
-                if metrics.holiday_seconds > 0:
-                    agg["hol_work_count"] += 1
-                agg["hol_work_seconds"] += metrics.holiday_seconds
-
-                if metrics.late_seconds > 0:
-                    agg["hol_late_count"] += 1
-                if metrics.early_seconds > 0:
-                    agg["hol_early_count"] += 1
-                if metrics.overtime_seconds > 0:
-                    agg["hol_overtime_count"] += 1
-
-                agg["hol_late_seconds"] += metrics.late_seconds
-                agg["hol_early_seconds"] += metrics.early_seconds
-                agg["hol_overtime_seconds"] += metrics.overtime_seconds
-
-                # ===== 무급휴무 3종 횟수 =====
-            elif cat == "무급휴무":
-                agg["nopay_count"] += 1
+    from wtm.services.attendance_store import read_attendance_summaries
+    return read_attendance_summaries(
+        branch=branch, user_ids=list(users), months=[(year, month)], out_ymd_map=out_ymd_map,
+    )
 
 
-        summary[uid] = agg
+# 여러 달(연초~이번 달 등) 합계 리포트용. 전체 사용자 * N개월
+def build_attendance_summary_for_period(
+    *, users: list[int], start_ym: str, end_ym: str, branch,
+    out_ymd_map: dict[int, str | None] | None = None,
+) -> dict[int, dict]:
+    """
+    start_ym ~ end_ym(YYYYMM, 포함) 월간집계 합계.
+    - 지난 달은 사용자당 월 1행(AttendanceMonth)만 더하고, 이번 달 이후만 일별 근태에서 집계
+    """
+    if not users:
+        return {}
 
-    return summary
+    from wtm.services.attendance_store import iter_months, read_attendance_summaries
+    months = iter_months((int(start_ym[:4]), int(start_ym[4:6])), (int(end_ym[:4]), int(end_ym[4:6])))
+    return read_attendance_summaries(
+        branch=branch, user_ids=list(users), months=months, out_ymd_map=out_ymd_map,
+    )
 
 
 # 웹 근태기록-월간집계(지표별)에서 활용. 전체 사용자 * 1개월
@@ -508,69 +900,10 @@ def build_monthly_metric_details_for_users(
       ...
     }
     """
-    key = {
-        "late": "late_seconds",
-        "early": "early_seconds",
-        "overtime": "overtime_seconds",
-        "holiday": "holiday_seconds",
-    }.get(metric)
-    if not key:
+    if metric not in _METRIC_KEYS:
         raise ValueError("metric must be one of: late, early, overtime, holiday")
     if not users:
         return {}
 
-    today = timezone.now().date()
-
-    days, sched_map, modules, logs_map = prepare_month(users, year, month, branch=branch)
-
-    result: dict[int, dict] = {}
-    for uid in users:
-        day_map: dict[date, int] = {d: 0 for d in days}
-        cnt = 0
-        total = 0
-
-        for rd in days:
-            mid = sched_map.get(uid, {}).get(rd)
-            module = modules.get(mid) if mid else None
-
-            user_map = logs_map.get(uid, {})
-            day_log = user_map.get(rd, {"I": [], "O": []})
-            ins = day_log.get("I", [])
-            outs = day_log.get("O", [])
-
-            # --- 출근 dt / 시간 ---
-            checkin_dt = min(ins) if ins else None
-            checkin_time = checkin_dt.strftime("%H:%M:%S") if checkin_dt else None
-
-            # --- 근무표 종업 dt ---
-            sched_end_hhmm = None
-            if module and getattr(module, "end_time", None) and module.end_time != "-":
-                sched_end_hhmm = module.end_time
-            sched_end_dt = to_dt(rd, sched_end_hhmm) if sched_end_hhmm else None
-
-            # --- 실제 근태기록 퇴근 dt ---
-            checkout_dt = max(outs) if outs else None
-
-            # --- 공통 퇴근 보정 정책 적용 ---
-            checkout_time = determine_checkout_time(
-                checkout_dt=checkout_dt,
-                record_day=rd,
-                checkin_dt=checkin_dt,
-                sched_end_dt=sched_end_dt,
-                today=today,
-            )
-
-            # --- 코어 계산 ---
-            metrics = compute_seconds_status_for_day(
-                record_day=rd,
-                module=module,
-                log=LogsDay(checkin=checkin_time, checkout=checkout_time),
-            )
-            seconds = getattr(metrics, key)
-            day_map[rd] = seconds
-            if seconds > 0:
-                cnt += 1
-                total += seconds
-
-        result[uid] = {"days": day_map, "count": cnt, "total_seconds": total}
-    return result
+    cube = build_month_attendance_cube(users=users, year=year, month=month, branch=branch)
+    return cube.metric_details(metric)
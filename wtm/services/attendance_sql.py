@@ -0,0 +1,234 @@
+"""
+월간집계(전체)를 DB에서 바로 계산하는 SQL 엔진 (MySQL / SQLite).
+- 근무표 d1~d31을 일자 행으로 펼치고(days CTE), 일자별 최초 출근/최종 퇴근(punch CTE)과 근로모듈 구간(mods CTE)을 붙인다.
+- 퇴근 보정 → 지각/조퇴/연장/휴일근로 초 → 오류 판정 → 사용자별 합계까지 쿼리 1회로 끝낸다.
+- 근로모듈 구간은 compile_module 결과(자정 기준 초, 유급 세그먼트 최대 3개)를 파라미터로 넘긴다.
+  파이썬 엔진과 같은 세그먼트를 쓰므로 결과 키/값이 build_monthly_attendance_summary_for_users와 같다.
+"""
+from datetime import datetime
+from typing import Optional
+
+from django.db import connection
+from django.utils import timezone
+
+from wtm.attendance_calc import compile_module, time_to_seconds
+from wtm.services.attendance import SUMMARY_KEYS, branch_modules, empty_summary, month_range
+
+# 근로모듈 구분 → 정수 (SQL 안에서 비교)
+KIND_OTHER, KIND_REGULAR, KIND_HOLIDAY, KIND_LEAVE, KIND_NOPAY = 0, 1, 2, 3, 4
+_KIND_OF = {"소정근로": KIND_REGULAR, "휴일근로": KIND_HOLIDAY, "OFF": KIND_LEAVE, "유급휴무": KIND_LEAVE, "무급휴무": KIND_NOPAY}
+
+# 유급 세그먼트 = 시업~종업 - 휴게(최대 2개) → 최대 3개
+_SEGMENTS = 3
+
+# DB별 표현식 (자정 기준 초, 마이크로초, 일(day), 다인자 최대/최소)
+_DIALECTS = {
+    "mysql": {
+        "secs": "FLOOR(TIME_TO_SEC({0}))",
+        "micro": "MICROSECOND({0})",
+        "day": "DAY({0})",
+        "greatest": "GREATEST",
+        "least": "LEAST",
+    },
+    "sqlite": {
+        # 'YYYY-MM-DD HH:MM:SS[.ffffff]' 문자열로 저장됨
+        "secs": (
+            "(CAST(SUBSTR({0}, 12, 2) AS INTEGER) * 3600"
+            " + CAST(SUBSTR({0}, 15, 2) AS INTEGER) * 60"
+            " + CAST(SUBSTR({0}, 18, 2) AS INTEGER))"
+        ),
+        "micro": "CAST(SUBSTR({0}, 21, 6) AS INTEGER)",
+        "day": "CAST(SUBSTR({0}, 9, 2) AS INTEGER)",
+        "greatest": "MAX",
+        "least": "MIN",
+    },
+}
+
+
+def _module_rows(branch) -> list[tuple]:
+    """mods CTE 행: (id, kind, 시업, 종업, a1, b1, a2, b2, a3, b3, 유급합계, 마지막 유급 종료)"""
+    rows = []
+    for mid, module in branch_modules(branch).items():
+        compiled = compile_module(module)
+        segs = list(compiled.paid) + [(0, 0)] * (_SEGMENTS - len(compiled.paid))
+        rows.append((
+            mid, _KIND_OF.get(compiled.cat, KIND_OTHER), compiled.start, compiled.end,
+            *(v for seg in segs for v in seg), compiled.paid_total_seconds, compiled.last_paid_end,
+        ))
+    return rows
+
+
+def _summary_sql(d: dict, n_modules: int, n_users: int, cutoffs: dict[int, int]) -> str:
+    G, L = d["greatest"], d["least"]
+    segs = range(1, _SEGMENTS + 1)
+
+    def before(t):  # paid_seconds_before
+        return " + ".join(f"({L}({G}({t}, a{k}), b{k}) - a{k})" for k in segs)
+
+    def after(t):  # paid_seconds_after
+        return " + ".join(f"(b{k} - {L}({G}({t}, a{k}), b{k}))" for k in segs)
+
+    def inter(x, y):  # paid_intersection_seconds
+        return " + ".join(f"{G}(0, {L}({y}, b{k}) - {G}({x}, a{k}))" for k in segs)
+
+    users_in = ", ".join(["%s"] * n_users)
+    mod_cols = "module_id, kind, s, e, " + ", ".join(f"a{k}, b{k}" for k in segs) + ", paid_total, last_end"
+    mod_select = "SELECT " + ", ".join(["%s"] * (4 + 2 * _SEGMENTS + 2))
+    day_case = "CASE days.d " + " ".join(f"WHEN {n} THEN s.d{n}_id" for n in range(1, 32)) + " END"
+    # 퇴사월 사용자만 퇴사일까지 (나머지는 월 전체)
+    cutoff = ""
+    if cutoffs:
+        cutoff = "AND days.d <= CASE s.user_id " + " ".join("WHEN %s THEN %s" for _ in cutoffs) + " ELSE 31 END"
+
+    def count(cond):
+        return f"SUM(CASE WHEN {cond} THEN 1 ELSE 0 END)"
+
+    def total(expr, cond=None):
+        return f"SUM({expr})" if cond is None else f"SUM(CASE WHEN {cond} THEN {expr} ELSE 0 END)"
+
+    reg, hol = f"kind = {KIND_REGULAR}", f"kind = {KIND_HOLIDAY}"
+    aggregates = {
+        "late_count": count("late > 0"), "late_seconds": total("late"),
+        "early_count": count("early > 0"), "early_seconds": total("early"),
+        "overtime_count": count("overtime > 0"), "overtime_seconds": total("overtime"),
+        "holiday_count": count("hol > 0"), "holiday_seconds": total("hol"),
+        "error_count": total("err"),
+        "reg_late_count": count(f"{reg} AND late > 0"), "reg_late_seconds": total("late", reg),
+        "reg_early_count": count(f"{reg} AND early > 0"), "reg_early_seconds": total("early", reg),
+        "reg_overtime_count": count(f"{reg} AND overtime > 0"), "reg_overtime_seconds": total("overtime", reg),
+        "hol_total_seconds": total(f"{G}(hol - late - early, 0) + overtime", hol),
+        "hol_work_count": count(f"{hol} AND hol > 0"), "hol_work_seconds": total("hol", hol),
+        "hol_late_count": count(f"{hol} AND late > 0"), "hol_late_seconds": total("late", hol),
+        "hol_early_count": count(f"{hol} AND early > 0"), "hol_early_seconds": total("early", hol),
+        "hol_overtime_count": count(f"{hol} AND overtime > 0"), "hol_overtime_seconds": total("overtime", hol),
+        "nopay_count": count(f"kind = {KIND_NOPAY}"),
+    }
+
+    return f"""
+        WITH RECURSIVE
+        days (d) AS (
+            SELECT 1 UNION ALL SELECT d + 1 FROM days WHERE d < %s
+        ),
+        mods ({mod_cols}) AS (
+            {" UNION ALL ".join([mod_select] * n_modules)}
+        ),
+        punch AS (
+            SELECT user_id, {d["day"].format("record_day")} AS d,
+                   MIN(CASE WHEN work_code = 'I' THEN record_date END) AS first_in,
+                   MAX(CASE WHEN work_code = 'O' THEN record_date END) AS last_out
+            FROM wtm_work
+            WHERE branch_id = %s AND user_id IN ({users_in}) AND record_day >= %s AND record_day < %s
+            GROUP BY user_id, record_day
+        ),
+        cells AS (
+            SELECT s.user_id, days.d, {day_case} AS module_id
+            FROM wtm_schedule s CROSS JOIN days
+            WHERE s.branch_id = %s AND s.year = %s AND s.month = %s AND s.user_id IN ({users_in})
+              {cutoff}
+        ),
+        base AS (
+            SELECT c.user_id, m.kind, m.s, m.e, {", ".join(f"m.a{k}, m.b{k}" for k in segs)},
+                   m.paid_total, m.last_end,
+                   CASE WHEN c.d < %s THEN 0 WHEN c.d = %s THEN 1 ELSE 2 END AS dc,
+                   {d["secs"].format("p.first_in")} AS ci,
+                   {d["micro"].format("p.first_in")} AS ci_us,
+                   {d["secs"].format("p.last_out")} AS lo
+            FROM cells c
+            JOIN mods m ON m.module_id = c.module_id
+            LEFT JOIN punch p ON p.user_id = c.user_id AND p.d = c.d
+        ),
+        corrected AS (
+            SELECT base.*,
+                   CASE
+                       WHEN lo IS NOT NULL THEN lo
+                       WHEN dc = 0 AND e IS NOT NULL AND ci IS NOT NULL AND (ci < e OR (ci = e AND ci_us = 0)) THEN e
+                   END AS co
+            FROM base
+        ),
+        metrics AS (
+            SELECT user_id, kind,
+                   CASE WHEN ci IS NULL THEN 0 ELSE {before("ci")} END AS late,
+                   CASE WHEN co IS NULL THEN 0 ELSE {after("co")} END AS early,
+                   CASE WHEN ci IS NOT NULL AND co IS NOT NULL AND last_end IS NOT NULL AND co > last_end
+                             AND {inter("ci", "last_end")} > 0
+                        THEN co - last_end ELSE 0 END AS overtime,
+                   CASE WHEN kind = {KIND_HOLIDAY} AND ci IS NOT NULL AND co IS NOT NULL
+                        THEN paid_total ELSE 0 END AS hol,
+                   CASE
+                       WHEN co IS NOT NULL AND ci IS NULL THEN 1
+                       WHEN kind IN ({KIND_REGULAR}, {KIND_HOLIDAY}) THEN CASE
+                           WHEN dc = 2 THEN 0
+                           WHEN ci IS NOT NULL AND co IS NOT NULL AND paid_total > 0
+                                AND {inter("ci", "co")} = 0 THEN 1
+                           WHEN dc = 1 THEN CASE
+                               WHEN s IS NOT NULL AND %s >= s AND ci IS NULL AND co IS NULL THEN 1 ELSE 0 END
+                           WHEN ci IS NULL AND co IS NULL THEN 1
+                           ELSE 0 END
+                       WHEN kind IN ({KIND_LEAVE}, {KIND_NOPAY}) THEN CASE
+                           WHEN ci IS NOT NULL OR co IS NOT NULL THEN 1 ELSE 0 END
+                       ELSE 0
+                   END AS err
+            FROM corrected
+        )
+        SELECT user_id, {", ".join(f"{expr} AS {key}" for key, expr in aggregates.items())}
+        FROM metrics
+        GROUP BY user_id
+    """
+
+
+def summary_sql(
+    *, users: list[int], year: int, month: int, branch,
+    out_ymd_map: Optional[dict[int, Optional[str]]] = None, now: Optional[datetime] = None,
+) -> dict[int, dict]:
+    """
+    build_monthly_attendance_summary_for_users(engine="sql")의 본체.
+    - 원천(Schedule/Work/Module)에서 바로 집계한다. (AttendanceDay/AttendanceMonth 미사용)
+    - 쿼리: 근로모듈(요청 로더 공유) 1회 + 집계 1회
+    반환: {user_id: empty_summary()와 같은 키}
+    """
+    dialect = _DIALECTS.get(connection.vendor)
+    if dialect is None:
+        raise NotImplementedError(f"SQL 집계 엔진을 지원하지 않는 DB입니다: {connection.vendor}")
+
+    users = list(dict.fromkeys(int(uid) for uid in users))
+    result = {uid: empty_summary() for uid in users}
+    if not users:
+        return result
+    modules = _module_rows(branch)
+    if not modules:
+        return result  # 근로모듈이 없으면 모든 셀이 근무표 없음
+
+    now = now or timezone.now()
+    first, next_first = month_range(year, month)
+    last_day = (next_first - first).days
+    today = now.date()
+    if today < first:
+        today_d = 0  # 전부 미래일
+    elif today >= next_first:
+        today_d = 32  # 전부 과거일
+    else:
+        today_d = today.day
+
+    stand_ym = f"{year:04d}{month:02d}"
+    cutoffs = {
+        uid: int(out_ymd[6:8])
+        for uid, out_ymd in (out_ymd_map or {}).items()
+        if uid in result and out_ymd and out_ymd[:6] == stand_ym
+    }
+
+    branch_id = getattr(branch, "id", branch)
+    params: list = [last_day]
+    for row in modules:
+        params.extend(row)
+    params += [branch_id, *users, first, next_first]
+    params += [branch_id, f"{year:04d}", f"{month:02d}", *users]
+    for uid, day in cutoffs.items():
+        params += [uid, day]
+    params += [today_d, today_d, time_to_seconds(now)]
+
+    sql = _summary_sql(dialect, len(modules), len(users), cutoffs)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for uid, *values in cursor.fetchall():
+            result[uid] = {key: int(v or 0) for key, v in zip(SUMMARY_KEYS, values)}
+    return result
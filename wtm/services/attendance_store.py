@@ -0,0 +1,583 @@
+"""
+일별 근태(AttendanceDay) / 월별 근태 집계(AttendanceMonth) 저장/조회.
+- 원천(Work/Schedule/Module)이 바뀌면 해당 범위만 다시 계산해 저장 (wtm.models 시그널 → on_*_changed)
+- 월 화면/앱은 저장된 행을 범위 조회 1회로 읽고, 계산 시점 이후 결과가 달라질 수 있는 셀만 즉석 계산 (읽기 경로는 저장하지 않음)
+- 월 집계는 지난 달만 저장한다. 일별 근태가 다시 계산되면 해당 (사용자, 월) 집계도 함께 다시 만든다.
+"""
+from array import array
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from common.models import User
+from wtm.attendance_calc import (
+    DAY_TODAY, ST_NOSCHEDULE, BatchMetrics, classify_day, compile_module, status_codes_of, status_flags_of,
+)
+from wtm.models import AttendanceDay, AttendanceMonth, Module, Schedule, Work
+from wtm.services.attendance import (
+    SUMMARY_KEYS, MonthAttendanceCube, MonthCells, branch_modules, build_month_attendance_cube, empty_summary,
+    evaluate_month, month_range, prepare_window, stream_window,
+)
+
+
+def _none_if_neg(sec: int) -> Optional[int]:
+    return sec if sec >= 0 else None
+
+
+def _branch_id(branch):
+    return getattr(branch, "pk", branch)
+
+
+def iter_months(start: tuple[int, int], end: tuple[int, int]):
+    """(year, month) 시작~종료(포함) 순회"""
+    year, month = start
+    while (year, month) <= end:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def parse_ym(value: str) -> tuple[int, int]:
+    """'YYYYMM' → (year, month). 형식이 틀리면 ValueError (관리 명령 인자용)"""
+    if len(value) != 6 or not value.isdigit() or not 1 <= int(value[4:]) <= 12:
+        raise ValueError(f"YYYYMM 형식이 아닙니다: {value}")
+    return int(value[:4]), int(value[4:])
+
+
+def is_month_closed(year: int, month: int, today: date) -> bool:
+    """월의 모든 일자가 과거일인지 (= 월 집계를 저장해도 되는지)"""
+    return date(year, month, monthrange(year, month)[1]) < today
+
+
+def _cutoff_day(out_ymd: Optional[str], year: int, month: int) -> Optional[int]:
+    """퇴사일자('YYYYMMDD')가 해당 월이면 그 일자, 아니면 None (MonthAttendanceCube.summary와 같은 기준)"""
+    if out_ymd and out_ymd[:6] == f"{year:04d}{month:02d}":
+        return int(out_ymd[6:8])
+    return None
+
+
+def is_current(record_day: date, computed_on: date, today: date) -> bool:
+    """
+    저장된 행을 그대로 써도 되는지.
+    - 계산 당시 과거일이었으면 확정(이후 원천 변경은 시그널로 다시 계산됨)
+    - 계산 당시 미래일이었고 지금도 미래일이면 그대로 유효
+    - 당일 계산분은 현재 시각에 따라 상태가 바뀌므로 읽을 때마다 다시 계산 (저장은 시그널/야간 확정 배치)
+    """
+    then = classify_day(record_day, computed_on)
+    return then != DAY_TODAY and then == classify_day(record_day, today)
+
+
+def _checkout_source(last_out: int, checkout: int) -> str:
+    """퇴근 출처: 실제 퇴근기록 / 근무표 종업시각 보정 / 없음"""
+    if last_out >= 0:
+        return AttendanceDay.CheckoutSource.REAL
+    if checkout >= 0:
+        return AttendanceDay.CheckoutSource.INFERRED
+    return AttendanceDay.CheckoutSource.NONE
+
+
+def _attendance_rows(branch_id: int, cells: MonthCells, metrics: BatchMetrics, computed_on: date) -> list[AttendanceDay]:
+    """평가 결과(셀 배열)를 저장할 AttendanceDay 행으로 변환"""
+    rows: list[AttendanceDay] = []
+    i = 0
+    for uid in cells.users:
+        for rd in cells.days:
+            mi = cells.module_idx[i]
+            rows.append(AttendanceDay(
+                branch_id=branch_id,
+                user_id=uid,
+                record_day=rd,
+                module_id=cells.palette[mi].module_id if mi >= 0 else None,
+                checkin_seconds=_none_if_neg(cells.checkin[i]),
+                last_out_seconds=_none_if_neg(cells.last_out[i]),
+                checkout_seconds=_none_if_neg(cells.checkout[i]),
+                checkout_source=_checkout_source(cells.last_out[i], cells.checkout[i]),
+                late_seconds=metrics.late_seconds[i],
+                early_seconds=metrics.early_seconds[i],
+                overtime_seconds=metrics.overtime_seconds[i],
+                holiday_seconds=metrics.holiday_seconds[i],
+                status_codes=",".join(status_codes_of(metrics.status_flags[i])),
+                computed_on=computed_on,
+            ))
+            i += 1
+    return rows
+
+
+def _month_rows(
+    branch_id: int, year: int, month: int, cells: MonthCells, metrics: BatchMetrics,
+    out_ymd_map: dict[int, Optional[str]],
+) -> list[AttendanceMonth]:
+    """셀 배열의 사용자별 월 집계를 저장할 AttendanceMonth 행으로 변환"""
+    summary = MonthAttendanceCube(
+        year=year,
+        month=month,
+        users=cells.users,
+        days=cells.days,
+        palette=cells.palette,
+        module_idx=cells.module_idx,
+        metrics=metrics,
+        out_ymd_map=out_ymd_map,
+    ).summary()
+    ym = f"{year:04d}{month:02d}"
+    return [
+        AttendanceMonth(
+            branch_id=branch_id,
+            user_id=uid,
+            ym=ym,
+            cutoff_day=_cutoff_day(out_ymd_map.get(uid), year, month),
+            **summary[uid],
+        )
+        for uid in cells.users
+    ]
+
+
+def _out_ymd_map(user_ids: list[int]) -> dict[int, Optional[str]]:
+    """User.out_date 기준 {user_id: 'YYYYMMDD' | None}"""
+    return {
+        uid: out_date.strftime("%Y%m%d") if out_date else None
+        for uid, out_date in User.objects.filter(id__in=user_ids).values_list("id", "out_date")
+    }
+
+
+def _evaluate_rows(*, branch, user_ids: list[int], days: list[date], now: datetime) -> list[AttendanceDay]:
+    """
+    (사용자들, 일자들) 셀을 원천에서 계산해 AttendanceDay 행으로 만든다. (저장하지 않음)
+    - 원천은 일자들이 걸친 기간만 읽는다. ORM 왕복: Schedule(1) + Module(1) + Work(1)
+    """
+    start, end = min(days), max(days) + timedelta(days=1)
+    all_days, sched_map, modules, logs_map = prepare_window(user_ids, start, end, branch=branch)
+    wanted = set(days)
+    cells, metrics = evaluate_month(
+        user_ids, [rd for rd in all_days if rd in wanted], sched_map, modules, logs_map, now=now,
+    )
+    return _attendance_rows(_branch_id(branch), cells, metrics, now.date())
+
+
+def refresh_attendance(
+    *, branch, year: int, month: int, user_ids: Iterable[int],
+    days: Optional[Iterable[date]] = None, now: Optional[datetime] = None,
+    update_rollups: bool = True,
+) -> list[AttendanceDay]:
+    """
+    (지점, 사용자들, 월[, 일자들]) 범위의 AttendanceDay를 다시 계산해 저장.
+    - days를 주지 않으면 월 전체
+    - update_rollups: 지난 달이면 해당 사용자들의 월 집계(AttendanceMonth)도 다시 만든다
+    - 반환: 저장한 행 목록
+    """
+    user_ids = list(dict.fromkeys(int(uid) for uid in user_ids))
+    if not user_ids:
+        return []
+    now = now or timezone.now()
+
+    start, end = month_range(year, month)
+    if days is None:
+        target_days = [start + timedelta(days=n) for n in range((end - start).days)]
+    else:
+        target_days = sorted(rd for rd in set(days) if start <= rd < end)
+    if not target_days:
+        return []
+
+    branch_id = _branch_id(branch)
+    rows = _evaluate_rows(branch=branch, user_ids=user_ids, days=target_days, now=now)
+
+    with transaction.atomic():
+        AttendanceDay.objects.filter(
+            branch_id=branch_id, user_id__in=user_ids, record_day__in=target_days,
+        ).delete()
+        AttendanceDay.objects.bulk_create(rows)
+
+    if update_rollups:
+        rebuild_rollups(branch=branch, year=year, month=month, user_ids=user_ids, now=now)
+    return rows
+
+
+def refresh_attendance_stream(
+    *, branch, year: int, month: int, user_ids: Iterable[int], now: Optional[datetime] = None,
+    user_chunk: int = 200,
+) -> int:
+    """
+    refresh_attendance의 스트리밍 버전 (대형 지점 백필/월 마감용).
+    - stream_window로 사용자 1명씩 평가하면서 일별 근태와 (지난 달이면) 월 집계를 바로 만든다.
+      월 집계를 위해 저장값을 다시 읽지 않는다.
+    - 저장은 user_chunk명 단위로 한다. (메모리 상한 = user_chunk명분)
+    - 반환: 저장한 AttendanceDay 행 수
+    """
+    user_ids = sorted(set(int(uid) for uid in user_ids))
+    if not user_ids:
+        return 0
+    now = now or timezone.now()
+    branch_id = _branch_id(branch)
+    ym = f"{year:04d}{month:02d}"
+    closed = is_month_closed(year, month, now.date())
+    out_ymd_map = _out_ymd_map(user_ids) if closed else {}
+    start, end = month_range(year, month)
+
+    written = 0
+    pending: list[int] = []
+    day_rows: list[AttendanceDay] = []
+    month_rows: list[AttendanceMonth] = []
+
+    def flush():
+        with transaction.atomic():
+            AttendanceDay.objects.filter(
+                branch_id=branch_id, user_id__in=pending, record_day__gte=start, record_day__lt=end,
+            ).delete()
+            AttendanceDay.objects.bulk_create(day_rows)
+            if closed:
+                AttendanceMonth.objects.filter(branch_id=branch_id, user_id__in=pending, ym=ym).delete()
+                AttendanceMonth.objects.bulk_create(month_rows)
+        pending.clear()
+        day_rows.clear()
+        month_rows.clear()
+
+    for uid, cells, metrics in stream_window(user_ids, start, end, branch=branch, now=now, user_chunk=user_chunk):
+        day_rows.extend(_attendance_rows(branch_id, cells, metrics, now.date()))
+        if closed:
+            month_rows.extend(_month_rows(branch_id, year, month, cells, metrics, out_ymd_map))
+        pending.append(uid)
+        written += len(cells.days)
+        if len(pending) >= user_chunk:
+            flush()
+    if pending:
+        flush()
+    return written
+
+
+def month_user_ids(*, branch, year: int, month: int) -> list[int]:
+    """해당 월 근무표 또는 근태기록이 있는 사용자 id (백필/월 마감 대상)"""
+    branch_id = _branch_id(branch)
+    user_ids = set(
+        Schedule.objects
+        .filter(branch_id=branch_id, year=f"{year:04d}", month=f"{month:02d}", user__isnull=False)
+        .values_list("user_id", flat=True)
+    )
+    first, next_first = month_range(year, month)
+    user_ids.update(
+        Work.objects
+        .filter(branch_id=branch_id, record_day__gte=first, record_day__lt=next_first)
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+    return sorted(user_ids)
+
+
+def read_attendance_month(
+    *, branch, year: int, month: int, user_ids: list[int], now: Optional[datetime] = None,
+) -> tuple[MonthCells, BatchMetrics]:
+    """
+    저장된 AttendanceDay로 월 셀 배열을 구성.
+    - ORM 왕복: AttendanceDay 범위 조회(1) + Module(1)
+    - 없거나 유효하지 않은 셀(is_current=False, 보통 오늘)은 해당 사용자/일자만 메모리에서 계산해 쓴다.
+      저장하지 않는다. (읽기마다 쓰기/잠금이 생기지 않도록. 저장은 시그널과 야간 확정 배치가 맡는다)
+    반환: evaluate_month와 같은 (MonthCells, BatchMetrics)
+    """
+    now = now or timezone.now()
+    today = now.date()
+    last = monthrange(year, month)[1]
+    days = [date(year, month, d) for d in range(1, last + 1)]
+
+    start, end = month_range(year, month)
+    rows = AttendanceDay.objects.filter(
+        branch=branch, user_id__in=user_ids, record_day__gte=start, record_day__lt=end,
+    )
+    by_cell = {(r.user_id, r.record_day): r for r in rows}
+
+    stale_users: set[int] = set()
+    stale_days: set[date] = set()
+    for uid in user_ids:
+        for rd in days:
+            r = by_cell.get((uid, rd))
+            if r is None or not is_current(rd, r.computed_on, today):
+                stale_users.add(uid)
+                stale_days.add(rd)
+
+    if stale_users:
+        for r in _evaluate_rows(
+            branch=branch, user_ids=[uid for uid in user_ids if uid in stale_users], days=sorted(stale_days), now=now,
+        ):
+            cell = (r.user_id, r.record_day)
+            if cell not in by_cell or not is_current(r.record_day, by_cell[cell].computed_on, today):
+                by_cell[cell] = r
+
+    module_ids = {r.module_id for r in by_cell.values() if r.module_id}
+    if module_ids:
+        all_modules = branch_modules(branch)
+        modules: dict[int, Module] = {mid: all_modules[mid] for mid in module_ids if mid in all_modules}
+    else:
+        modules = {}
+
+    palette: list = []
+    palette_idx: dict[int, int] = {}
+
+    n = len(user_ids) * len(days)
+    module_idx = array("l", [-1]) * n
+    checkin = array("l", [-1]) * n
+    last_out = array("l", [-1]) * n
+    checkout = array("l", [-1]) * n
+    day_class = array("l", [classify_day(rd, today) for rd in days] * len(user_ids))
+    late = array("l", [0]) * n
+    early = array("l", [0]) * n
+    over = array("l", [0]) * n
+    hol = array("l", [0]) * n
+    flags = array("l", [ST_NOSCHEDULE]) * n
+
+    i = 0
+    for uid in user_ids:
+        for rd in days:
+            r = by_cell.get((uid, rd))
+            if r is None:
+                # 방어: 재계산 대상에서도 빠진 셀(사용자 없음 등)은 근무표 없음으로 둔다
+                i += 1
+                continue
+
+            mid = r.module_id
+            if mid:
+                mi = palette_idx.get(mid)
+                if mi is None:
+                    compiled = compile_module(modules.get(mid))
+                    if compiled is not None:
+                        mi = palette_idx[mid] = len(palette)
+                        palette.append(compiled)
+                if mi is not None:
+                    module_idx[i] = mi
+
+            if r.checkin_seconds is not None:
+                checkin[i] = r.checkin_seconds
+            if r.last_out_seconds is not None:
+                last_out[i] = r.last_out_seconds
+            if r.checkout_seconds is not None:
+                checkout[i] = r.checkout_seconds
+            late[i] = r.late_seconds
+            early[i] = r.early_seconds
+            over[i] = r.overtime_seconds
+            hol[i] = r.holiday_seconds
+            flags[i] = status_flags_of(r.status_codes)
+            i += 1
+
+    cells = MonthCells(
+        users=list(user_ids),
+        days=days,
+        modules=modules,
+        palette=palette,
+        module_idx=module_idx,
+        checkin=checkin,
+        last_out=last_out,
+        checkout=checkout,
+        day_class=day_class,
+    )
+    metrics = BatchMetrics(
+        late_seconds=late,
+        early_seconds=early,
+        overtime_seconds=over,
+        holiday_seconds=hol,
+        status_flags=flags,
+    )
+    return cells, metrics
+
+
+def rebuild_rollups(
+    *, branch, year: int, month: int, user_ids: Iterable[int], now: Optional[datetime] = None,
+    out_ymd_map: Optional[dict[int, Optional[str]]] = None,
+) -> list[AttendanceMonth]:
+    """
+    (지점, 사용자들, 월)의 월 집계를 일별 근태에서 다시 만들어 저장.
+    - 지난 달만 저장한다. (이번 달 이후는 현재 시각에 따라 값이 바뀌므로 저장하지 않음)
+    - out_ymd_map을 주지 않으면 User.out_date 기준으로 퇴사월을 자른다
+    - 반환: 저장한 행 목록
+    """
+    user_ids = list(dict.fromkeys(int(uid) for uid in user_ids))
+    now = now or timezone.now()
+    if not user_ids or not is_month_closed(year, month, now.date()):
+        return []
+
+    if out_ymd_map is None:
+        out_ymd_map = _out_ymd_map(user_ids)
+
+    cells, metrics = read_attendance_month(branch=branch, year=year, month=month, user_ids=user_ids, now=now)
+    branch_id = _branch_id(branch)
+    ym = f"{year:04d}{month:02d}"
+    rows = _month_rows(branch_id, year, month, cells, metrics, out_ymd_map)
+    with transaction.atomic():
+        AttendanceMonth.objects.filter(branch_id=branch_id, user_id__in=user_ids, ym=ym).delete()
+        AttendanceMonth.objects.bulk_create(rows)
+    return rows
+
+
+def _add_summary(acc: dict, src: dict) -> None:
+    for key in SUMMARY_KEYS:
+        acc[key] += src[key]
+
+
+def _rollup_summary(row: AttendanceMonth) -> dict:
+    return {key: getattr(row, key) for key in SUMMARY_KEYS}
+
+
+def read_attendance_summaries(
+    *, branch, user_ids: list[int], months: Iterable[tuple[int, int]],
+    out_ymd_map: Optional[dict[int, Optional[str]]] = None, now: Optional[datetime] = None,
+) -> dict[int, dict]:
+    """
+    사용자별 월간집계를 여러 달에 걸쳐 합산.
+    - 지난 달: AttendanceMonth 조회 1회 (사용자당 월 1행). 없거나 퇴사월 기준이 다르면 다시 만든다
+    - 이번 달 이후: 일별 근태에서 바로 집계
+    반환: {user_id: empty_summary()와 같은 키의 합계}
+    """
+    now = now or timezone.now()
+    today = now.date()
+    out_ymd_map = out_ymd_map or {}
+    result = {uid: empty_summary() for uid in user_ids}
+    if not user_ids:
+        return result
+
+    months = list(months)
+    closed = [(y, m) for y, m in months if is_month_closed(y, m, today)]
+    opened = [(y, m) for y, m in months if not is_month_closed(y, m, today)]
+
+    if closed:
+        rows = AttendanceMonth.objects.filter(
+            branch=branch, user_id__in=user_ids, ym__in=[f"{y:04d}{m:02d}" for y, m in closed],
+        )
+        have = {(r.user_id, r.ym): r for r in rows}
+
+        missing: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for y, m in closed:
+            ym = f"{y:04d}{m:02d}"
+            for uid in user_ids:
+                r = have.get((uid, ym))
+                if r is None or r.cutoff_day != _cutoff_day(out_ymd_map.get(uid), y, m):
+                    missing[(y, m)].append(uid)
+                else:
+                    _add_summary(result[uid], _rollup_summary(r))
+
+        for (y, m), uids in missing.items():
+            for r in rebuild_rollups(
+                branch=branch, year=y, month=m, user_ids=uids, now=now,
+                out_ymd_map={uid: out_ymd_map.get(uid) for uid in uids},
+            ):
+                _add_summary(result[r.user_id], _rollup_summary(r))
+
+    for y, m in opened:
+        summary = build_month_attendance_cube(
+            users=user_ids, year=y, month=m, branch=branch, out_ymd_map=out_ymd_map,
+        ).summary()
+        for uid in user_ids:
+            _add_summary(result[uid], summary[uid])
+
+    return result
+
+
+# ===== 확정(야간 배치) =====
+
+def pending_finalization(*, branch, today: date, since: Optional[date] = None):
+    """오늘 이전 일자인데 당일/미래일 기준으로 계산된 채 남아 있는 행 (퇴근 보정 미확정)"""
+    qs = AttendanceDay.objects.filter(
+        branch_id=_branch_id(branch), record_day__lt=today, computed_on__lte=F("record_day"),
+    )
+    if since is not None:
+        qs = qs.filter(record_day__gte=since)
+    return qs
+
+
+def finalize_attendance(*, branch, now: Optional[datetime] = None, since: Optional[date] = None) -> int:
+    """
+    지난 일자의 미확정 행을 다시 계산해 확정한다. (퇴근 보정값 + 출처 고정)
+    - 확정된 행은 이후 원천(근태기록/근무표/근로모듈)이 바뀔 때만 시그널로 다시 계산된다.
+    - 읽기 경로(read_attendance_month, read_finalized_days)는 확정값을 그대로 쓴다.
+    - 반환: 확정한 행 수
+    """
+    now = now or timezone.now()
+    targets: dict[tuple[int, int], tuple[set[int], set[date]]] = defaultdict(lambda: (set(), set()))
+    for uid, rd in pending_finalization(branch=branch, today=now.date(), since=since).values_list(
+        "user_id", "record_day",
+    ):
+        users, days = targets[(rd.year, rd.month)]
+        users.add(uid)
+        days.add(rd)
+
+    finalized = 0
+    for (year, month), (users, days) in sorted(targets.items()):
+        finalized += len(refresh_attendance(
+            branch=branch, year=year, month=month, user_ids=sorted(users), days=days, now=now,
+        ))
+    return finalized
+
+
+def read_finalized_days(*, branch, day: date, user_ids: Iterable[int]) -> dict[int, AttendanceDay]:
+    """(지점, 일자) 확정 행 {user_id: AttendanceDay}. 확정 전이면 빠진다. (TODAY 화면의 지난 일자 조회용)"""
+    return {
+        r.user_id: r
+        for r in AttendanceDay.objects.filter(
+            branch_id=_branch_id(branch), record_day=day, user_id__in=list(user_ids), computed_on__gt=day,
+        )
+    }
+
+
+# ===== 시그널 훅 (wtm.models) =====
+
+def on_work_changed(*, branch, user_id: int, days: Iterable[date]) -> None:
+    """근태기록 저장/삭제 → 해당 사용자의 해당 일자만 다시 계산."""
+    by_month: dict[tuple[int, int], set[date]] = defaultdict(set)
+    for rd in days:
+        by_month[(rd.year, rd.month)].add(rd)
+    for (year, month), month_days in by_month.items():
+        refresh_attendance(branch=branch, year=year, month=month, user_ids=[user_id], days=month_days)
+
+
+def on_schedule_changed(schedule: Schedule) -> None:
+    """근무표 저장/삭제 → 해당 사용자의 해당 월 전체를 다시 계산."""
+    if not schedule.user_id:
+        return
+    refresh_attendance(
+        branch=schedule.branch_id,
+        year=int(schedule.year),
+        month=int(schedule.month),
+        user_ids=[schedule.user_id],
+    )
+
+
+def on_schedule_cells_changed(*, branch, year: int, month: int, cells: dict[int, Iterable[int]]) -> int:
+    """
+    근무표 bulk 저장(시그널 없음) → 바뀐 셀(사용자 × 일자)만 다시 계산.
+    - cells: {user_id: [일, ...]}
+    - 같은 일자 묶음의 사용자끼리 한 번에 계산한다.
+    - 반환: 다시 계산한 셀 수
+    """
+    by_days: dict[tuple[int, ...], list[int]] = defaultdict(list)
+    for uid, days in cells.items():
+        days = tuple(sorted(set(days)))
+        if days:
+            by_days[days].append(uid)
+
+    refreshed = 0
+    for days, user_ids in by_days.items():
+        refreshed += len(refresh_attendance(
+            branch=branch, year=year, month=month, user_ids=user_ids,
+            days=[date(year, month, d) for d in days],
+        ))
+    return refreshed
+
+
+def on_module_changed(module: Module) -> int:
+    """
+    근로모듈 수정 → 이 모듈을 쓰는 셀(사용자 × 일자)만 다시 계산.
+    - 대상은 역인덱스(ModuleUsage)에서 찾는다.
+    - 월별로 같은 일자 패턴의 사용자끼리 묶어 한 번에 계산한다. (근무표는 보통 몇 가지 패턴뿐)
+    - 반환: 다시 계산한 셀 수
+    """
+    from wtm.services.module_usage import affected_cells, days_of
+
+    refreshed = 0
+    for (year, month), masks in sorted(affected_cells(module.id).items()):
+        by_mask: dict[int, list[int]] = defaultdict(list)
+        for uid, mask in masks.items():
+            by_mask[mask].append(uid)
+        for mask, user_ids in by_mask.items():
+            days = [date(year, month, d) for d in days_of(mask)]
+            refreshed += len(refresh_attendance(
+                branch=module.branch_id, year=year, month=month, user_ids=user_ids, days=days,
+            ))
+    return refreshed
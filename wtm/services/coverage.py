@@ -0,0 +1,108 @@
+"""
+근무 인원 커버리지 (시간대별 근무 인원).
+- 근로모듈 1건의 유급시간(시업~종업 - 휴게)을 하루 48칸(30분 단위) 비트마스크로 만든다.
+- 일자 × 그룹(부서)마다 근무자들의 마스크를 세어 두고, 서로 다른 마스크만 칸별 인원으로 펼친다.
+  → 비용은 사용자 × 일자 (+ 서로 다른 마스크 × 48), 칸마다 SQL을 돌리지 않는다.
+- 근무표 조회 1회 + 지점 근로모듈(요청 단위 로더 공유)로 한 달을 한 번에 계산한다.
+"""
+from calendar import monthrange
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from wtm.attendance_calc import compile_module
+from wtm.models import Schedule
+from wtm.services.attendance import branch_modules
+
+SLOT_MINUTES = 30
+SLOTS = 24 * 60 // SLOT_MINUTES
+SLOT_SECONDS = SLOT_MINUTES * 60
+
+# 실제로 출근하는 근로모듈 구분 (휴무/OFF는 시각이 있어도 인원에서 제외)
+WORK_CATS = ("소정근로", "휴일근로")
+
+
+@dataclass
+class Coverage:
+    groups: dict[str, list[list[int]]]  # 그룹(부서)별 [일자별 칸별 인원 [48]] (1일~말일)
+    total: list[list[int]]              # 전체 합계 (그룹 이름과 섞이지 않게 따로 둔다)
+
+
+def slot_labels() -> list[str]:
+    """칸 시작 시각 ["00:00", "00:30", ...]"""
+    return [f"{m // 60:02d}:{m % 60:02d}" for m in range(0, 24 * 60, SLOT_MINUTES)]
+
+
+def slot_mask(module) -> int:
+    """근로모듈 → 유급시간이 걸친 칸의 비트마스크 (bit s = s번째 30분 칸)"""
+    compiled = compile_module(module)
+    if compiled is None or compiled.cat not in WORK_CATS:
+        return 0
+    mask = 0
+    for a, b in compiled.paid:
+        for s in range(a // SLOT_SECONDS, min(SLOTS, -(-b // SLOT_SECONDS))):
+            mask |= 1 << s
+    return mask
+
+
+def slot_counts(masks: Counter) -> list[int]:
+    """{마스크: 인원} → 칸별 인원 [48]"""
+    counts = [0] * SLOTS
+    for mask, n in masks.items():
+        while mask:
+            low = mask & -mask
+            counts[low.bit_length() - 1] += n
+            mask ^= low
+    return counts
+
+
+def build_coverage(
+    *, groups: dict[int, str], year: int, month: int, branch, out_ymd_map: Optional[dict[int, str]] = None,
+) -> Coverage:
+    """
+    groups: {user_id: 그룹명(부서)}
+    반환: Coverage (그룹별 / 전체 합계)
+    - 퇴사일(out_ymd_map)이 해당 월이면 그 다음 날부터는 세지 않는다.
+    ORM 왕복: Schedule(1) + 근로모듈(요청 단위 로더에 없을 때 1)
+    """
+    last_day = monthrange(year, month)[1]
+    out_ymd_map = out_ymd_map or {}
+    ym = f"{year:04d}{month:02d}"
+
+    if not groups:
+        return Coverage(groups={}, total=[[0] * SLOTS for _ in range(last_day)])
+
+    day_fields = [f"d{d}_id" for d in range(1, last_day + 1)]
+    rows = list(
+        Schedule.objects
+        .filter(branch=branch, year=str(year), month=f"{month:02d}", user_id__in=list(groups))
+        .values_list("user_id", *day_fields)
+    )
+
+    modules = branch_modules(branch) if rows else {}
+    mask_of: dict[Optional[int], int] = {None: 0}
+
+    # (그룹, 일자 인덱스) → Counter{마스크: 인원}, 그룹 순서는 groups 순서
+    tally: dict[str, list[Counter]] = {
+        group: [Counter() for _ in range(last_day)] for group in dict.fromkeys(groups.values())
+    }
+    for user_id, *module_ids in rows:
+        end = last_day
+        out_ymd = out_ymd_map.get(user_id)
+        if out_ymd and out_ymd[:6] == ym:
+            end = min(end, int(out_ymd[6:8]))
+        by_day = tally[groups[user_id]]
+        for i in range(end):
+            mid = module_ids[i]
+            mask = mask_of.get(mid)
+            if mask is None:
+                mask = mask_of[mid] = slot_mask(modules.get(mid))
+            if mask:
+                by_day[i][mask] += 1
+
+    result = {
+        group: [slot_counts(c) for c in by_day]
+        for group, by_day in tally.items()
+    }
+    total = [[sum(col) for col in zip(*(result[g][i] for g in tally))] for i in range(last_day)]
+    return Coverage(groups=result, total=total)
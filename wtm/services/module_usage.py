@@ -0,0 +1,149 @@
+"""
+근로모듈 역인덱스 (ModuleUsage) 유지/조회.
+- 근무표 1건(사용자 × 월)마다 사용한 근로모듈별로 일자 비트마스크 1행
+- 근무표 저장 시 sync_module_usage로 갱신한다. (bulk 저장 후에는 sync_module_usages, 대량 적재 후에는 rebuild_module_usage)
+  셀 1개만 바꾼 경우에는 move_module_usage_day로 해당 일자 비트만 옮긴다.
+- 근로모듈 수정 시 affected_cells로 영향받는 (년월, 사용자, 일자)만 찾는다. (d1~d31 전체 OR 스캔 대신)
+"""
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from django.db import transaction
+
+from wtm.models import ModuleUsage, Schedule
+
+DAY_FIELDS = tuple(f"d{d}_id" for d in range(1, 32))
+
+
+def usage_masks(module_ids: Iterable[Optional[int]]) -> dict[int, int]:
+    """d1~d31 근로모듈 id(순서대로) → {module_id: 일자 비트마스크}"""
+    masks: dict[int, int] = defaultdict(int)
+    for d, mid in enumerate(module_ids):
+        if mid:
+            masks[mid] |= 1 << d
+    return dict(masks)
+
+
+def days_of(mask: int) -> list[int]:
+    """일자 비트마스크 → [일, ...]"""
+    return [d + 1 for d in range(31) if mask >> d & 1]
+
+
+def _usage_rows(schedule_id: int, branch_id: int, user_id: int, year: str, month: str, module_ids) -> list[ModuleUsage]:
+    return [
+        ModuleUsage(
+            module_id=mid, schedule_id=schedule_id, branch_id=branch_id, user_id=user_id,
+            year=int(year), month=int(month), days=mask,
+        )
+        for mid, mask in usage_masks(module_ids).items()
+    ]
+
+
+def sync_module_usage(schedule: Schedule) -> None:
+    """근무표 1건의 역인덱스를 현재 d1~d31 기준으로 맞춘다. (바뀐 근로모듈만 쓰기)"""
+    sync_module_usages([schedule])
+
+
+def sync_module_usages(schedules: Iterable[Schedule]) -> None:
+    """
+    근무표 여러 건의 역인덱스를 한 번에 맞춘다. (시그널 없이 bulk 저장한 근무표용)
+    ORM 왕복: 조회(1) + 바뀐 게 있으면 삭제(1)/생성(1)
+    """
+    schedules = [s for s in schedules if s.pk]
+    if not schedules:
+        return
+
+    wanted: dict[tuple[int, int], ModuleUsage] = {}
+    for schedule in schedules:
+        if not schedule.user_id:
+            continue
+        for r in _usage_rows(
+            schedule.pk, schedule.branch_id, schedule.user_id, schedule.year, schedule.month,
+            (getattr(schedule, f) for f in DAY_FIELDS),
+        ):
+            wanted[(r.schedule_id, r.module_id)] = r
+    have = {
+        (u.schedule_id, u.module_id): u
+        for u in ModuleUsage.objects.filter(schedule_id__in=[s.pk for s in schedules])
+    }
+
+    stale = [u.pk for key, u in have.items() if key not in wanted or u.days != wanted[key].days]
+    fresh = [r for key, r in wanted.items() if key not in have or have[key].days != r.days]
+    if not stale and not fresh:
+        return
+    with transaction.atomic():
+        if stale:
+            ModuleUsage.objects.filter(pk__in=stale).delete()
+        ModuleUsage.objects.bulk_create(fresh)
+
+
+def move_module_usage_day(
+    *, schedule_id: int, branch_id: int, user_id: int, year: int, month: int, day: int,
+    old: Optional[int], new: Optional[int],
+) -> None:
+    """
+    근무표 셀 1개(day) 변경을 역인덱스에 반영: old 근로모듈에서 일자 비트를 빼고 new 근로모듈에 더한다.
+    ORM 왕복: 조회(1) + 변경(1~2)
+    """
+    if old == new:
+        return
+    bit = 1 << (day - 1)
+    have = {
+        u.module_id: u
+        for u in ModuleUsage.objects.filter(schedule_id=schedule_id, module_id__in=[m for m in (old, new) if m])
+    }
+    with transaction.atomic():
+        if old and old in have:
+            usage = have[old]
+            usage.days &= ~bit
+            if usage.days:
+                usage.save(update_fields=["days"])
+            else:
+                usage.delete()
+        if new:
+            usage = have.get(new)
+            if usage is None:
+                ModuleUsage.objects.create(
+                    module_id=new, schedule_id=schedule_id, branch_id=branch_id, user_id=user_id,
+                    year=int(year), month=int(month), days=bit,
+                )
+            elif not usage.days & bit:
+                usage.days |= bit
+                usage.save(update_fields=["days"])
+
+
+def rebuild_module_usage(*, branch=None, batch_size: int = 2000) -> int:
+    """근무표 전체(또는 지점)에서 역인덱스를 다시 만든다. 반환: 저장한 행 수"""
+    schedules = Schedule.objects.filter(user__isnull=False)
+    usages = ModuleUsage.objects.all()
+    if branch is not None:
+        branch_id = getattr(branch, "id", branch)
+        schedules = schedules.filter(branch_id=branch_id)
+        usages = usages.filter(branch_id=branch_id)
+
+    written = 0
+    with transaction.atomic():
+        usages.delete()
+        rows: list[ModuleUsage] = []
+        for sid, branch_id, user_id, year, month, *module_ids in schedules.values_list(
+            "id", "branch_id", "user_id", "year", "month", *DAY_FIELDS,
+        ).iterator(chunk_size=batch_size):
+            rows.extend(_usage_rows(sid, branch_id, user_id, year, month, module_ids))
+            if len(rows) >= batch_size:
+                ModuleUsage.objects.bulk_create(rows)
+                written += len(rows)
+                rows = []
+        ModuleUsage.objects.bulk_create(rows)
+        written += len(rows)
+    return written
+
+
+def affected_cells(module_id: int) -> dict[tuple[int, int], dict[int, int]]:
+    """근로모듈을 쓰는 셀: {(년, 월): {user_id: 일자 비트마스크}}"""
+    cells: dict[tuple[int, int], dict[int, int]] = defaultdict(dict)
+    for year, month, user_id, mask in (
+        ModuleUsage.objects.filter(module_id=module_id).values_list("year", "month", "user_id", "days")
+    ):
+        by_user = cells[(year, month)]
+        by_user[user_id] = by_user.get(user_id, 0) | mask
+    return dict(cells)
@@ -0,0 +1,155 @@
+"""
+월 마감(일별 근태 + 월 집계 재계산) 배치.
+- 작업 단위는 (지점, 년월). 단위끼리 겹치는 행이 없으므로 프로세스 풀로 나눠 돌린다.
+- 단위가 끝날 때마다 상태 파일에 기록해 두고, 중단 후 다시 돌리면 끝난 단위는 건너뛴다.
+- 한 단위가 실패해도 나머지 단위는 계속 돌리고 기록한다. 실패한 단위는 상태 파일의 failed에 남고 다음 실행에서 다시 돈다.
+- 각 단위는 refresh_attendance_stream으로 계산/저장한다. (rebuild_attendance와 같은 결과)
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable, Optional
+
+import django
+from django.db import connections
+from django.utils import timezone
+
+from wtm.services.attendance_store import month_user_ids, refresh_attendance_stream
+
+
+@dataclass(frozen=True)
+class CloseUnit:
+    branch_id: int
+    branch_code: str
+    year: int
+    month: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.branch_code}:{self.year:04d}{self.month:02d}"
+
+
+@dataclass
+class CloseResult:
+    key: str
+    users: int
+    rows: int
+    ms: float
+    pid: int
+    finished_at: str
+
+
+def close_unit(unit: CloseUnit, user_chunk: int = 200) -> CloseResult:
+    """(지점, 년월) 1개 마감. 대상 사용자 조회 → 스트리밍 계산/저장."""
+    started = time.perf_counter()
+    user_ids = month_user_ids(branch=unit.branch_id, year=unit.year, month=unit.month)
+    rows = refresh_attendance_stream(
+        branch=unit.branch_id, year=unit.year, month=unit.month, user_ids=user_ids, user_chunk=user_chunk,
+    )
+    return CloseResult(
+        key=unit.key,
+        users=len(user_ids),
+        rows=rows,
+        ms=round((time.perf_counter() - started) * 1000, 1),
+        pid=os.getpid(),
+        finished_at=timezone.now().isoformat(timespec="seconds"),
+    )
+
+
+def _init_worker():
+    # fork로 넘어온 부모의 DB 연결을 쓰지 않도록 (spawn이면 여기서 앱 로딩)
+    django.setup()
+    for conn in connections.all(initialized_only=True):
+        conn.close()
+
+
+class CloseState:
+    """
+    상태 파일 (JSON): {"units": {"<지점코드>:<YYYYMM>": CloseResult, ...}, "failed": {"<키>": "오류", ...}}
+    - 단위가 끝날 때마다 임시 파일에 쓰고 교체한다. (중간에 끊겨도 파일이 깨지지 않음)
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.done: dict[str, dict] = {}
+        self.failed: dict[str, str] = {}
+
+    def load(self) -> None:
+        if self.path and os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.done = data.get("units", {})
+            self.failed = data.get("failed", {})
+
+    def record(self, result: CloseResult) -> None:
+        self.done[result.key] = asdict(result)
+        self.failed.pop(result.key, None)
+        self._write()
+
+    def record_failure(self, key: str, error: str) -> None:
+        self.failed[key] = error
+        self._write()
+
+    def _write(self) -> None:
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"units": self.done, "failed": self.failed}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+
+def run_close(
+    units: Iterable[CloseUnit], *, workers: int = 1, user_chunk: int = 200,
+    state: Optional[CloseState] = None, on_done: Optional[Callable[[CloseResult], None]] = None,
+    on_error: Optional[Callable[[CloseUnit, str], None]] = None,
+) -> tuple[list[CloseResult], dict[str, str]]:
+    """
+    units를 마감한다. state에 이미 끝난 단위는 건너뛴다.
+    - workers <= 1: 현재 프로세스에서 순서대로
+    - workers > 1: 프로세스 풀 (큰 단위가 먼저 끝나길 기다리지 않고 끝나는 대로 기록)
+    - 단위가 예외로 끝나면 state에 실패로 남기고 나머지 단위를 계속 처리한다.
+    - 반환: (이번 실행에서 끝낸 단위 결과 (완료 순), 실패 {단위 키: 오류})
+    """
+    state = state or CloseState(None)
+    todo = [u for u in units if u.key not in state.done]
+    results: list[CloseResult] = []
+    failures: dict[str, str] = {}
+
+    def finish(result: CloseResult):
+        state.record(result)
+        results.append(result)
+        if on_done:
+            on_done(result)
+
+    def fail(unit: CloseUnit, exc: BaseException):
+        error = f"{type(exc).__name__}: {exc}"
+        state.record_failure(unit.key, error)
+        failures[unit.key] = error
+        if on_error:
+            on_error(unit, error)
+
+    if workers <= 1 or len(todo) <= 1:
+        for unit in todo:
+            try:
+                result = close_unit(unit, user_chunk)
+            except Exception as exc:
+                fail(unit, exc)
+            else:
+                finish(result)
+        return results, failures
+
+    # 자식 프로세스가 부모 연결을 물려받지 않도록 먼저 닫는다
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(close_unit, unit, user_chunk): unit for unit in todo}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as exc:
+                fail(futures[future], exc)
+            else:
+                finish(result)
+    return results, failures
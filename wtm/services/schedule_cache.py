@@ -0,0 +1,63 @@
+"""
+근무표 화면(work_schedule) 컨텍스트 캐시.
+- (지점, 년월)별로 조립한 화면 컨텍스트를 Django 캐시에 넣고, 키에 버전을 붙여 무효화한다.
+- 버전은 DB(ScheduleGridVersion)에 둔다. (워커 프로세스가 여러 개여도 같은 버전을 본다)
+  · ym = "년월": 그 달 근무표가 바뀌면 올린다.
+  · ym = "": 지점 전체. 근로모듈/직원(부서·직위 포함)/공휴일/영업일이 바뀌면 올린다.
+- 화면은 다음 달 초(n1~n6)도 보여 주므로 키에는 다음 달 버전도 포함한다.
+- 버전 증가는 데이터 변경과 같은 트랜잭션에서 하므로 롤백되면 함께 되돌아간다.
+  (근무표 그리드/셀 저장(schedule_save)은 커밋 뒤에 올린다)
+"""
+from typing import Callable, Optional, TypeVar
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from common import context_processors
+from wtm.models import ScheduleGridVersion
+
+T = TypeVar("T")
+
+BRANCH_WIDE = ""
+CACHE_TIMEOUT = 60 * 60 * 24  # 버전이 바뀌면 키가 달라지므로 만료는 메모리 정리용
+
+
+def bump_schedule_grid(branch, ym: Optional[str] = None) -> None:
+    """근무표 화면 캐시 무효화: ym을 주면 그 달, 없으면 지점 전체"""
+    branch_id = getattr(branch, "id", branch)
+    if not branch_id:
+        return
+    ym = ym or BRANCH_WIDE
+    versions = ScheduleGridVersion.objects.filter(branch_id=branch_id, ym=ym)
+    if versions.update(version=F("version") + 1):
+        return
+    try:
+        with transaction.atomic():
+            ScheduleGridVersion.objects.create(branch_id=branch_id, ym=ym, version=1)
+    except IntegrityError:
+        # 동시에 다른 요청이 먼저 만들었다
+        versions.update(version=F("version") + 1)
+
+
+def schedule_grid_key(branch, ym: str) -> str:
+    """(지점, 년월) 캐시 키. ORM 왕복: 버전 조회(1)"""
+    branch_id = getattr(branch, "id", branch)
+    next_ym = (context_processors.get_month(ym, 1) or "")[0:6]
+    versions = dict(
+        ScheduleGridVersion.objects.filter(branch_id=branch_id, ym__in=[BRANCH_WIDE, ym, next_ym])
+        .values_list("ym", "version")
+    )
+    return "wtm:schedule_grid:{}:{}:{}.{}.{}".format(
+        branch_id, ym, versions.get(BRANCH_WIDE, 0), versions.get(ym, 0), versions.get(next_ym, 0),
+    )
+
+
+def cached_schedule_grid(branch, ym: str, build: Callable[[], T]) -> T:
+    """캐시에 있으면 그대로, 없으면 build()로 만들어 넣는다. (결과는 읽기 전용으로 다룬다)"""
+    key = schedule_grid_key(branch, ym)
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, CACHE_TIMEOUT)
+    return value
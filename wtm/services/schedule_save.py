@@ -0,0 +1,176 @@
+"""
+근무표(월 그리드) 저장.
+- 화면에서 넘어온 그리드를 저장된 근무표와 비교해서 바뀐 셀만 쓴다.
+  새 근무표는 bulk_create 1회, 기존 근무표는 바뀐 dN 컬럼만 bulk_update 1회.
+- bulk 저장은 시그널이 없으므로 근무표 저장 시그널이 하던 일을 직접 한다.
+  (요청 단위 로더 비우기, 근로모듈 역인덱스 갱신, 바뀐 셀의 일별 근태 재계산, 근무표 화면 캐시 무효화)
+- 쓰기 트랜잭션에는 근무표 쓰기만 둔다. 역인덱스/근태 재계산/캐시 무효화는 커밋 뒤(on_commit)
+  각자의 짧은 트랜잭션으로 하므로, 재계산하는 동안 근무표 행 잠금을 잡고 있지 않는다.
+- 셀 1개 수정(save_schedule_cell)은 해당 dN 컬럼만 조건부 UPDATE 1회로 쓴다.
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from common.loader import clear_request_cache
+from wtm.models import Schedule
+from wtm.services.attendance_store import on_schedule_cells_changed
+from wtm.services.module_usage import move_module_usage_day, sync_module_usages
+from wtm.services.schedule_cache import bump_schedule_grid
+
+
+@dataclass
+class ScheduleSaveResult:
+    created: int = 0  # 새로 만든 근무표 수
+    updated: int = 0  # 셀이 바뀐 기존 근무표 수
+    cells: int = 0    # 실제로 바뀐 셀 수
+
+    def __add__(self, other: "ScheduleSaveResult") -> "ScheduleSaveResult":
+        return ScheduleSaveResult(
+            self.created + other.created, self.updated + other.updated, self.cells + other.cells,
+        )
+
+
+# save_schedule_cell 결과
+CELL_CHANGED = "changed"      # 셀을 바꿨다
+CELL_UNCHANGED = "unchanged"  # 이미 같은 값이라 쓰지 않았다
+CELL_CONFLICT = "conflict"    # 화면이 본 값과 저장된 값이 달라 쓰지 않았다 (다른 사람이 먼저 수정)
+CELL_MISSING = "missing"      # 해당 월 근무표가 없다
+
+_UNSET = object()
+
+
+@dataclass
+class ScheduleCellResult:
+    status: str
+    module_id: Optional[int] = None  # 처리 후 저장된 값 (충돌이면 현재 저장된 값)
+
+
+def _after_write(*, branch, year: int, month: int, cells: dict[int, list[int]], sync_usages) -> None:
+    """근무표 쓰기가 커밋된 뒤: 역인덱스 → 바뀐 셀의 일별 근태 → 근무표 화면 캐시 (각자 짧은 트랜잭션)"""
+    sync_usages()
+    on_schedule_cells_changed(branch=branch, year=year, month=month, cells=cells)
+    bump_schedule_grid(branch, f"{year:04d}{month:02d}")
+
+
+def save_schedule_cell(
+    *, branch, user_id: int, day: date, module_id: Optional[int], actor, expected=_UNSET, now=None,
+) -> ScheduleCellResult:
+    """
+    근무표 셀 1개(user_id, day)를 module_id로 바꾼다.
+    - expected: 화면이 알고 있던 이전 값. 주면 저장된 값이 같을 때만 쓴다.
+    - 쓰기는 지점/근무표/이전 값 조건을 건 dN 컬럼 UPDATE 1회 (행 전체 save() 대신)
+    ORM 왕복: 현재 값 조회(1) + UPDATE(1) + (커밋 뒤) 역인덱스/근태 갱신
+    """
+    column = f"d{day.day}_id"
+    rows = Schedule.objects.filter(branch=branch, year=f"{day.year:04d}", month=f"{day.month:02d}", user_id=user_id)
+    row = rows.values_list("id", column).first()
+    if row is None:
+        return ScheduleCellResult(CELL_MISSING)
+    schedule_id, current = row
+    if expected is not _UNSET and expected != current:
+        return ScheduleCellResult(CELL_CONFLICT, current)
+    if current == module_id:
+        return ScheduleCellResult(CELL_UNCHANGED, current)
+
+    now = now or timezone.now()
+    with transaction.atomic():
+        updated = Schedule.objects.filter(pk=schedule_id, branch=branch, **{column: current}).update(
+            **{column: module_id, "mod_id": actor, "mod_date": now},
+        )
+        if not updated:
+            # 조회와 UPDATE 사이에 다른 요청이 먼저 바꿨다
+            return ScheduleCellResult(
+                CELL_CONFLICT, Schedule.objects.filter(pk=schedule_id).values_list(column, flat=True).first(),
+            )
+
+        clear_request_cache()
+        transaction.on_commit(lambda: _after_write(
+            branch=branch, year=day.year, month=day.month, cells={user_id: [day.day]},
+            sync_usages=lambda: move_module_usage_day(
+                schedule_id=schedule_id, branch_id=getattr(branch, "id", branch), user_id=user_id,
+                year=day.year, month=day.month, day=day.day, old=current, new=module_id,
+            ),
+        ))
+
+    return ScheduleCellResult(CELL_CHANGED, module_id)
+
+
+def save_schedule_grid(
+    *, branch, year: str, month: str, grid: dict[int, dict[int, Optional[int]]], actor, now=None,
+) -> ScheduleSaveResult:
+    """
+    grid: {user_id: {일: 모듈 id | None}} (쓸 일자만. 새 근무표의 나머지 일자는 비워 둔다)
+    - 근무표가 없는 사용자: 새로 만든다. (바뀐 셀 = 값이 있는 셀)
+    - 근무표가 있는 사용자: 값이 다른 셀만 쓰고, 바뀐 게 있을 때만 수정자/수정일시를 갱신한다.
+    ORM 왕복: 기존 근무표 조회(1) + bulk_create(0~1) + bulk_update(0~1) + (커밋 뒤) 역인덱스/근태 갱신
+    """
+    if not grid:
+        return ScheduleSaveResult()
+    now = now or timezone.now()
+
+    existing = {
+        s.user_id: s
+        for s in Schedule.objects.filter(branch=branch, year=year, month=month, user_id__in=list(grid))
+    }
+
+    to_create: list[Schedule] = []
+    to_update: list[Schedule] = []
+    changed_fields: set[str] = set()
+    changed_cells: dict[int, list[int]] = {}
+
+    for user_id, cells in grid.items():
+        obj = existing.get(user_id)
+        if obj is None:
+            obj = Schedule(
+                user_id=user_id, year=year, month=month, branch=branch,
+                reg_id=actor, reg_date=now, mod_id=actor, mod_date=now,
+            )
+            for day, module_id in cells.items():
+                setattr(obj, f"d{day}_id", module_id)
+            to_create.append(obj)
+            changed_cells[user_id] = [day for day, module_id in cells.items() if module_id is not None]
+            continue
+
+        days = [day for day, module_id in cells.items() if getattr(obj, f"d{day}_id") != module_id]
+        if not days:
+            continue
+        for day in days:
+            setattr(obj, f"d{day}_id", cells[day])
+            changed_fields.add(f"d{day}")
+        obj.mod_id = actor
+        obj.mod_date = now
+        to_update.append(obj)
+        changed_cells[user_id] = days
+
+    if not to_create and not to_update:
+        return ScheduleSaveResult()
+
+    with transaction.atomic():
+        if to_create:
+            Schedule.objects.bulk_create(to_create)
+            # pk를 돌려주지 않는 DB(MySQL)는 다시 읽는다
+            if any(s.pk is None for s in to_create):
+                to_create = list(Schedule.objects.filter(
+                    branch=branch, year=year, month=month, user_id__in=[s.user_id for s in to_create],
+                ))
+        if to_update:
+            Schedule.objects.bulk_update(
+                to_update, sorted(changed_fields, key=lambda f: int(f[1:])) + ["mod_id", "mod_date"],
+            )
+
+        clear_request_cache()
+        written = [*to_create, *to_update]
+        transaction.on_commit(lambda: _after_write(
+            branch=branch, year=int(year), month=int(month), cells=changed_cells,
+            sync_usages=lambda: sync_module_usages(written),
+        ))
+
+    return ScheduleSaveResult(
+        created=len(to_create),
+        updated=len(to_update),
+        cells=sum(len(days) for days in changed_cells.values()),
+    )
@@ -0,0 +1,179 @@
+"""
+벤치마크/부하 확인용 합성 데이터 생성.
+- 지점, 부서/직위, 근로모듈(휴게 포함), 직원 + 근로계약, 월별 근무표, 출퇴근 기록(지각/조퇴/퇴근누락/결근 포함)
+- 대량 생성은 bulk_create로 하고(시그널 미발생), 근로모듈 역인덱스와 일별 근태는 마지막에 한 번에 만든다.
+"""
+import random
+from calendar import monthrange
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from common.models import Branch, Business, Dept, Position, User
+from wtm.models import Contract, Module, Schedule, Work
+from wtm.services.attendance_store import iter_months, refresh_attendance
+from wtm.services.module_usage import rebuild_module_usage
+
+DEPTS = ("진료부", "간호부", "원무과", "물리치료실")
+POSITIONS = ("원장", "실장", "팀장", "주임", "사원")
+
+# (cat, name, start, end, rest1, rest2)
+MODULE_PALETTE = (
+    ("소정근로", "주간", "09:00", "18:00", ("12:00", "13:00"), ("-", "-")),
+    ("소정근로", "오후", "13:00", "22:00", ("17:00", "17:30"), ("19:30", "20:00")),
+    ("소정근로", "단축", "09:00", "13:00", ("-", "-"), ("-", "-")),
+    ("휴일근로", "토요근무", "09:00", "14:00", ("-", "-"), ("-", "-")),
+    ("OFF", "휴무", "-", "-", ("-", "-"), ("-", "-")),
+    ("유급휴무", "연차", "-", "-", ("-", "-"), ("-", "-")),
+    ("무급휴무", "무급", "-", "-", ("-", "-"), ("-", "-")),
+)
+
+
+@dataclass
+class SyntheticBranch:
+    branch: Branch
+    admin: User
+    user_ids: list[int]
+    months: list[tuple[int, int]]
+
+
+def _hm(value: str) -> int:
+    h, m = value.split(":")
+    return int(h) * 3600 + int(m) * 60
+
+
+def _punches(rng: random.Random, module: Module, day: date) -> list[tuple[str, datetime]]:
+    """근무일 하루의 출퇴근 기록 (정상 80% / 지각 8% / 조퇴 5% / 퇴근누락 4% / 결근 3%)."""
+    start, end = _hm(module.start_time), _hm(module.end_time)
+    roll = rng.random()
+    if roll < 0.03:
+        return []
+    checkin = start - rng.randrange(0, 20 * 60)
+    checkout = end + rng.randrange(0, 40 * 60)
+    if roll < 0.11:
+        checkin = start + rng.randrange(60, 60 * 60)
+    elif roll < 0.16:
+        checkout = end - rng.randrange(10 * 60, 2 * 3600)
+    midnight = datetime.combine(day, datetime.min.time())
+    punches = [("I", midnight + timedelta(seconds=checkin))]
+    if roll >= 0.16 and roll < 0.20:
+        return punches  # 퇴근 누락
+    punches.append(("O", midnight + timedelta(seconds=checkout)))
+    return punches
+
+
+@transaction.atomic
+def generate_branch(
+    code: str, *, employees: int, start: tuple[int, int], end: tuple[int, int],
+    seed: int = 0, materialize: bool = True,
+) -> SyntheticBranch:
+    """지점 1개 분량의 합성 데이터 생성."""
+    rng = random.Random(f"{seed}:{code}")
+    now = timezone.now()
+    today = now.date()
+
+    branch = Branch.objects.create(code=code, name=f"합성 {code}")
+    admin = User(
+        username=f"{code}_admin", emp_name="관리자", dept=DEPTS[0], position=POSITIONS[0],
+        join_date=date(2020, 1, 1), branch=branch, is_employee=False, is_staff=True,
+    )
+    admin.set_unusable_password()
+    admin.save()
+    stamp = dict(reg_id=admin, reg_date=now, mod_id=admin, mod_date=now, branch=branch)
+
+    Dept.objects.bulk_create([Dept(dept_name=name, order=i, **stamp) for i, name in enumerate(DEPTS, 1)])
+    Position.objects.bulk_create([Position(position_name=name, order=i, **stamp) for i, name in enumerate(POSITIONS, 1)])
+    Business.objects.create(
+        stand_date=date(2020, 1, 1), mon="Y", tue="Y", wed="Y", thu="Y", fri="Y", sat="Y", sun="N", **stamp,
+    )
+
+    modules = {}
+    for color, (cat, name, st, et, r1, r2) in enumerate(MODULE_PALETTE, 1):
+        modules[name] = Module.objects.create(
+            cat=cat, name=name, start_time=st, end_time=et,
+            rest1_start_time=r1[0], rest1_end_time=r1[1], rest2_start_time=r2[0], rest2_end_time=r2[1],
+            color=color, **stamp,
+        )
+    day_shifts = [modules["주간"], modules["오후"], modules["단축"]]
+
+    users = []
+    for n in range(employees):
+        user = User(
+            username=f"{code}_u{n:05d}", emp_name=f"직원{n:05d}",
+            dept=rng.choice(DEPTS), position=rng.choice(POSITIONS),
+            join_date=date(2020, 1, 1) + timedelta(days=rng.randrange(0, 365)), branch=branch,
+        )
+        user.set_unusable_password()
+        users.append(user)
+    User.objects.bulk_create(users)
+    users = list(User.objects.filter(branch=branch, is_employee=True).order_by("id"))
+
+    # 근로계약: 평일 주/오후/단축 중 하나, 토요일은 일부만 토요근무, 일요일 휴무
+    weekly: dict[int, list[Module]] = {}
+    contracts = []
+    for user in users:
+        shift = rng.choice(day_shifts)
+        sat = modules["토요근무"] if rng.random() < 0.3 else modules["휴무"]
+        week = [shift] * 5 + [sat, modules["휴무"]]
+        weekly[user.id] = week
+        contracts.append(Contract(
+            user=user, stand_date=user.join_date, type=rng.choice(("탄력", "고정")), check_yn="Y",
+            mon=week[0], tue=week[1], wed=week[2], thu=week[3], fri=week[4], sat=week[5], sun=week[6],
+            **stamp,
+        ))
+    Contract.objects.bulk_create(contracts)
+
+    months = list(iter_months(start, end))
+    for year, month in months:
+        schedules, works = [], []
+        last = monthrange(year, month)[1]
+        for user in users:
+            schedule = Schedule(user=user, year=f"{year:04d}", month=f"{month:02d}", **stamp)
+            for d in range(1, last + 1):
+                day = date(year, month, d)
+                module = weekly[user.id][day.weekday()]
+                roll = rng.random()
+                if module.cat == "소정근로" and roll < 0.04:
+                    module = modules["연차"] if roll < 0.03 else modules["무급"]
+                setattr(schedule, f"d{d}", module)
+
+                if day >= today:
+                    continue
+                if module.cat in ("소정근로", "휴일근로"):
+                    punches = _punches(rng, module, day)
+                elif rng.random() < 0.01:
+                    # 휴무일 잘못 찍힌 기록 → 오류
+                    punches = [("I", datetime.combine(day, datetime.min.time()) + timedelta(hours=9))]
+                else:
+                    punches = []
+                for work_code, at in punches:
+                    works.append(Work(
+                        user=user, work_code=work_code, record_date=at, record_day=at.date(), branch=branch,
+                    ))
+            schedules.append(schedule)
+        Schedule.objects.bulk_create(schedules)
+        Work.objects.bulk_create(works, batch_size=2000)
+
+    rebuild_module_usage(branch=branch)
+
+    user_ids = [u.id for u in users]
+    if materialize:
+        for year, month in months:
+            refresh_attendance(branch=branch, year=year, month=month, user_ids=user_ids)
+
+    return SyntheticBranch(branch=branch, admin=admin, user_ids=user_ids, months=months)
+
+
+def generate(
+    *, branches: int, employees: int, start: tuple[int, int], end: tuple[int, int],
+    seed: int = 0, prefix: str = "bench", materialize: bool = True,
+) -> list[SyntheticBranch]:
+    """지점 branches개 × 직원 employees명 × start~end 월 합성 데이터 생성."""
+    return [
+        generate_branch(
+            f"{prefix}{b:02d}", employees=employees, start=start, end=end, seed=seed, materialize=materialize,
+        )
+        for b in range(1, branches + 1)
+    ]
@@ -0,0 +1,1571 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+from io import StringIO
+from itertools import product
+from random import Random
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from common.loader import current_loader, request_scope
+from common.middleware import RequestLoaderMiddleware
+from common.models import Branch, Holiday, User
+from wtm import attendance_calc
+from wtm.attendance_calc import (
+    DAY_FUTURE, DAY_PAST, DAY_TODAY, AttendanceMemo, LogsDay, clear_compiled_modules, compile_module,
+    compute_seconds_status_for_day, compute_seconds_status_for_day_int, evaluate_batch, evaluate_day,
+    make_paid_segments, status_codes_of, status_flags_of, status_labels_of, to_seconds,
+)
+from wtm.benchmarks import bench_batch_memo, bench_pipeline, bench_result_memory, explain_punch_query
+from wtm.equivalence import Case, find_mismatches
+from wtm.models import AttendanceDay, AttendanceMonth, Contract, Module, ModuleUsage, Schedule, Work
+from wtm.services.attendance import (
+    SUMMARY_KEYS, build_attendance_summary_for_period, build_daily_attendance_for_users, build_month_attendance_cube,
+    build_monthly_attendance_for_user, build_monthly_attendance_summary_for_users,
+    build_monthly_metric_details_for_users, determine_checkout_seconds, determine_checkout_time, prepare_month,
+    evaluate_month, month_range, prepare_window, stream_window,
+)
+from wtm.services.attendance_store import (
+    finalize_attendance, month_user_ids, pending_finalization, read_attendance_month, refresh_attendance, refresh_attendance_stream,
+)
+from wtm.services.attendance_sql import summary_sql
+from wtm.services.coverage import SLOTS, build_coverage, slot_mask
+from wtm.services.module_usage import affected_cells, days_of, rebuild_module_usage
+from wtm.services.schedule_cache import bump_schedule_grid, cached_schedule_grid
+from wtm.services.schedule_save import CELL_CONFLICT, save_schedule_cell, save_schedule_grid
+from wtm.views.coverage import work_coverage, work_coverage_json
+from wtm.views.stat import work_status_excel
+from wtm.views.helpers import ContractTimeline, get_non_business_days
+from wtm.views.schedule import _contract_cells, _fill_next_month, work_schedule, work_schedule_cell, work_schedule_grid
+
+
+def fake_module(**kwargs) -> SimpleNamespace:
+    """
+    Module-like 객체 (엔진이 읽는 필드만 제공).
+    """
+    base = dict(
+        id=None,
+        mod_date=None,
+        cat="소정근로",
+        name="주간",
+        start_time="09:00",
+        end_time="18:00",
+        rest1_start_time="12:00",
+        rest1_end_time="13:00",
+        rest2_start_time="-",
+        rest2_end_time="-",
+    )
+    base.update(kwargs)
+    return SimpleNamespace(**base)
+
+
+class CompiledModuleTests(SimpleTestCase):
+    def setUp(self):
+        clear_compiled_modules()
+
+    def test_paid_segments_subtract_rests(self):
+        compiled = compile_module(fake_module(rest2_start_time="15:00", rest2_end_time="15:30"))
+        self.assertEqual(
+            compiled.paid,
+            ((9 * 3600, 12 * 3600), (13 * 3600, 15 * 3600), (15 * 3600 + 1800, 18 * 3600)),
+        )
+        self.assertEqual(compiled.paid_total_seconds, 7 * 3600 + 1800)
+        self.assertEqual(compiled.last_paid_end, 18 * 3600)
+
+    def test_invalid_times_have_no_paid_segments(self):
+        self.assertEqual(compile_module(fake_module(start_time="-")).paid, ())
+        self.assertEqual(compile_module(fake_module(end_time="08:00")).paid, ())
+        self.assertIsNone(compile_module(None))
+
+    def test_cached_per_module_version(self):
+        stamp = datetime(2025, 12, 1, 9, 0)
+        module = fake_module(id=1, mod_date=stamp)
+        first = compile_module(module)
+        self.assertIs(compile_module(module), first)
+
+        # 모듈 수정(mod_date 변경) 시 새 버전으로 다시 계산
+        module.end_time = "17:00"
+        module.mod_date = datetime(2025, 12, 2, 9, 0)
+        second = compile_module(module)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.last_paid_end, 17 * 3600)
+
+    def test_make_paid_segments_uses_day(self):
+        segments = make_paid_segments(date(2025, 12, 10), fake_module())
+        self.assertEqual(segments[0], (datetime(2025, 12, 10, 9, 0), datetime(2025, 12, 10, 12, 0)))
+        self.assertEqual(segments[-1], (datetime(2025, 12, 10, 13, 0), datetime(2025, 12, 10, 18, 0)))
+
+
+class IntEngineEquivalenceTests(SimpleTestCase):
+    """
+    정수(초) 엔진이 기존 compute_seconds_status_for_day와 같은 Metrics를 내는지 격자 비교.
+    """
+    NOW = datetime(2025, 12, 16, 10, 0)
+    DAYS = (date(2025, 12, 10), date(2025, 12, 16), date(2025, 12, 20))
+    PUNCHES = (None, "00:00:00", "06:00:00", "08:59:59", "09:00:00", "11:30:15",
+               "12:30:00", "13:00:00", "17:59:59", "18:00:00", "19:45:30")
+    MODULES = (
+        None,
+        fake_module(),
+        fake_module(cat="휴일근로", start_time="10:00", end_time="15:00"),
+        fake_module(rest1_start_time="-", rest1_end_time="-", start_time="09:30", end_time="21:00"),
+        fake_module(rest2_start_time="15:00", rest2_end_time="15:30"),
+        fake_module(cat="OFF", start_time="-", end_time="-", rest1_start_time="-", rest1_end_time="-"),
+        fake_module(cat="유급휴무"),
+        fake_module(cat="무급휴무"),
+        fake_module(cat="알수없음"),
+    )
+
+    def test_metrics_match_reference(self):
+        with patch("wtm.attendance_calc.timezone.now", return_value=self.NOW):
+            for module, day, ci, co in product(self.MODULES, self.DAYS, self.PUNCHES, self.PUNCHES):
+                expected = compute_seconds_status_for_day(day, module, LogsDay(checkin=ci, checkout=co))
+                actual = compute_seconds_status_for_day_int(day, module, to_seconds(ci), to_seconds(co))
+                self.assertEqual(actual.to_metrics(), expected, msg=f"{module} {day} {ci} {co}")
+
+    def test_checkout_correction_matches_reference(self):
+        today = date(2025, 12, 16)
+        end_sec = 18 * 3600
+        end_dt = datetime(2025, 12, 10, 18, 0)
+        for checkin_dt in (None, datetime(2025, 12, 10, 9, 0), end_dt,
+                           datetime(2025, 12, 10, 18, 0, 0, 500), datetime(2025, 12, 10, 19, 0)):
+            for day in (date(2025, 12, 10), today):
+                expected = determine_checkout_time(None, day, checkin_dt, end_dt, today)
+                actual = determine_checkout_seconds(None, day, checkin_dt, end_sec, today)
+                self.assertEqual(actual, to_seconds(expected))
+
+
+class BatchEngineTests(SimpleTestCase):
+    NOW = datetime(2025, 12, 16, 10, 0)
+
+    def test_batch_matches_scalar(self):
+        palette = [compile_module(m) for m in IntEngineEquivalenceTests.MODULES if m is not None]
+        classes = {DAY_PAST: date(2025, 12, 10), DAY_TODAY: date(2025, 12, 16), DAY_FUTURE: date(2025, 12, 20)}
+        punches = [to_seconds(p) for p in IntEngineEquivalenceTests.PUNCHES]
+
+        cells = list(product(range(-1, len(palette)), classes, punches, punches))
+        batch = evaluate_batch(
+            palette,
+            [mi for mi, _, _, _ in cells],
+            [-1 if ci is None else ci for _, _, ci, _ in cells],
+            [-1 if co is None else co for _, _, _, co in cells],
+            [dc for _, dc, _, _ in cells],
+            10 * 3600,
+        )
+
+        with patch("wtm.attendance_calc.timezone.now", return_value=self.NOW):
+            for i, (mi, dc, ci, co) in enumerate(cells):
+                expected = compute_seconds_status_for_day_int(
+                    classes[dc], palette[mi] if mi >= 0 else None, ci, co,
+                )
+                self.assertEqual(
+                    (batch.late_seconds[i], batch.early_seconds[i], batch.overtime_seconds[i],
+                     batch.holiday_seconds[i], list(batch.status_codes(i))),
+                    (expected.late_seconds, expected.early_seconds, expected.overtime_seconds,
+                     expected.holiday_seconds, expected.status_codes),
+                )
+
+
+class StatusFlagTests(SimpleTestCase):
+    def test_flags_round_trip_in_code_order(self):
+        for codes in (("NOSCHEDULE",), ("ERROR",), ("NORMAL",), ("LATE", "EARLY"), ("LATE", "EARLY", "OVERTIME")):
+            flags = status_flags_of(",".join(codes))
+            self.assertEqual(status_codes_of(flags), codes)
+        self.assertEqual(status_labels_of(status_flags_of("LATE,OVERTIME")), ("지각", "연장근로"))
+
+    def test_day_metrics_materializes_labels_lazily(self):
+        with patch("wtm.attendance_calc.timezone.now", return_value=datetime(2025, 12, 16, 10, 0)):
+            m = compute_seconds_status_for_day_int(date(2025, 12, 10), fake_module(), 9 * 3600 + 600, 17 * 3600)
+        self.assertFalse(hasattr(m, "__dict__"))
+        self.assertEqual(m.status_codes, ["LATE", "EARLY"])
+        self.assertEqual(m.status, "+".join(m.status_labels))
+        self.assertFalse(m.is_error)
+
+    def test_memory_benchmark_shows_reduction(self):
+        report = bench_result_memory(2000)
+        self.assertEqual(report["metrics"]["error_count"], report["day_metrics"]["error_count"])
+        self.assertEqual(report["metrics"]["error_count"], report["batch"]["error_count"])
+        self.assertLess(report["day_metrics"]["retained_bytes"], report["metrics"]["retained_bytes"])
+        self.assertLess(report["batch"]["retained_bytes"], report["day_metrics"]["retained_bytes"])
+        self.assertLess(report["batch"]["live_blocks"], report["metrics"]["live_blocks"])
+
+
+class ReferenceClockTests(SimpleTestCase):
+    """기준시각을 인자로 넘기면 timezone.now()를 읽지 않고 같은 결과를 낸다."""
+
+    def test_explicit_now_matches_patched_clock(self):
+        module = fake_module()
+        for now in (datetime(2025, 12, 16, 8, 0), datetime(2025, 12, 16, 10, 0), datetime(2025, 12, 17, 0, 0)):
+            for day in IntEngineEquivalenceTests.DAYS:
+                with patch("wtm.attendance_calc.timezone.now", return_value=now):
+                    expected = compute_seconds_status_for_day(day, module, LogsDay(checkin=None, checkout=None))
+                with patch("wtm.attendance_calc.timezone.now", side_effect=AssertionError("clock read")):
+                    ref = compute_seconds_status_for_day(day, module, LogsDay(checkin=None, checkout=None), now=now)
+                    fast = compute_seconds_status_for_day_int(day, module, None, None, now=now)
+                self.assertEqual(ref, expected)
+                self.assertEqual(fast.to_metrics(), expected)
+
+
+class AttendanceMemoTests(SimpleTestCase):
+    def test_memo_matches_direct_evaluation(self):
+        memo = AttendanceMemo()
+        palette = [None] + [compile_module(m) for m in IntEngineEquivalenceTests.MODULES if m is not None]
+        punches = [to_seconds(p) for p in IntEngineEquivalenceTests.PUNCHES]
+        for _ in range(2):
+            for compiled, dc, ci, co, now_sec in product(
+                palette, (DAY_PAST, DAY_TODAY, DAY_FUTURE), punches, punches, (8 * 3600, 10 * 3600),
+            ):
+                self.assertEqual(
+                    memo.evaluate(compiled, ci, co, dc, now_sec),
+                    evaluate_day(compiled, ci, co, dc, now_sec),
+                )
+        self.assertGreater(memo.hits, memo.misses)
+
+    def test_today_key_only_tracks_start_passed(self):
+        memo = AttendanceMemo()
+        compiled = compile_module(fake_module())
+        before = memo.evaluate(compiled, None, None, DAY_TODAY, 7 * 3600)
+        memo.evaluate(compiled, None, None, DAY_TODAY, 8 * 3600)
+        self.assertEqual((memo.hits, memo.misses), (1, 1))
+
+        after = memo.evaluate(compiled, None, None, DAY_TODAY, 9 * 3600)
+        self.assertEqual(memo.misses, 2)
+        self.assertEqual(status_codes_of(before[4]), ("NORMAL",))
+        self.assertEqual(status_codes_of(after[4]), ("ERROR",))
+
+    def test_lru_bound_and_stats(self):
+        memo = AttendanceMemo(maxsize=2)
+        compiled = compile_module(fake_module())
+        for ci in (9 * 3600, 10 * 3600, 11 * 3600):
+            memo.evaluate(compiled, ci, 18 * 3600, DAY_PAST, 0)
+        memo.evaluate(compiled, 11 * 3600, 18 * 3600, DAY_PAST, 0)
+        memo.evaluate(compiled, 9 * 3600, 18 * 3600, DAY_PAST, 0)  # 가장 오래된 항목은 밀려남
+
+        self.assertEqual(memo.stats(), {"hits": 1, "misses": 4, "size": 2, "maxsize": 2, "hit_rate": 0.2})
+        memo.clear()
+        self.assertEqual(memo.stats()["size"], 0)
+
+    def test_batch_with_memo_matches_plain_batch(self):
+        palette = [compile_module(m) for m in IntEngineEquivalenceTests.MODULES if m is not None]
+        punches = [-1 if p is None else to_seconds(p) for p in IntEngineEquivalenceTests.PUNCHES]
+        cells = list(product(range(-1, len(palette)), (DAY_PAST, DAY_TODAY, DAY_FUTURE), punches, punches))
+        args = (
+            palette,
+            [mi for mi, _, _, _ in cells],
+            [ci for _, _, ci, _ in cells],
+            [co for _, _, _, co in cells],
+            [dc for _, dc, _, _ in cells],
+            10 * 3600,
+        )
+        self.assertEqual(evaluate_batch(*args, memo=AttendanceMemo()), evaluate_batch(*args))
+
+    def test_batch_memo_benchmark(self):
+        report = bench_batch_memo(2000, repeat=1)
+        self.assertTrue(report["same"])
+        self.assertLess(report["hit_rate"], 0.5)  # 실제 출퇴근 초는 거의 반복되지 않는다
+
+
+class DifferentialEquivalenceTests(SimpleTestCase):
+    """
+    무작위 입력(휴게/경계/오늘·과거·미래)으로 기존 규칙과 빠른 엔진들을 차등 비교.
+    불일치가 있으면 최소화된 입력이 실패 메시지에 나온다.
+    """
+
+    def test_fast_engines_match_reference(self):
+        mismatches = find_mismatches(cases=1500, seed=20251216)
+        self.assertEqual(mismatches, [], msg="\n".join(str(m) for m in mismatches))
+
+    def test_broken_engine_is_reported_with_minimal_case(self):
+        def drops_microseconds(case: Case):
+            # 퇴근 보정에서 출근 ≤ 종업 비교 시 마이크로초를 버리는 잘못된 엔진
+            compiled = compile_module(case.module())
+            checkout = case.checkout
+            if (checkout is None and case.day == -1 and case.checkin is not None
+                    and compiled and compiled.end is not None and case.checkin <= compiled.end):
+                checkout = compiled.end
+            m = compute_seconds_status_for_day_int(case.record_day, case.module(), case.checkin, checkout, now=case.now)
+            return m.late_seconds, m.early_seconds, m.overtime_seconds, m.holiday_seconds, tuple(m.status_codes)
+
+        [mismatch] = find_mismatches({"broken": drops_microseconds}, cases=1500, seed=1)
+        case = mismatch.case
+        self.assertEqual((case.cat, case.day, case.checkout), ("소정근로", -1, None))
+        self.assertEqual((case.rest1_start_time, case.rest2_start_time), ("-", "-"))
+        self.assertEqual(case.checkin, to_seconds(case.end_time))
+        self.assertNotEqual(case.checkin_us, 0)
+        self.assertNotEqual(mismatch.expected, mismatch.actual)
+
+    def test_compiled_rest_bug_is_caught(self):
+        # 기준 규칙은 compile_module과 따로 유급 구간을 만들므로 컴파일 쪽 휴게 처리 버그도 드러난다
+        build = attendance_calc._build_paid_seconds
+
+        def ignores_rest2(module):
+            return build(SimpleNamespace(**{**vars(module), "rest2_start_time": "-", "rest2_end_time": "-"}))
+
+        with patch("wtm.attendance_calc._build_paid_seconds", side_effect=ignores_rest2):
+            mismatches = find_mismatches(cases=500, seed=20251216)
+        self.assertTrue(mismatches)
+        self.assertTrue(all(m.case.rest2_start_time != "-" for m in mismatches))
+
+
+class MonthFixtureTestCase(TestCase):
+    """지점 1, 근로모듈 3종, 직원 2명의 2025년 11월 근무표/근태기록."""
+    YEAR, MONTH = 2025, 11
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = Branch.objects.create(code="A", name="Branch A")
+        cls.admin = User.objects.create_user(
+            username="admin", password="pw", emp_name="관리자", dept="D", position="P",
+            join_date=date(2024, 1, 1), branch=cls.branch,
+        )
+        now = timezone.now()
+        stamp = dict(reg_id=cls.admin, reg_date=now, mod_id=cls.admin, mod_date=now, branch=cls.branch)
+        cls.regular = Module.objects.create(
+            cat="소정근로", name="주간", start_time="09:00", end_time="18:00",
+            rest1_start_time="12:00", rest1_end_time="13:00", rest2_start_time="-", rest2_end_time="-",
+            color=1, **stamp,
+        )
+        cls.holiday = Module.objects.create(
+            cat="휴일근로", name="휴근", start_time="10:00", end_time="15:00",
+            rest1_start_time="-", rest1_end_time="-", rest2_start_time="-", rest2_end_time="-",
+            color=2, **stamp,
+        )
+        cls.nopay = Module.objects.create(
+            cat="무급휴무", name="무급", start_time="-", end_time="-",
+            rest1_start_time="-", rest1_end_time="-", rest2_start_time="-", rest2_end_time="-",
+            color=3, **stamp,
+        )
+
+        cls.users = []
+        for n in range(2):
+            user = User.objects.create_user(
+                username=f"u{n}", password="pw", emp_name=f"직원{n}", dept="D", position="P",
+                join_date=date(2024, 1, 1), branch=cls.branch,
+            )
+            cls.users.append(user)
+            schedule = Schedule(user=user, year=str(cls.YEAR), month=f"{cls.MONTH:02d}", **stamp)
+            for d in range(1, 31):
+                module = (cls.regular, cls.holiday, cls.nopay, None)[(d + n) % 4]
+                setattr(schedule, f"d{d}", module)
+            schedule.save()
+
+            for d in range(1, 31):
+                if d % 5 == 0:
+                    continue  # 기록 없음 → ERROR
+                checkin = datetime(cls.YEAR, cls.MONTH, d, 9, (d * 7 + n) % 30, 15)
+                Work.objects.create(user=user, work_code="I", record_date=checkin, branch=cls.branch)
+                if d % 3:
+                    checkout = datetime(cls.YEAR, cls.MONTH, d, 16 + d % 3, 10, 0)
+                    Work.objects.create(user=user, work_code="O", record_date=checkout, branch=cls.branch)
+
+    def reference_cells(self, user):
+        schedule = Schedule.objects.get(user=user)
+        today = timezone.now().date()
+        for d in range(1, 31):
+            rd = date(self.YEAR, self.MONTH, d)
+            module = getattr(schedule, f"d{d}")
+            works = Work.objects.filter(user=user, record_day=rd)
+            ins = sorted(w.record_date for w in works if w.work_code == "I")
+            outs = sorted(w.record_date for w in works if w.work_code == "O")
+            end_dt = None
+            if module and module.end_time != "-":
+                end_dt = datetime.combine(rd, datetime.strptime(module.end_time, "%H:%M").time())
+            checkout = determine_checkout_time(outs[-1] if outs else None, rd, ins[0] if ins else None, end_dt, today)
+            checkin = ins[0].strftime("%H:%M:%S") if ins else None
+            yield rd, module, compute_seconds_status_for_day(rd, module, LogsDay(checkin=checkin, checkout=checkout))
+
+
+class MonthlyBuildersTests(MonthFixtureTestCase):
+    """
+    월 집계 빌더(배치 엔진 사용)가 셀별 기존 함수 결과와 같은 값을 내는지 DB 기반으로 확인.
+    """
+    def test_summary_matches_reference(self):
+        uids = [u.id for u in self.users]
+        summary = build_monthly_attendance_summary_for_users(
+            users=uids, year=self.YEAR, month=self.MONTH, branch=self.branch,
+        )
+        for user in self.users:
+            agg = summary[user.id]
+            cells = list(self.reference_cells(user))
+            self.assertEqual(agg["late_seconds"], sum(m.late_seconds for _, _, m in cells))
+            self.assertEqual(agg["overtime_count"], sum(1 for _, _, m in cells if m.overtime_seconds))
+            self.assertEqual(agg["error_count"], sum(1 for _, _, m in cells if m.status_codes == ["ERROR"]))
+            self.assertEqual(agg["hol_work_seconds"], sum(m.holiday_seconds for _, _, m in cells))
+            self.assertEqual(agg["nopay_count"], sum(1 for _, mod, _ in cells if mod and mod.cat == "무급휴무"))
+
+    def test_metric_details_match_reference(self):
+        uids = [u.id for u in self.users]
+        details = build_monthly_metric_details_for_users(
+            users=uids, year=self.YEAR, month=self.MONTH, metric="early", branch=self.branch,
+        )
+        for user in self.users:
+            expected = {rd: m.early_seconds for rd, _, m in self.reference_cells(user)}
+            self.assertEqual(details[user.id]["days"], expected)
+            self.assertEqual(details[user.id]["total_seconds"], sum(expected.values()))
+
+    def test_punches_read_by_half_open_month_range(self):
+        user = self.users[0]
+        for at in (datetime(2025, 10, 31, 23, 59, 59), datetime(2025, 12, 1, 0, 0)):
+            Work.objects.create(user=user, work_code="I", record_date=at, branch=self.branch)
+
+        days, _, _, logs_map = prepare_month([user.id], self.YEAR, self.MONTH, branch=self.branch)
+        self.assertTrue(set(logs_map[user.id]) <= set(days))
+
+        plan = explain_punch_query(branch=self.branch, user_ids=[u.id for u in self.users], year=2025, month=12)
+        self.assertTrue(plan["uses_index"], plan["plan"])
+        self.assertTrue(plan["covering"], plan["plan"])
+        self.assertTrue(plan["sorted"], plan["plan"])
+
+    def test_window_spans_months_in_fixed_queries(self):
+        user = self.users[0]
+        now = timezone.now()
+        stamp = dict(reg_id=self.admin, reg_date=now, mod_id=self.admin, mod_date=now, branch=self.branch)
+        Schedule.objects.create(user=user, year="2025", month="12", d1=self.holiday, d2=self.regular, **stamp)
+        Work.objects.create(user=user, work_code="I", record_date=datetime(2025, 12, 1, 10, 0), branch=self.branch)
+
+        uids = [u.id for u in self.users]
+        with self.assertNumQueries(3):
+            days, sched_map, modules, logs_map = prepare_window(
+                uids, date(2025, 11, 24), date(2025, 12, 8), branch=self.branch,
+            )
+        self.assertEqual((days[0], days[-1], len(days)), (date(2025, 11, 24), date(2025, 12, 7), 14))
+        self.assertEqual(sched_map[user.id][date(2025, 12, 1)], self.holiday.id)
+        self.assertNotIn(date(2025, 12, 1), sched_map[self.users[1].id])  # 12월 근무표 없음
+        self.assertIn(self.holiday.id, modules)
+        self.assertIn(date(2025, 12, 1), logs_map[user.id])
+
+        # 11월 부분은 prepare_month와 같다
+        _, month_sched, _, month_logs = prepare_month(uids, self.YEAR, self.MONTH, branch=self.branch)
+        for uid in uids:
+            for rd in days[:7]:
+                self.assertEqual(sched_map[uid][rd], month_sched[uid][rd])
+                self.assertEqual(logs_map.get(uid, {}).get(rd), month_logs.get(uid, {}).get(rd))
+
+    def test_cube_serves_all_metrics_from_one_pass(self):
+        uids = [u.id for u in self.users]
+        with self.assertNumQueries(3):
+            cube = build_month_attendance_cube(
+                users=uids, year=self.YEAR, month=self.MONTH, branch=self.branch, from_store=False,
+            )
+
+        with self.assertNumQueries(0):
+            summary = cube.summary()
+            details = {metric: cube.metric_details(metric) for metric in ("late", "early", "overtime", "holiday")}
+            cells = cube.cells(uids[0])
+
+        self.assertEqual(summary[uids[0]]["late_seconds"], details["late"][uids[0]]["total_seconds"])
+        self.assertEqual(summary[uids[1]]["overtime_count"], details["overtime"][uids[1]]["count"])
+        self.assertEqual(len(cells), 30)
+        self.assertEqual(sum(c["early_seconds"] for c in cells), details["early"][uids[0]]["total_seconds"])
+
+
+class AttendanceStoreTests(MonthFixtureTestCase):
+    """일별 근태(AttendanceDay)가 원천 변경에 맞춰 유지되고, 읽기 경로가 저장값을 쓰는지 확인."""
+
+    def assertRowsMatchReference(self, user):
+        rows = {r.record_day: r for r in AttendanceDay.objects.filter(user=user)}
+        for rd, module, m in self.reference_cells(user):
+            row = rows[rd]
+            self.assertEqual(row.module_id, module.id if module else None, rd)
+            self.assertEqual(
+                (row.late_seconds, row.early_seconds, row.overtime_seconds, row.holiday_seconds),
+                (m.late_seconds, m.early_seconds, m.overtime_seconds, m.holiday_seconds),
+                rd,
+            )
+            self.assertEqual(row.status_codes.split(","), m.status_codes, rd)
+
+    def test_rows_maintained_by_signals(self):
+        self.assertEqual(AttendanceDay.objects.count(), 2 * 30)
+        for user in self.users:
+            self.assertRowsMatchReference(user)
+
+    def test_work_delete_updates_day(self):
+        user = self.users[0]
+        rd = date(self.YEAR, self.MONTH, 1)  # 휴근(10:00~15:00), 출근 09:07:15, 퇴근 17:10
+        Work.objects.filter(user=user, record_day=rd, work_code="O").delete()
+
+        row = AttendanceDay.objects.get(user=user, record_day=rd)
+        self.assertIsNone(row.last_out_seconds)
+        self.assertEqual(row.checkout_seconds, 15 * 3600)  # 종업시각 보정
+        self.assertRowsMatchReference(user)
+
+    def test_work_moved_to_other_day_updates_both_days(self):
+        user = self.users[1]
+        work = Work.objects.get(user=user, record_day=date(self.YEAR, self.MONTH, 2), work_code="I")
+        work.record_date = datetime(self.YEAR, self.MONTH, 5, 8, 50)  # 5일은 기록 없던 날
+        work.save()
+
+        self.assertIsNone(AttendanceDay.objects.get(user=user, record_day=date(self.YEAR, self.MONTH, 2)).checkin_seconds)
+        self.assertEqual(
+            AttendanceDay.objects.get(user=user, record_day=date(self.YEAR, self.MONTH, 5)).checkin_seconds,
+            8 * 3600 + 50 * 60,
+        )
+        self.assertRowsMatchReference(user)
+
+    def test_module_edit_recomputes_rows(self):
+        self.regular.end_time = "17:00"
+        self.regular.mod_date = timezone.now()
+        self.regular.save()
+        for user in self.users:
+            self.assertRowsMatchReference(user)
+
+    def test_schedule_change_recomputes_month(self):
+        user = self.users[0]
+        schedule = Schedule.objects.get(user=user)
+        schedule.d1 = self.holiday
+        schedule.save()
+        self.assertEqual(AttendanceDay.objects.get(user=user, record_day=date(self.YEAR, self.MONTH, 1)).module_id, self.holiday.id)
+        self.assertRowsMatchReference(user)
+
+    def test_cube_reads_store_with_range_query(self):
+        uids = [u.id for u in self.users]
+        with self.assertNumQueries(2):
+            cube = build_month_attendance_cube(users=uids, year=self.YEAR, month=self.MONTH, branch=self.branch)
+        live = build_month_attendance_cube(
+            users=uids, year=self.YEAR, month=self.MONTH, branch=self.branch, from_store=False,
+        )
+        self.assertEqual(cube.summary(), live.summary())
+        for uid in uids:
+            self.assertEqual(cube.cells(uid), live.cells(uid))
+
+    def test_stale_rows_are_recomputed_on_read(self):
+        user = self.users[0]
+        rd = date(self.YEAR, self.MONTH, 3)
+        # 당일에 계산된 값(현재 시각 의존)은 다시 계산되어야 한다
+        AttendanceDay.objects.filter(user=user, record_day=rd).update(late_seconds=999, computed_on=rd)
+        AttendanceDay.objects.filter(user=user, record_day=date(self.YEAR, self.MONTH, 4)).delete()
+
+        details = build_monthly_metric_details_for_users(
+            users=[user.id], year=self.YEAR, month=self.MONTH, metric="late", branch=self.branch,
+        )
+        expected = {d: m.late_seconds for d, _, m in self.reference_cells(user)}
+        self.assertEqual(details[user.id]["days"], expected)
+
+        # 읽기 경로는 저장하지 않는다 (야간 확정 배치가 저장)
+        self.assertEqual(AttendanceDay.objects.get(user=user, record_day=rd).late_seconds, 999)
+        self.assertFalse(AttendanceDay.objects.filter(user=user, record_day=date(self.YEAR, self.MONTH, 4)).exists())
+        finalize_attendance(branch=self.branch)
+        self.assertEqual(AttendanceDay.objects.get(user=user, record_day=rd).late_seconds, expected[rd])
+
+    def test_current_month_read_does_not_write(self):
+        uids = [u.id for u in self.users]
+        now = datetime(self.YEAR, self.MONTH, 10, 12)  # 월 중간 낮: 10일이 오늘
+        refresh_attendance(branch=self.branch, year=self.YEAR, month=self.MONTH, user_ids=uids, now=now)
+        read_attendance_month(branch=self.branch, year=self.YEAR, month=self.MONTH, user_ids=uids, now=now)
+
+        # 저장 행 조회(1) + 오늘 셀 계산용 원천 Schedule/Module/Work(3) + Module(1), 쓰기 없음
+        with self.assertNumQueries(5), CaptureQueriesContext(connection) as ctx:
+            cells, metrics = read_attendance_month(
+                branch=self.branch, year=self.YEAR, month=self.MONTH, user_ids=uids, now=now,
+            )
+        self.assertFalse([q["sql"] for q in ctx.captured_queries if not q["sql"].startswith("SELECT")])
+
+        days, sched_map, modules, logs_map = prepare_month(uids, self.YEAR, self.MONTH, branch=self.branch)
+        live_cells, live_metrics = evaluate_month(uids, days, sched_map, modules, logs_map, now=now)
+        self.assertEqual(list(metrics.status_flags), list(live_metrics.status_flags))
+        self.assertEqual(list(metrics.late_seconds), list(live_metrics.late_seconds))
+        self.assertEqual(list(cells.checkout), list(live_cells.checkout))
+
+    def test_monthly_attendance_for_user_reads_store(self):
+        user = self.users[1]
+        with self.assertNumQueries(2):
+            result = build_monthly_attendance_for_user(user, self.YEAR, self.MONTH)
+
+        self.assertEqual(len(result), 30)
+        for item, (rd, module, m) in zip(result, self.reference_cells(user)):
+            self.assertEqual(item["record_day"], rd)
+            self.assertEqual(item["work_name"], module.name if module else None)
+            self.assertEqual(item["status_codes"], m.status_codes)
+            self.assertEqual(item["status"], m.status)
+            self.assertEqual(item["late_seconds"], m.late_seconds)
+            self.assertEqual(item["early_seconds"], m.early_seconds)
+
+    def test_rebuild_command_backfills(self):
+        AttendanceDay.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_attendance", "--branch", "A", "--from", "202511", stdout=out)
+        self.assertIn("202511", out.getvalue())
+        self.assertEqual(AttendanceDay.objects.count(), 2 * 30)
+        for user in self.users:
+            self.assertRowsMatchReference(user)
+
+
+class AttendanceRollupTests(MonthFixtureTestCase):
+    """월 집계(AttendanceMonth)가 일별 근태 변경에 맞춰 다시 만들어지고, 집계 화면이 이를 읽는지 확인."""
+
+    def live_summary(self, out_ymd_map=None):
+        return build_month_attendance_cube(
+            users=[u.id for u in self.users], year=self.YEAR, month=self.MONTH, branch=self.branch,
+            out_ymd_map=out_ymd_map, from_store=False,
+        ).summary()
+
+    def stored(self, user):
+        row = AttendanceMonth.objects.get(user=user, ym=f"{self.YEAR}{self.MONTH:02d}")
+        return {key: getattr(row, key) for key in SUMMARY_KEYS}
+
+    def test_rollups_built_for_closed_month(self):
+        live = self.live_summary()
+        self.assertEqual(AttendanceMonth.objects.count(), 2)
+        for user in self.users:
+            self.assertEqual(self.stored(user), live[user.id])
+
+    def test_rollup_rebuilt_when_day_changes(self):
+        user = self.users[0]
+        before = self.stored(user)
+        Work.objects.filter(user=user, record_day=date(self.YEAR, self.MONTH, 4), work_code="O").delete()  # 조퇴 → 보정
+
+        after = self.stored(user)
+        self.assertNotEqual(after, before)
+        self.assertEqual(after, self.live_summary()[user.id])
+        self.assertEqual(self.stored(self.users[1]), self.live_summary()[self.users[1].id])
+
+    def test_summary_reads_one_row_per_user(self):
+        uids = [u.id for u in self.users]
+        with self.assertNumQueries(1):
+            summary = build_monthly_attendance_summary_for_users(
+                users=uids, year=self.YEAR, month=self.MONTH, branch=self.branch,
+            )
+        self.assertEqual(summary, self.live_summary())
+
+    def test_out_date_cutoff_mismatch_rebuilds_rollup(self):
+        user = self.users[0]
+        out_ymd_map = {user.id: f"{self.YEAR}{self.MONTH:02d}10"}
+        summary = build_monthly_attendance_summary_for_users(
+            users=[u.id for u in self.users], year=self.YEAR, month=self.MONTH, branch=self.branch,
+            out_ymd_map=out_ymd_map,
+        )
+        self.assertEqual(summary, self.live_summary(out_ymd_map))
+        self.assertEqual(AttendanceMonth.objects.get(user=user).cutoff_day, 10)
+
+    def test_period_summary_sums_monthly_rows(self):
+        uids = [u.id for u in self.users]
+        with self.assertNumQueries(1):
+            period = build_attendance_summary_for_period(
+                users=uids, start_ym="202511", end_ym="202511", branch=self.branch,
+            )
+        self.assertEqual(period, self.live_summary())
+
+        # 근무표/기록이 없는 달은 0으로 집계되어 합계가 같다
+        period = build_attendance_summary_for_period(
+            users=uids, start_ym="202501", end_ym="202512", branch=self.branch,
+        )
+        self.assertEqual(period, self.live_summary())
+        self.assertEqual(AttendanceMonth.objects.filter(user_id=uids[0]).count(), 12)
+
+
+class SyntheticDataTests(TestCase):
+    """합성 데이터 생성기와 벤치마크 러너가 작은 규모에서 동작하는지 확인."""
+
+    def test_generate_command_builds_consistent_branch(self):
+        out = StringIO()
+        call_command(
+            "generate_attendance_data", "--employees", "4", "--from", "202510", "--to", "202511",
+            "--prefix", "synth", stdout=out,
+        )
+        branch = Branch.objects.get(code="synth01")
+        users = User.objects.filter(branch=branch, is_employee=True)
+        self.assertEqual(users.count(), 4)
+        self.assertEqual(Contract.objects.filter(branch=branch).count(), 4)
+        self.assertEqual(Schedule.objects.filter(branch=branch).count(), 8)
+        self.assertTrue(Work.objects.filter(branch=branch, record_day__month=11).exists())
+        # 일별 근태는 생성 직후 모두 채워져 있다 (10월 31일 + 11월 30일) × 4명
+        self.assertEqual(AttendanceDay.objects.filter(branch=branch).count(), 61 * 4)
+
+        with self.assertRaises(CommandError):
+            call_command("generate_attendance_data", "--prefix", "synth", stdout=StringIO())
+
+    def test_bench_pipeline_reports_cases_and_rolls_back(self):
+        result = bench_pipeline(scales=[3], year=2025, month=11, repeat=1)
+        cases = result[0]["cases"]
+        self.assertEqual(result[0]["employees"], 3)
+        for name in ("prepare_month", "build_monthly_attendance_for_user", "build_monthly_attendance_summary_for_users"):
+            self.assertEqual(set(cases[name]), {"wall_ms_min", "wall_ms_median", "queries", "peak_kb"})
+        self.assertEqual(cases["prepare_month"]["queries"], 3)
+        self.assertTrue(result[0]["punch_plan"]["uses_index"])
+        self.assertFalse(Branch.objects.filter(code="bench3").exists())
+
+
+class StreamingTests(MonthFixtureTestCase):
+    """스트리밍(사용자 단위) 평가/저장이 한 번에 계산한 결과와 같은지 확인."""
+
+    def setUp(self):
+        # 같은 날 중복 기록: 최초 출근/최종 퇴근만 반영되어야 한다
+        user = self.users[0]
+        Work.objects.create(user=user, work_code="I", record_date=datetime(2025, 11, 4, 13, 0), branch=self.branch)
+        Work.objects.create(user=user, work_code="O", record_date=datetime(2025, 11, 4, 10, 0), branch=self.branch)
+
+    def test_stream_matches_month_evaluation(self):
+        uids = [u.id for u in self.users]
+        now = timezone.now()
+        days, sched_map, modules, logs_map = prepare_month(uids, self.YEAR, self.MONTH, branch=self.branch)
+        cells, metrics = evaluate_month(uids, days, sched_map, modules, logs_map, now=now)
+
+        with self.assertNumQueries(1 + 2 * len(uids)):
+            streamed = list(stream_window(
+                uids, *month_range(self.YEAR, self.MONTH), branch=self.branch, now=now, user_chunk=1,
+            ))
+        self.assertEqual([uid for uid, _, _ in streamed], uids)
+        n = len(days)
+        for pos, (uid, user_cells, user_metrics) in enumerate(streamed):
+            span = slice(pos * n, (pos + 1) * n)
+            self.assertEqual(list(user_cells.checkin), list(cells.checkin[span]))
+            self.assertEqual(list(user_cells.checkout), list(cells.checkout[span]))
+            self.assertEqual(list(user_metrics.late_seconds), list(metrics.late_seconds[span]))
+            self.assertEqual(list(user_metrics.status_flags), list(metrics.status_flags[span]))
+
+    def test_stream_refresh_matches_refresh(self):
+        def snapshot():
+            days = AttendanceDay.objects.order_by("user_id", "record_day").values_list(
+                "user_id", "record_day", "module_id", "checkin_seconds", "last_out_seconds", "checkout_seconds",
+                "late_seconds", "early_seconds", "overtime_seconds", "holiday_seconds", "status_codes",
+            )
+            months = AttendanceMonth.objects.order_by("user_id").values(*SUMMARY_KEYS, "user_id", "ym", "cutoff_day")
+            return list(days), list(months)
+
+        uids = [u.id for u in self.users]
+        refresh_attendance(branch=self.branch, year=self.YEAR, month=self.MONTH, user_ids=uids)
+        expected = snapshot()
+        self.assertTrue(expected[1])  # 지난 달이라 월 집계도 저장됨
+
+        AttendanceDay.objects.all().delete()
+        AttendanceMonth.objects.all().delete()
+        written = refresh_attendance_stream(
+            branch=self.branch, year=self.YEAR, month=self.MONTH, user_ids=uids, user_chunk=1,
+        )
+        self.assertEqual(written, 30 * len(uids))
+        self.assertEqual(snapshot(), expected)
+
+
+class RequestLoaderTests(MonthFixtureTestCase):
+    """요청 단위 로더: 같은 요청 안의 반복 조회 공유, 저장 시 무효화."""
+
+    def test_repeated_lookups_hit_loader(self):
+        uids = [u.id for u in self.users]
+        with request_scope() as loader:
+            expected = prepare_month(uids, self.YEAR, self.MONTH, branch=self.branch)
+            holidays = get_non_business_days(self.YEAR, self.MONTH, branch=self.branch)
+            with self.assertNumQueries(0):
+                self.assertIs(prepare_month(uids, self.YEAR, self.MONTH, branch=self.branch), expected)
+                self.assertEqual(get_non_business_days(self.YEAR, self.MONTH, branch=self.branch), holidays)
+            self.assertEqual(loader.hits, 2)
+
+        # 로더 밖에서는 매번 조회
+        with self.assertNumQueries(3):
+            prepare_month(uids, self.YEAR, self.MONTH, branch=self.branch)
+
+    def test_write_clears_loader(self):
+        uids = [u.id for u in self.users]
+        with request_scope():
+            _, _, _, before = prepare_month(uids, self.YEAR, self.MONTH, branch=self.branch)
+            Work.objects.create(
+                user=self.users[0], work_code="I", record_date=datetime(2025, 11, 5, 8, 0), branch=self.branch,
+            )
+            _, _, _, after = prepare_month(uids, self.YEAR, self.MONTH, branch=self.branch)
+        self.assertNotIn(date(2025, 11, 5), before[uids[0]])
+        self.assertEqual(after[uids[0]][date(2025, 11, 5)]["I"], [datetime(2025, 11, 5, 8, 0)])
+
+    def test_middleware_scopes_safe_methods_only(self):
+        seen = []
+
+        def view(request):
+            seen.append((getattr(request, "loader", None), current_loader()))
+            return HttpResponse()
+
+        middleware = RequestLoaderMiddleware(view)
+        factory = RequestFactory()
+        middleware(factory.get("/"))
+        middleware(factory.post("/"))
+        (get_loader, get_current), (post_loader, post_current) = seen
+        self.assertIsNotNone(get_loader)
+        self.assertIs(get_current, get_loader)
+        self.assertIsNone(post_loader)
+        self.assertIsNone(post_current)
+        self.assertIsNone(current_loader())
+
+
+class MonthCloseTests(MonthFixtureTestCase):
+    """월 마감 배치: 단위별 저장, 상태 파일로 이어서 실행."""
+
+    def setUp(self):
+        AttendanceDay.objects.all().delete()
+        AttendanceMonth.objects.all().delete()
+        tmp = tempfile.NamedTemporaryFile(suffix=".json", delete=False)
+        tmp.close()
+        os.unlink(tmp.name)
+        self.state_path = tmp.name
+        self.addCleanup(lambda: os.path.exists(self.state_path) and os.unlink(self.state_path))
+
+    def close(self, *extra):
+        out = StringIO()
+        call_command(
+            "close_attendance_month", "--branch", "A", "--from", "202510", "--to", "202511",
+            "--workers", "1", "--state", self.state_path, *extra, stdout=out,
+        )
+        return out.getvalue()
+
+    def test_close_writes_units_and_state(self):
+        output = self.close()
+        self.assertIn("A:202511: 사용자 2명, 60행", output)
+        self.assertIn("A:202510: 사용자 0명, 0행", output)
+        self.assertEqual(AttendanceDay.objects.count(), 2 * 30)
+        self.assertEqual(AttendanceMonth.objects.filter(ym="202511").count(), 2)
+
+        with open(self.state_path, encoding="utf-8") as f:
+            units = json.load(f)["units"]
+        self.assertEqual(set(units), {"A:202510", "A:202511"})
+        self.assertEqual(units["A:202511"]["rows"], 60)
+        self.assertGreaterEqual(units["A:202511"]["ms"], 0)
+
+    def test_resume_skips_finished_units(self):
+        self.close()
+        AttendanceDay.objects.all().delete()
+
+        output = self.close("--resume")
+        self.assertIn("대상 2단위 (건너뜀 2)", output)
+        self.assertFalse(AttendanceDay.objects.exists())
+
+        # --resume 없이 실행하면 처음부터 다시
+        self.close()
+        self.assertEqual(AttendanceDay.objects.count(), 2 * 30)
+
+    def test_resume_requires_state(self):
+        with self.assertRaises(CommandError):
+            call_command("close_attendance_month", "--resume", stdout=StringIO())
+
+    def failing_october(self, *, branch, year, month):
+        if (year, month) == (2025, 10):
+            raise RuntimeError("boom")
+        return month_user_ids(branch=branch, year=year, month=month)
+
+    def test_failed_unit_does_not_stop_others(self):
+        with patch("wtm.services.month_close.month_user_ids", side_effect=self.failing_october):
+            with self.assertRaisesMessage(CommandError, "실패 1단위: A:202510"):
+                self.close()
+
+        with open(self.state_path, encoding="utf-8") as f:
+            state = json.load(f)
+        self.assertEqual(set(state["units"]), {"A:202511"})
+        self.assertEqual(state["failed"], {"A:202510": "RuntimeError: boom"})
+
+        # 다시 실행하면 실패한 단위만 돈다
+        output = self.close("--resume")
+        self.assertIn("대상 2단위 (건너뜀 1)", output)
+        with open(self.state_path, encoding="utf-8") as f:
+            state = json.load(f)
+        self.assertEqual((set(state["units"]), state["failed"]), ({"A:202510", "A:202511"}, {}))
+
+    def test_process_pool_runs_units_in_workers(self):
+        out, err = StringIO(), StringIO()
+        with patch("wtm.services.month_close.month_user_ids", side_effect=self.failing_october):
+            with self.assertRaises(CommandError):
+                call_command(
+                    "close_attendance_month", "--branch", "A", "--from", "202509", "--to", "202511",
+                    "--workers", "2", "--state", self.state_path, stdout=out, stderr=err,
+                )
+        self.assertIn("A:202510: 실패 - RuntimeError: boom", err.getvalue())
+        self.assertIn("완료: 2단위", out.getvalue())
+
+        with open(self.state_path, encoding="utf-8") as f:
+            state = json.load(f)
+        self.assertEqual(set(state["units"]), {"A:202509", "A:202511"})
+        self.assertEqual(state["units"]["A:202511"]["rows"], 60)
+        self.assertNotIn(os.getpid(), {unit["pid"] for unit in state["units"].values()})
+
+    def test_invalid_ym_is_command_error(self):
+        for command in ("close_attendance_month", "rebuild_attendance", "generate_attendance_data"):
+            with self.assertRaisesMessage(CommandError, "YYYYMM 형식이 아닙니다: 202513"):
+                call_command(command, "--from", "202513", stdout=StringIO())
+
+
+class FinalizationTests(MonthFixtureTestCase):
+    """퇴근 보정 확정: 출처 저장, 야간 확정 배치, 지난 일자 화면의 확정값 사용."""
+
+    def setUp(self):
+        # 1일 직원0: 휴근(10:00~15:00) 출근만 남김 → 종업시각 보정
+        Work.objects.filter(user=self.users[0], record_day=date(2025, 11, 1), work_code="O").delete()
+
+    def test_checkout_source(self):
+        row = lambda d: AttendanceDay.objects.get(user=self.users[0], record_day=date(2025, 11, d))
+        self.assertEqual(row(1).checkout_source, AttendanceDay.CheckoutSource.INFERRED)
+        self.assertEqual(row(1).checkout_seconds, 15 * 3600)
+        self.assertEqual(row(2).checkout_source, AttendanceDay.CheckoutSource.REAL)
+        self.assertEqual(row(5).checkout_source, AttendanceDay.CheckoutSource.NONE)  # 기록 없음
+
+    def test_finalize_recomputes_pending_rows_once(self):
+        uids = [u.id for u in self.users]
+        expected = list(AttendanceDay.objects.order_by("user_id", "record_day").values_list(
+            "user_id", "record_day", "checkout_seconds", "checkout_source", "status_codes",
+        ))
+        # 월 중간(11/10 낮)에 계산된 상태로 되돌림 → 10일 이후 행은 미확정, 퇴근 보정 없음
+        refresh_attendance(branch=self.branch, year=2025, month=11, user_ids=uids, now=datetime(2025, 11, 10, 12))
+        today = timezone.now().date()
+        self.assertEqual(pending_finalization(branch=self.branch, today=today).count(), 21 * len(uids))
+
+        self.assertEqual(finalize_attendance(branch=self.branch), 21 * len(uids))
+        self.assertFalse(pending_finalization(branch=self.branch, today=today).exists())
+        actual = list(AttendanceDay.objects.order_by("user_id", "record_day").values_list(
+            "user_id", "record_day", "checkout_seconds", "checkout_source", "status_codes",
+        ))
+        self.assertEqual(actual, expected)
+
+        out = StringIO()
+        call_command("finalize_attendance", "--branch", "A", stdout=out)
+        self.assertIn("A: 0행 확정", out.getvalue())
+
+    def test_daily_view_reads_finalized_rows(self):
+        day = date(2025, 11, 1)
+        base_rows = []
+        for user in self.users:
+            module = Schedule.objects.get(user=user).d1
+            base_rows.append({
+                "user_id": user.id, "dept": "D", "position": "P", "emp_name": user.emp_name,
+                "module_id": module.id, "cat": module.cat, "name": module.name,
+                "start_time": module.start_time, "end_time": module.end_time,
+                "rest1_start_time": module.rest1_start_time, "rest1_end_time": module.rest1_end_time,
+                "rest2_start_time": module.rest2_start_time, "rest2_end_time": module.rest2_end_time,
+            })
+
+        with self.assertNumQueries(1):
+            frozen = build_daily_attendance_for_users(base_rows, day, branch=self.branch)
+        self.assertEqual(frozen[0]["checkout_time"], "15:00:00")
+        self.assertTrue(frozen[0]["is_checkout_inferred"])
+        self.assertFalse(frozen[1]["is_checkout_inferred"])
+
+        # 확정 행이 없으면 근태기록으로 계산 (같은 결과)
+        AttendanceDay.objects.all().delete()
+        self.assertEqual(build_daily_attendance_for_users(base_rows, day, branch=self.branch), frozen)
+
+
+class WorkStatusExcelTests(MonthFixtureTestCase):
+    """근태기록 엑셀: 월 근태 큐브를 한 번만 만들고 모든 시트(월간집계 포함)가 같은 큐브를 읽는다."""
+
+    def test_month_computed_once(self):
+        base_users = [
+            {"user_id": u.id, "dept": u.dept, "position": u.position, "emp_name": u.emp_name, "out_ymd": None}
+            for u in self.users
+        ]
+        request = RequestFactory().get("/wtm/status/excel/202511")
+        request.user, request.branch = self.admin, self.branch
+        with patch("wtm.views.helpers.fetch_base_users_for_month", return_value=base_users), \
+                patch("wtm.views.stat.schedule_excel_data", return_value={}), \
+                patch("wtm.views.stat.write_schedule_sheet"), \
+                patch("wtm.services.attendance_store.read_attendance_month", wraps=read_attendance_month) as read, \
+                patch("wtm.views.stat.build_monthly_attendance_summary_for_users") as summary, \
+                CaptureQueriesContext(connection) as ctx:
+            response = work_status_excel(request, "202511")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(read.call_count, 1)
+        summary.assert_not_called()
+        # 일별 근태 범위 조회(1) + Module(1) + 미영업일 Holiday/Business(2), 월 집계/쓰기 없음
+        self.assertEqual(len(ctx.captured_queries), 4, [q["sql"] for q in ctx.captured_queries])
+        self.assertFalse([q["sql"] for q in ctx.captured_queries if not q["sql"].startswith("SELECT")])
+
+
+class ModuleUsageTests(MonthFixtureTestCase):
+    """근로모듈 역인덱스: 근무표 저장 시 유지, 근로모듈 수정 시 사용 셀만 재계산."""
+
+    def scan(self, module):
+        # 역인덱스 없이 근무표 d1~d31을 직접 훑은 결과
+        cells = {}
+        for schedule in Schedule.objects.all():
+            days = [d for d in range(1, 32) if getattr(schedule, f"d{d}_id") == module.id]
+            if days:
+                cells.setdefault((int(schedule.year), int(schedule.month)), {})[schedule.user_id] = days
+        return cells
+
+    def usage(self, module):
+        return {
+            ym: {uid: days_of(mask) for uid, mask in masks.items()}
+            for ym, masks in affected_cells(module.id).items()
+        }
+
+    def test_index_follows_schedule_saves(self):
+        for module in (self.regular, self.holiday, self.nopay):
+            self.assertEqual(self.usage(module), self.scan(module))
+
+        schedule = Schedule.objects.get(user=self.users[0])
+        schedule.d1 = self.nopay
+        schedule.d4 = self.regular
+        schedule.save()
+        for module in (self.regular, self.holiday, self.nopay):
+            self.assertEqual(self.usage(module), self.scan(module))
+
+        schedule.delete()
+        self.assertFalse(ModuleUsage.objects.filter(user=self.users[0]).exists())
+
+    def test_rebuild_matches_incremental(self):
+        expected = sorted(ModuleUsage.objects.values_list("schedule_id", "module_id", "days"))
+        ModuleUsage.objects.all().delete()
+        self.assertEqual(rebuild_module_usage(branch=self.branch), len(expected))
+        self.assertEqual(sorted(ModuleUsage.objects.values_list("schedule_id", "module_id", "days")), expected)
+
+    def test_module_edit_refreshes_only_used_cells(self):
+        used = sum(len(days) for by_user in self.scan(self.holiday).values() for days in by_user.values())
+        with patch("wtm.services.attendance_store.refresh_attendance", wraps=refresh_attendance) as refresh:
+            self.holiday.end_time = "16:00"
+            self.holiday.mod_date = timezone.now()
+            self.holiday.save()
+        refreshed = sum(len(call.kwargs["user_ids"]) * len(call.kwargs["days"]) for call in refresh.call_args_list)
+        self.assertEqual(refreshed, used)
+
+        # 근태 계산과 무관한 필드만 바뀌면 다시 계산하지 않음
+        with patch("wtm.services.attendance_store.refresh_attendance") as refresh:
+            self.holiday.color = 9
+            self.holiday.save()
+        refresh.assert_not_called()
+
+
+class SqlSummaryEngineTests(TestCase):
+    """SQL 집계 엔진이 파이썬 엔진(배치 평가 → 큐브 집계)과 같은 월간집계를 내는지 확인."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = Branch.objects.create(code="S", name="Branch S")
+        admin = User.objects.create_user(
+            username="sql_admin", password="pw", emp_name="관리자", dept="D", position="P",
+            join_date=date(2024, 1, 1), branch=cls.branch,
+        )
+        now = timezone.now()
+        stamp = dict(reg_id=admin, reg_date=now, mod_id=admin, mod_date=now, branch=cls.branch)
+        palette = [
+            ("소정근로", "09:00", "18:00", ("12:00", "13:00"), ("15:00", "15:10")),
+            ("소정근로", "13:00", "22:00", ("17:00", "17:30"), ("-", "-")),
+            ("휴일근로", "10:00", "15:00", ("12:00", "12:30"), ("-", "-")),
+            ("OFF", "-", "-", ("-", "-"), ("-", "-")),
+            ("유급휴무", "-", "-", ("-", "-"), ("-", "-")),
+            ("무급휴무", "-", "-", ("-", "-"), ("-", "-")),
+        ]
+        modules = [
+            Module.objects.create(
+                cat=cat, name=f"m{n}", start_time=st, end_time=et,
+                rest1_start_time=r1[0], rest1_end_time=r1[1], rest2_start_time=r2[0], rest2_end_time=r2[1],
+                color=n, **stamp,
+            )
+            for n, (cat, st, et, r1, r2) in enumerate(palette, 1)
+        ]
+
+        rng = Random(20251218)
+        today = now.date()
+        cls.months = [(2025, 10), (today.year, today.month)]
+        cls.users = []
+        for n in range(6):
+            user = User.objects.create_user(
+                username=f"sql_u{n}", password="pw", emp_name=f"직원{n}", dept="D", position="P",
+                join_date=date(2024, 1, 1), branch=cls.branch,
+            )
+            cls.users.append(user)
+            for year, month in cls.months:
+                schedule = Schedule(user=user, year=f"{year:04d}", month=f"{month:02d}", **stamp)
+                for d in range(1, monthrange(year, month)[1] + 1):
+                    module = rng.choice(modules + [None])
+                    setattr(schedule, f"d{d}", module)
+                    roll = rng.random()
+                    if roll < 0.15:
+                        continue  # 기록 없음
+                    base = datetime(year, month, d, 8, 0) + timedelta(seconds=rng.randrange(0, 14 * 3600))
+                    if module is not None and module.end_time != "-" and roll < 0.25:
+                        # 종업시각과 같은 출근 (마이크로초 유무로 보정 여부가 갈림)
+                        h, m = map(int, module.end_time.split(":"))
+                        base = datetime(year, month, d, h, m, 0, rng.choice((0, 1)))
+                    if roll > 0.3:
+                        Work.objects.create(user=user, work_code="I", record_date=base, branch=cls.branch)
+                    if roll > 0.5 or roll < 0.3:
+                        checkout = base + timedelta(seconds=rng.randrange(0, 12 * 3600))
+                        if checkout.date() == base.date():
+                            Work.objects.create(user=user, work_code="O", record_date=checkout, branch=cls.branch)
+                schedule.save()
+
+    def test_matches_python_engine(self):
+        uids = [u.id for u in self.users]
+        for year, month in self.months:
+            out_ymd_map = {uids[0]: f"{year:04d}{month:02d}10", uids[1]: "20240101"}
+            expected = build_month_attendance_cube(
+                users=uids, year=year, month=month, branch=self.branch, out_ymd_map=out_ymd_map, from_store=False,
+            ).summary()
+            with self.assertNumQueries(2):
+                actual = summary_sql(
+                    users=uids, year=year, month=month, branch=self.branch, out_ymd_map=out_ymd_map,
+                )
+            self.assertEqual(actual, expected, (year, month))
+            self.assertTrue(any(s["error_count"] for s in actual.values()))
+            self.assertTrue(any(s["hol_work_count"] for s in actual.values()))
+
+    def test_selectable_per_call(self):
+        uids = [u.id for u in self.users]
+        store = build_monthly_attendance_summary_for_users(users=uids, year=2025, month=10, branch=self.branch)
+        sql = build_monthly_attendance_summary_for_users(
+            users=uids, year=2025, month=10, branch=self.branch, engine="sql",
+        )
+        self.assertEqual(sql, store)
+        self.assertEqual(list(sql[uids[0]]), list(SUMMARY_KEYS))
+        with self.assertRaises(ValueError):
+            build_monthly_attendance_summary_for_users(users=uids, year=2025, month=10, branch=self.branch, engine="x")
+
+
+class ModuleMinuteTests(MonthFixtureTestCase):
+    """근로모듈 분 컬럼: 저장 시 *_time과 동기화, 엔진은 문자열 파싱 없이 분 컬럼 사용."""
+
+    def test_minutes_follow_time_fields(self):
+        self.assertEqual((self.regular.start_min, self.regular.end_min), (540, 1080))
+        self.assertEqual((self.regular.rest1_start_min, self.regular.rest1_end_min), (720, 780))
+        self.assertIsNone(self.regular.rest2_start_min)
+        self.assertIsNone(self.nopay.start_min)
+
+        self.regular.end_time = "19:30"
+        self.regular.save(update_fields=["end_time"])
+        self.regular.refresh_from_db()
+        self.assertEqual(self.regular.end_min, 1170)
+
+        self.regular.rest1_start_time = "-"
+        self.regular.save()
+        self.regular.refresh_from_db()
+        self.assertIsNone(self.regular.rest1_start_min)
+
+    def test_engine_matches_string_parsing(self):
+        clear_compiled_modules()
+        for module in (self.regular, self.holiday, self.nopay):
+            loose = fake_module(**{f: getattr(module, f) for f in Module.MINUTE_FIELDS}, cat=module.cat)
+            self.assertEqual(compile_module(module).paid, compile_module(loose).paid)
+
+        # 분 컬럼이 있으면 문자열은 다시 읽지 않는다
+        module = Module.objects.get(pk=self.regular.pk)
+        module.start_time = "xx"
+        clear_compiled_modules()
+        self.assertEqual(compile_module(module).paid, compile_module(fake_module()).paid)
+
+
+class CoverageTests(MonthFixtureTestCase):
+    """시간대별 근무 인원: 근로모듈 칸 비트마스크 합산."""
+
+    def slots_of(self, mask):
+        return [s for s in range(SLOTS) if mask >> s & 1]
+
+    def test_slot_mask(self):
+        # 09:00~18:00, 휴게 12:00~13:00 → 18~23, 26~35번 칸
+        self.assertEqual(self.slots_of(slot_mask(self.regular)), [*range(18, 24), *range(26, 36)])
+        self.assertEqual(self.slots_of(slot_mask(self.holiday)), list(range(20, 30)))
+        self.assertEqual(slot_mask(self.nopay), 0)
+        self.assertEqual(slot_mask(None), 0)
+        # 휴무 구분은 시각이 있어도 인원에서 제외, 30분에 걸친 칸은 포함
+        self.assertEqual(slot_mask(fake_module(cat="유급휴무")), 0)
+        self.assertEqual(
+            self.slots_of(slot_mask(fake_module(start_time="09:10", end_time="10:00", rest1_start_time="-"))), [18, 19],
+        )
+
+    def test_matches_per_user_scan(self):
+        groups = {self.users[0].id: "간호", self.users[1].id: "원무"}
+        with self.assertNumQueries(2):
+            coverage = build_coverage(groups=groups, year=self.YEAR, month=self.MONTH, branch=self.branch)
+        self.assertEqual(list(coverage.groups), ["간호", "원무"])
+
+        expected = {name: [[0] * SLOTS for _ in range(30)] for name in coverage.groups}
+        total = [[0] * SLOTS for _ in range(30)]
+        for user in self.users:
+            schedule = Schedule.objects.get(user=user)
+            for d in range(1, 31):
+                for s in self.slots_of(slot_mask(getattr(schedule, f"d{d}"))):
+                    expected[groups[user.id]][d - 1][s] += 1
+                    total[d - 1][s] += 1
+        self.assertEqual((coverage.groups, coverage.total), (expected, total))
+
+        # 퇴사일 다음 날부터는 세지 않음
+        cut = build_coverage(
+            groups=groups, year=self.YEAR, month=self.MONTH, branch=self.branch,
+            out_ymd_map={self.users[0].id: "20251110"},
+        )
+        self.assertEqual(cut.groups["간호"][:10], expected["간호"][:10])
+        self.assertFalse(any(any(day) for day in cut.groups["간호"][10:]))
+
+    def test_dept_named_like_total_stays_separate(self):
+        groups = {self.users[0].id: "전체", self.users[1].id: "원무"}
+        coverage = build_coverage(groups=groups, year=self.YEAR, month=self.MONTH, branch=self.branch)
+        self.assertEqual(list(coverage.groups), ["전체", "원무"])
+        self.assertEqual(
+            coverage.total,
+            [[a + b for a, b in zip(*day)] for day in zip(coverage.groups["전체"], coverage.groups["원무"])],
+        )
+
+    def test_total_row_label_comes_from_template(self):
+        request = RequestFactory().get("/wtm/coverage/202511", {"day": "2"})
+        request.user, request.branch = self.admin, self.branch
+        request._messages = CookieStorage(request)
+        # 부서 이름이 '전체'여도 합계 행과 따로 나온다
+        base_users = [
+            {"user_id": u.id, "dept": dept, "out_ymd": None} for u, dept in zip(self.users, ("전체", "원무"))
+        ]
+        with patch("wtm.views.coverage.fetch_base_users_for_month", return_value=base_users):
+            response = work_coverage(request, "202511")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content.decode().count('<td class="text-nowrap">전체</td>'), 2)
+
+    def test_json_endpoint(self):
+        request = RequestFactory().get("/wtm/coverage/json/", {"day": "2"})
+        request.user, request.branch = self.admin, self.branch
+        # 대상자 조회는 MySQL 전용 SQL
+        base_users = [
+            {"user_id": u.id, "dept": u.dept, "position": u.position, "emp_name": u.emp_name, "out_ymd": None}
+            for u in self.users
+        ]
+        with patch("wtm.views.coverage.fetch_base_users_for_month", return_value=base_users):
+            response = work_coverage_json(request, "202511")
+        payload = json.loads(response.content)
+        self.assertEqual(payload["slot_minutes"], 30)
+        self.assertEqual(len(payload["slots"]), SLOTS)
+        self.assertEqual(payload["day"], 2)
+        self.assertEqual(payload["total"], build_coverage(
+            groups={u.id: u.dept for u in self.users}, year=2025, month=11, branch=self.branch,
+        ).total[1])
+
+
+class ContractTimelineTests(MonthFixtureTestCase):
+    """근무표 작성/수정의 근로계약 조회: 1회 조회 후 bisect, 직원 수와 무관한 쿼리 수."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        now = timezone.now()
+        stamp = dict(reg_id=cls.admin, reg_date=now, mod_id=cls.admin, mod_date=now, branch=cls.branch)
+        week = dict(mon=cls.regular, tue=cls.regular, wed=cls.regular, thu=cls.regular, fri=cls.regular)
+        for user, stand_dates in zip(cls.users, ([date(2025, 1, 1), date(2025, 11, 15)], [date(2025, 11, 20)])):
+            for n, stand_date in enumerate(stand_dates):
+                Contract.objects.create(
+                    user=user, stand_date=stand_date, type="정규", check_yn="Y",
+                    sat=(cls.holiday, cls.nopay)[n], sun=cls.nopay, **week, **stamp,
+                )
+
+    def per_cell(self, user_id, day):
+        # 기존 방식: 셀마다 Contract 조회
+        field = ContractTimeline.WEEKDAY_FIELDS[day.weekday()]
+        return (
+            Contract.objects.filter(user_id=user_id, branch=self.branch, stand_date__lte=day)
+            .order_by("-stand_date").values_list(field, flat=True).first()
+        )
+
+    def test_matches_per_cell_lookup(self):
+        uids = [u.id for u in self.users]
+        with self.assertNumQueries(1):
+            timeline = ContractTimeline.load(uids, date(2025, 12, 7), branch=self.branch)
+        for uid in uids:
+            for d in range(1, 31):
+                day = date(2025, 11, d)
+                self.assertEqual(timeline.module_id(uid, day), self.per_cell(uid, day), (uid, day))
+        self.assertIsNone(timeline.module_id(uids[1], date(2025, 11, 19)))
+        self.assertIsNone(ContractTimeline().module_id(uids[0], date(2025, 11, 1)))
+
+    def test_grid_queries_do_not_grow_with_users(self):
+        user_list = [
+            {"id": u.id, "join_date": "20240101", "out_date": "20251205" if n else None}
+            for n, u in enumerate(self.users)
+        ]
+        timeline = ContractTimeline.load([u["id"] for u in user_list], date(2025, 12, 7), branch=self.branch)
+        cells = _contract_cells(user_list[0], "202511", [str(d) for d in range(1, 31)], [3], 99, timeline)
+        self.assertEqual(cells["3"], 99)
+        self.assertEqual(cells["15"], self.nopay.id)  # 2025-11-15(토): 두 번째 계약
+        self.assertEqual(cells["8"], self.holiday.id)  # 2025-11-08(토): 첫 번째 계약
+
+        # 다음달 근무표가 있는 직원은 근무표에서, 없는 직원은 계약에서 (근무표 조회 1회)
+        Schedule.objects.create(
+            user=self.users[0], year="2025", month="12", d1=self.holiday, branch=self.branch,
+            reg_id=self.admin, reg_date=timezone.now(), mod_id=self.admin, mod_date=timezone.now(),
+        )
+        next_days = {str(d): "" for d in range(1, 8)}
+        with self.assertNumQueries(1):
+            _fill_next_month(user_list, "202512", next_days, [], None, timeline, branch=self.branch)
+        self.assertEqual(user_list[0]["n1"], self.holiday.id)
+        self.assertIsNone(user_list[0]["n2"])
+        self.assertEqual(user_list[1]["n1"], self.regular.id)  # 2025-12-01(월)
+        self.assertIsNone(user_list[1]["n6"])  # 최종근로일 이후
+
+
+class ScheduleSaveTests(MonthFixtureTestCase):
+    """근무표 그리드 저장: 바뀐 셀만 bulk 저장 + 시그널이 하던 갱신을 직접 수행."""
+
+    def attendance(self):
+        return sorted(
+            AttendanceDay.objects.filter(branch=self.branch)
+            .values_list("user_id", "record_day", "module_id", "checkout_seconds", "status_codes", "late_seconds")
+        )
+
+    def usage(self):
+        return sorted(ModuleUsage.objects.values_list("schedule_id", "module_id", "days"))
+
+    def assert_derived_state_fresh(self):
+        # 역인덱스 / 일별 근태가 전체 재생성 결과와 같아야 한다
+        attendance, usage = self.attendance(), self.usage()
+        rebuild_module_usage()
+        refresh_attendance(branch=self.branch, year=self.YEAR, month=self.MONTH, user_ids=[u.id for u in self.users])
+        self.assertEqual(usage, self.usage())
+        self.assertEqual(attendance, self.attendance())
+
+    def test_only_changed_cells_are_written(self):
+        refresh_attendance(branch=self.branch, year=self.YEAR, month=self.MONTH, user_ids=[u.id for u in self.users])
+        grid = {
+            u.id: {d: getattr(s, f"d{d}_id") for d in range(1, 31)}
+            for u in self.users for s in [Schedule.objects.get(user=u)]
+        }
+        grid[self.users[0].id][4] = self.nopay.id
+        grid[self.users[1].id][4] = self.nopay.id
+        grid[self.users[1].id][9] = None
+
+        with self.captureOnCommitCallbacks() as callbacks, CaptureQueriesContext(connection) as ctx:
+            result = save_schedule_grid(
+                branch=self.branch, year=str(self.YEAR), month=f"{self.MONTH:02d}", grid=grid, actor=self.admin,
+            )
+        self.assertEqual((result.created, result.updated, result.cells), (0, 2, 3))
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('UPDATE "wtm_schedule"')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"d1_id"', updates[0])
+        self.assertEqual(Schedule.objects.get(user=self.users[1]).d9_id, None)
+
+        # 쓰기 트랜잭션에는 근무표만: 역인덱스/근태 재계산/캐시 무효화는 커밋 뒤
+        written = " ".join(q["sql"] for q in ctx.captured_queries)
+        for table in ("wtm_attendanceday", "wtm_moduleusage", "wtm_schedulegridversion"):
+            self.assertNotIn(f'"{table}"', written)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assert_derived_state_fresh()
+
+        # 같은 그리드를 다시 저장하면 조회 1회로 끝
+        with self.assertNumQueries(1):
+            again = save_schedule_grid(
+                branch=self.branch, year=str(self.YEAR), month=f"{self.MONTH:02d}", grid=grid, actor=self.admin,
+            )
+        self.assertEqual(again.cells, 0)
+
+    def test_new_rows_are_created_with_usage(self):
+        grid = {u.id: {1: self.regular.id, 2: None, 3: self.holiday.id} for u in self.users}
+        with self.captureOnCommitCallbacks(execute=True):
+            result = save_schedule_grid(branch=self.branch, year="2025", month="12", grid=grid, actor=self.admin)
+        self.assertEqual((result.created, result.updated, result.cells), (2, 0, 4))
+        for u in self.users:
+            schedule = Schedule.objects.get(user=u, year="2025", month="12")
+            self.assertEqual((schedule.d1_id, schedule.d2_id, schedule.d3_id), (self.regular.id, None, self.holiday.id))
+            self.assertEqual(
+                sorted(ModuleUsage.objects.filter(schedule=schedule).values_list("module_id", "days")),
+                sorted([(self.regular.id, 0b1), (self.holiday.id, 0b100)]),
+            )
+        self.assertEqual(
+            AttendanceDay.objects.filter(record_day=date(2025, 12, 1), module=self.regular).count(), 2,
+        )
+
+
+class ScheduleGridPayloadTests(MonthFixtureTestCase):
+    """근무표 압축 그리드 저장: 팔레트 + 팔레트 번호 배열."""
+
+    def post(self, payload):
+        request = RequestFactory().post(
+            "/wtm/schedule_grid/202511/", data=json.dumps(payload), content_type="application/json",
+        )
+        request.user = self.admin
+        request._messages = CookieStorage(request)
+        response = work_schedule_grid(request, "202511")
+        return response.status_code, json.loads(response.content)
+
+    def grid(self):
+        palette = [None, self.regular.id, self.holiday.id, self.nopay.id]
+        rows = []
+        for user in self.users:
+            schedule = Schedule.objects.get(user=user)
+            rows.append([user.id, [palette.index(getattr(schedule, f"d{d}_id")) for d in range(1, 31)]])
+        return {"mode": "modify", "palette": palette, "rows": rows}
+
+    def test_modify_writes_changed_cells(self):
+        payload = self.grid()
+        payload["rows"][0][1][0] = 3  # 직원0 1일 → 무급
+        status, body = self.post(payload)
+        self.assertEqual((status, body["ok"], body["cells"], body["updated"]), (200, True, 1, 1))
+        self.assertEqual(Schedule.objects.get(user=self.users[0]).d1_id, self.nopay.id)
+
+        status, body = self.post(payload)
+        self.assertEqual(body["cells"], 0)
+
+    def test_rejects_invalid_payload(self):
+        other = Branch.objects.create(code="B", name="Branch B")
+        foreign = Module.objects.create(
+            cat="소정근로", name="타지점", start_time="09:00", end_time="18:00",
+            rest1_start_time="-", rest1_end_time="-", rest2_start_time="-", rest2_end_time="-", color=1,
+            reg_id=self.admin, reg_date=timezone.now(), mod_id=self.admin, mod_date=timezone.now(), branch=other,
+        )
+        cases = []
+        payload = self.grid()
+        payload["palette"].append(foreign.id)
+        cases.append(payload)
+        payload = self.grid()
+        payload["rows"][0][1].pop()  # 일자 수 불일치
+        cases.append(payload)
+        payload = self.grid()
+        payload["rows"][0][1][0] = 9  # 팔레트 범위 밖
+        cases.append(payload)
+        payload = self.grid()
+        payload["mode"] = "reg"  # 이미 근무표가 있음
+        cases.append(payload)
+
+        before = sorted(Schedule.objects.values_list("user_id", *[f"d{d}_id" for d in range(1, 31)]))
+        for payload in cases:
+            status, body = self.post(payload)
+            self.assertEqual((status, body["ok"]), (400, False), payload)
+        self.assertEqual(sorted(Schedule.objects.values_list("user_id", *[f"d{d}_id" for d in range(1, 31)])), before)
+
+
+class ScheduleCellTests(MonthFixtureTestCase):
+    """근무표 셀 1칸 수정: dN 컬럼만 조건부 UPDATE + 역인덱스/근태 직접 갱신."""
+
+    attendance = ScheduleSaveTests.attendance
+    usage = ScheduleSaveTests.usage
+    assert_derived_state_fresh = ScheduleSaveTests.assert_derived_state_fresh
+
+    def patch(self, payload):
+        request = RequestFactory().patch(
+            "/wtm/schedule_cell/", data=json.dumps(payload), content_type="application/json",
+        )
+        request.user = self.admin
+        response = work_schedule_cell(request)
+        return response.status_code, json.loads(response.content)
+
+    def test_single_column_conditional_update(self):
+        refresh_attendance(branch=self.branch, year=self.YEAR, month=self.MONTH, user_ids=[u.id for u in self.users])
+        user = self.users[0]
+        prev = Schedule.objects.get(user=user).d4_id
+
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as ctx:
+            status, body = self.patch({
+                "user_id": user.id, "stand_date": f"{self.YEAR}{self.MONTH:02d}04",
+                "module_id": self.nopay.id, "prev_module_id": prev,
+            })
+        self.assertEqual((status, body["ok"], body["changed"]), (200, True, True))
+        self.assertEqual(body["cell"]["module_id"], self.nopay.id)
+        self.assertIn('color="red"', body["cell"]["html"])
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('UPDATE "wtm_schedule"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"d4_id"', updates[0])
+        self.assertNotIn('"d5_id"', updates[0])
+        self.assertIn('"branch_id"', updates[0].split("WHERE")[1])
+        self.assertEqual(Schedule.objects.get(user=user).d4_id, self.nopay.id)
+        self.assert_derived_state_fresh()
+
+        # 같은 값이면 쓰지 않는다
+        status, body = self.patch({
+            "user_id": user.id, "stand_date": f"{self.YEAR}{self.MONTH:02d}04", "module_id": self.nopay.id,
+        })
+        self.assertEqual((status, body["changed"]), (200, False))
+
+    def test_stale_prev_value_is_rejected(self):
+        user = self.users[1]
+        current = Schedule.objects.get(user=user).d2_id
+        stale = self.holiday.id if current != self.holiday.id else self.regular.id
+        status, body = self.patch({
+            "user_id": user.id, "stand_date": f"{self.YEAR}{self.MONTH:02d}02",
+            "module_id": self.nopay.id, "prev_module_id": stale,
+        })
+        self.assertEqual((status, body["ok"], body["cell"]["module_id"]), (409, False, current))
+        self.assertEqual(Schedule.objects.get(user=user).d2_id, current)
+
+        result = save_schedule_cell(
+            branch=self.branch, user_id=user.id, day=date(self.YEAR, self.MONTH, 2),
+            module_id=self.nopay.id, actor=self.admin, expected=stale,
+        )
+        self.assertEqual(result.status, CELL_CONFLICT)
+
+    def test_invalid_prev_module_id_is_bad_request(self):
+        for raw in ([1], {"id": 1}, "abc"):
+            status, body = self.patch({
+                "user_id": self.users[0].id, "stand_date": f"{self.YEAR}{self.MONTH:02d}04",
+                "module_id": self.nopay.id, "prev_module_id": raw,
+            })
+            self.assertEqual((status, body), (400, {"ok": False, "msg": "invalid prev_module_id"}))
+
+    def test_clearing_cell_and_other_branch(self):
+        user = self.users[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            status, body = self.patch({
+                "user_id": user.id, "stand_date": f"{self.YEAR}{self.MONTH:02d}03", "module_id": None,
+            })
+        self.assertEqual((status, body["cell"]), (200, {"module_id": None, "color": "", "title": "", "html": ""}))
+        self.assertEqual(Schedule.objects.get(user=user).d3_id, None)
+        self.assert_derived_state_fresh()
+
+        other = Branch.objects.create(code="B", name="Branch B")
+        Schedule.objects.filter(user=self.users[1]).update(branch=other)
+        status, body = self.patch({
+            "user_id": self.users[1].id, "stand_date": f"{self.YEAR}{self.MONTH:02d}03", "module_id": self.regular.id,
+        })
+        self.assertEqual(status, 404)
+
+
+class ScheduleGridCacheTests(MonthFixtureTestCase):
+    """근무표 화면 캐시: (지점, 년월) + 버전 키, 원천 데이터가 바뀌면 다시 조립."""
+
+    def setUp(self):
+        cache.clear()
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return {"build": self.builds}
+
+    def grid(self, ym="202511", branch=None):
+        return cached_schedule_grid(branch or self.branch, ym, self.build)
+
+    def test_repeat_view_hits_cache(self):
+        self.assertEqual(self.grid(), {"build": 1})
+        with self.assertNumQueries(1):  # 버전 조회만
+            self.assertEqual(self.grid(), {"build": 1})
+
+    def test_source_changes_bump_version(self):
+        now = timezone.now()
+        changes = [
+            lambda: Schedule.objects.get(user=self.users[0]).save(),
+            lambda: save_schedule_cell(
+                branch=self.branch, user_id=self.users[0].id, day=date(2025, 11, 4),
+                module_id=self.regular.id if Schedule.objects.get(user=self.users[0]).d4_id != self.regular.id
+                else self.nopay.id, actor=self.admin,
+            ),
+            lambda: bump_schedule_grid(self.branch, "202512"),  # 다음 달 근무표(n1~n6)
+            lambda: self.regular.save(),
+            lambda: Holiday.objects.create(
+                holiday=date(2025, 11, 3), holiday_name="휴일", branch=self.branch,
+                reg_id=self.admin, reg_date=now, mod_id=self.admin, mod_date=now,
+            ),
+            lambda: self.users[1].save(),
+        ]
+        self.grid()
+        for n, change in enumerate(changes, start=2):
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            self.assertEqual(self.grid(), {"build": n})
+            self.assertEqual(self.grid(), {"build": n})
+
+    def test_unrelated_changes_keep_cache(self):
+        self.grid()
+        other = Branch.objects.create(code="B", name="Branch B")
+        bump_schedule_grid(other)
+        bump_schedule_grid(self.branch, "202510")
+        self.users[0].last_login = timezone.now()
+        self.users[0].save(update_fields=["last_login"])
+        self.assertEqual(self.grid(), {"build": 1})
+
+    def test_view_warns_from_cached_context(self):
+        context = {"stand_ym": "202511", "need_to_add": ["직원9"], "need_to_sub": []}
+        with patch("wtm.views.schedule._build_schedule_context", return_value=context) as build, \
+                patch("wtm.views.schedule.messages.warning") as warning:
+            for _ in range(2):
+                request = RequestFactory().get("/wtm/schedule/202511")
+                request.user, request.branch = self.admin, self.branch
+                request._messages = CookieStorage(request)
+                self.assertEqual(work_schedule(request, "202511").status_code, 200)
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual([c.args[1] for c in warning.call_args_list], ["근무표 추가 필요 : ['직원9']"] * 2)
+
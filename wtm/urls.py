@@ -23,6 +23,8 @@ from wtm.views.schedule import (
     work_schedule_modify,
     work_schedule_delete,
     work_schedule_popup,
+    work_schedule_grid,
+    work_schedule_cell,
 )
 from wtm.views.log import (
     work_log,
@@ -31,6 +33,8 @@ from wtm.views.log import (
 )
 from wtm.views.meal import work_meal_status, work_meal_json
 
+from wtm.views.coverage import work_coverage, work_coverage_json
+
 from wtm.views.vacation import work_vacation_json
 
 from wtm.views.etc import work_privacy
@@ -55,6 +59,8 @@ urlpatterns = [
     path('schedule_modify/<str:stand_ym>/', work_schedule_modify, name='work_schedule_modify'),
     path('schedule_delete/<str:stand_ym>/', work_schedule_delete, name='work_schedule_delete'),
     path('schedule_popup/', work_schedule_popup, name='work_schedule_popup'),
+    path('schedule_grid/<str:stand_ym>/', work_schedule_grid, name='work_schedule_grid'),
+    path('schedule_cell/', work_schedule_cell, name='work_schedule_cell'),
     path('status/', work_status, name='work_status'),
     path("status/<str:stand_ym>", work_status, name="work_status"),
     path('status/excel/', work_status_excel, name='work_status_excel'),
@@ -69,6 +75,10 @@ urlpatterns = [
     path('meal/<str:stand_ym>', work_meal_json, name='work_meal_json'),
     path('meal_status/', work_meal_status, name='work_meal_status'),
     path('meal_status/<str:stand_ym>', work_meal_status, name='work_meal_status'),
+    path('coverage/', work_coverage, name='work_coverage'),
+    path('coverage/<str:stand_ym>', work_coverage, name='work_coverage'),
+    path('coverage/json/', work_coverage_json, name='work_coverage_json'),
+    path('coverage/json/<str:stand_ym>', work_coverage_json, name='work_coverage_json'),
     path("vacation/<str:year>", work_vacation_json, name="work_vacation_json"),
     path('privacy/', work_privacy, name='work_privacy'),
 ]
\ No newline at end of file
@@ -0,0 +1,113 @@
+from calendar import monthrange
+
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.shortcuts import render
+from django.utils import timezone
+
+from wtm.services.coverage import SLOT_MINUTES, build_coverage, slot_labels
+from .helpers import fetch_base_users_for_month
+
+
+def build_coverage_grid(stand_ym: str | None, *, branch):
+    """
+    월간 시간대별 근무 인원.
+    - 대상자: 해당 월 근무표가 있는 재직자 (식대관리와 동일, 근태확인 여부 무관)
+    - 그룹: 부서 (부서 order 순), 전체 합계는 Coverage.total
+    """
+    stand_ym = stand_ym or timezone.now().strftime("%Y%m")
+    year, month = int(stand_ym[:4]), int(stand_ym[4:6])
+
+    base_users = fetch_base_users_for_month(stand_ym, branch=branch, is_contract_checked=False)
+    groups = {u["user_id"]: u["dept"] for u in base_users}
+    out_ymd_map = {u["user_id"]: u["out_ymd"] for u in base_users if u.get("out_ymd")}
+
+    coverage = build_coverage(groups=groups, year=year, month=month, branch=branch, out_ymd_map=out_ymd_map)
+    return stand_ym, coverage
+
+
+def _heat_cells(counts: list[int], peak: int) -> list[dict]:
+    # 칸 색 농도: 기준(peak) 인원 대비 비율
+    return [
+        {"slot": slot, "count": n, "alpha": f"{n / peak:.2f}" if peak else "0"}
+        for slot, n in zip(slot_labels(), counts)
+    ]
+
+
+def _parse_day(raw, stand_ym: str) -> int:
+    last_day = monthrange(int(stand_ym[:4]), int(stand_ym[4:6]))[1]
+    try:
+        day = int(raw)
+    except (TypeError, ValueError):
+        raise Http404("invalid day")
+    if not 1 <= day <= last_day:
+        raise Http404("invalid day")
+    return day
+
+
+@login_required(login_url="common:login")
+def work_coverage(request, stand_ym: str | None = None):
+    branch = getattr(request, "branch", None)
+    if branch is None:
+        raise Http404("branch code is required")
+
+    stand_ym, coverage = build_coverage_grid(stand_ym, branch=branch)
+
+    # 일자 미지정: 이번 달이면 오늘, 아니면 1일
+    today = timezone.now()
+    default_day = today.day if today.strftime("%Y%m") == stand_ym else 1
+    day = _parse_day(request.GET.get("day", default_day), stand_ym)
+
+    total = coverage.total
+    peak_day = max(total[day - 1], default=0)
+    dept_rows = [
+        {"name": name, "cells": _heat_cells(by_day[day - 1], peak_day)}
+        for name, by_day in coverage.groups.items()
+    ]
+    dept_rows.append({"is_total": True, "cells": _heat_cells(total[day - 1], peak_day)})
+
+    peak_month = max((max(counts) for counts in total), default=0)
+    day_rows = [
+        {"day": d, "cells": _heat_cells(counts, peak_month), "peak": max(counts)}
+        for d, counts in enumerate(total, start=1)
+    ]
+
+    return render(request, "wtm/work_coverage.html", {
+        "stand_ym": stand_ym,
+        "day": day,
+        "days": range(1, len(total) + 1),
+        "slots": slot_labels(),
+        "dept_rows": dept_rows,
+        "day_rows": day_rows,
+    })
+
+
+@login_required(login_url="common:login")
+def work_coverage_json(request, stand_ym: str | None = None):
+    """
+    {"stand_ym", "slot_minutes", "slots": ["00:00", ...], "groups": {부서: [[일자별 칸별 인원]]}, "total": [[...]]}
+    - ?day=N 이면 groups 값과 total은 그 날의 칸별 인원 [48]
+    - ?dept=부서 이면 groups는 그 부서만 (total은 그대로 전체)
+    """
+    branch = getattr(request, "branch", None)
+    if branch is None:
+        raise Http404("branch code is required")
+
+    stand_ym, coverage = build_coverage_grid(stand_ym or request.GET.get("stand_ym"), branch=branch)
+
+    grid = coverage.groups
+    dept = request.GET.get("dept")
+    if dept:
+        grid = {name: by_day for name, by_day in grid.items() if name == dept}
+
+    payload = {"stand_ym": stand_ym, "slot_minutes": SLOT_MINUTES, "slots": slot_labels()}
+    if request.GET.get("day"):
+        day = _parse_day(request.GET["day"], stand_ym)
+        payload["day"] = day
+        payload["groups"] = {name: by_day[day - 1] for name, by_day in grid.items()}
+        payload["total"] = coverage.total[day - 1]
+    else:
+        payload["groups"] = grid
+        payload["total"] = coverage.total
+
+    return JsonResponse(payload, json_dumps_params={"ensure_ascii": False, "separators": (",", ":")})
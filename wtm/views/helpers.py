@@ -1,8 +1,12 @@
+from bisect import bisect_right
 from django.db import connection
 from datetime import date
 from calendar import monthrange
 
+from common.loader import load
 from common.models import Holiday, Business
+from wtm.models import Contract
+from wtm.services.attendance import build_month_attendance_cube
 
 
 # 공통: cursor → dict 리스트 변환
@@ -23,78 +27,46 @@ def sec_to_hhmmss(total_seconds: int) -> str:
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
 
-def build_contracts_by_user(user_list, schedule_date, *, branch):
+class ContractTimeline:
     """
-    근무표 수정을 위한 헬퍼함수
-    wtm_contract에서 기준일자(schedule_date)까지의 계약을 한 번에 읽어서 user_id별로 정리
-    반환: { user_id: [ { 'user_id': ..., 'stand_date': date, 'mon_id': ..., ... }, ... ] }
+    근무표 작성/수정을 위한 직원별 근로계약 이력.
+    - load()로 대상 직원의 기준일자까지 계약을 한 번에 읽어 stand_date 오름차순으로 보관
+    - module_id()는 bisect로 그 날 적용되는 계약(가장 최근 stand_date)을 찾아 요일 모듈 id를 돌려준다.
     """
-    if not user_list:
-        return {}
 
-    user_ids = [str(u['id']) for u in user_list if u.get('id') is not None]
-    if not user_ids:
-        return {}
-
-    # schedule_date는 'YYYYMMDD' 문자열
-    placeholders = ",".join(["%s"] * len(user_ids))
-    query = f'''
-        SELECT
-            id,
-            user_id,
-            stand_date,
-            mon_id,
-            tue_id,
-            wed_id,
-            thu_id,
-            fri_id,
-            sat_id,
-            sun_id
-        FROM wtm_contract
-        WHERE branch_id = %s
-          AND user_id IN ({placeholders})
-          AND DATE_FORMAT(stand_date, '%%Y%%m%%d') <= %s
-        ORDER BY user_id, stand_date
-    '''
-    params = [branch.id, *user_ids, schedule_date]
-
-    contracts_by_user: dict[int, list[dict]] = {}
-
-    with connection.cursor() as cursor:
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        cols = [col[0] for col in cursor.description]
-
-    for row in rows:
-        d = dict(zip(cols, row))
-        # stand_date를 date 타입으로 통일
-        if hasattr(d["stand_date"], "date"):
-            d["stand_date"] = d["stand_date"].date()
-        contracts_by_user.setdefault(d["user_id"], []).append(d)
-
-    return contracts_by_user
-
-
-def get_contract_module_id(contracts, target_date, weekday_eng: str):
-    """
-    근무표 수정을 위한 헬퍼함수
-    해당 직원의 계약 리스트(contracts)에서
-    target_date 기준으로 가장 최근 stand_date의 weekday_eng(mon/tue/...) 모듈 id를 찾아준다.
-    """
-    if not contracts:
-        return None
-
-    field = f"{weekday_eng}_id"
-    latest_val = None
-
-    for c in contracts:
-        if c["stand_date"] <= target_date:
-            latest_val = c.get(field)
-        else:
-            # stand_date 오름차순 정렬되어 있으니 여기서 끊어도 됨
-            break
+    # date.weekday() 순서 (0=월 ~ 6=일)
+    WEEKDAY_FIELDS = ("mon_id", "tue_id", "wed_id", "thu_id", "fri_id", "sat_id", "sun_id")
+
+    def __init__(self, rows=()):
+        self._dates: dict[int, list[date]] = {}
+        self._modules: dict[int, list[tuple]] = {}
+        for user_id, stand_date, *module_ids in rows:
+            self._dates.setdefault(user_id, []).append(stand_date)
+            self._modules.setdefault(user_id, []).append(tuple(module_ids))
+
+    @classmethod
+    def load(cls, user_ids, until: date, *, branch) -> "ContractTimeline":
+        """user_ids의 until(포함)까지 계약 전체. ORM 왕복: Contract(1), 대상이 없으면 0"""
+        user_ids = [uid for uid in user_ids if uid is not None]
+        if not user_ids:
+            return cls()
+        rows = (
+            Contract.objects
+            .filter(branch=branch, user_id__in=user_ids, stand_date__lte=until)
+            .order_by("user_id", "stand_date", "id")
+            .values_list("user_id", "stand_date", *cls.WEEKDAY_FIELDS)
+        )
+        return cls(rows)
 
-    return latest_val
+    def module_id(self, user_id: int, day: date):
+        """day에 적용되는 계약의 요일 모듈 id (계약 전이거나 계약이 없으면 None)"""
+        dates = self._dates.get(user_id)
+        if not dates:
+            return None
+        i = bisect_right(dates, day) - 1
+        if i < 0:
+            return None
+        return self._modules[user_id][i][day.weekday()]
 
 
 def get_non_business_days(year: int, month: int, *, branch) -> set[int]:
@@ -102,7 +74,12 @@ def get_non_business_days(year: int, month: int, *, branch) -> set[int]:
     미영업일(day int) 집합 반환.
     - Holiday(법정 공휴일)
     - Business(요일별 영업/비영업 패턴: mon~sun, 'Y'=영업, 그 외=비영업)
+    - 같은 요청 안에서는 (지점, 년월)별로 한 번만 조회한다.
     """
+    return set(load("non_business_days", (branch.id, year, month), lambda: _non_business_days(year, month, branch)))
+
+
+def _non_business_days(year: int, month: int, branch) -> frozenset[int]:
     first_day = date(year, month, 1)
     last_day = date(year, month, monthrange(year, month)[1])
 
@@ -140,7 +117,7 @@ def get_non_business_days(year: int, month: int, *, branch) -> set[int]:
         if is_holiday or (not open_flag):
             non_business_days.add(day)
 
-    return non_business_days
+    return frozenset(non_business_days)
 
 
 def fetch_base_users_for_month(stand_ym: str, *, branch, is_contract_checked: bool = True) -> list[dict]:
@@ -149,7 +126,17 @@ def fetch_base_users_for_month(stand_ym: str, *, branch, is_contract_checked: bo
     - 근태확인(check_yn='Y') 여부는 is_contract_checked
     - 근무표 존재하는 사람만
     - 부서/직위 order + 입사일, 이름 순으로 정렬
+    - 같은 요청 안에서는 (지점, 년월, 계약확인 여부)별로 한 번만 조회한다.
     """
+    base_users = load(
+        "base_users",
+        (branch.id, stand_ym, is_contract_checked),
+        lambda: _fetch_base_users_for_month(stand_ym, branch, is_contract_checked),
+    )
+    return [dict(u) for u in base_users]
+
+
+def _fetch_base_users_for_month(stand_ym: str, branch, is_contract_checked: bool) -> list[dict]:
     year, month = int(stand_ym[:4]), int(stand_ym[4:6])
     first_day = f"{year:04d}{month:02d}01"
     last_day  = f"{year:04d}{month:02d}{monthrange(year, month)[1]:02d}"
@@ -305,3 +292,21 @@ def fetch_log_users_for_day(stand_day: str, *, branch):
         }
         for row in rows
     ]
+
+
+def load_month_cube(stand_ym: str, *, branch):
+    """
+    근태기록-월간집계(전체/지표별/엑셀) 공통: 대상 직원 + 월 근태 큐브를 한 번에 준비.
+    반환: (base_users, cube)
+    """
+    year, month = int(stand_ym[:4]), int(stand_ym[4:6])
+    base_users = fetch_base_users_for_month(stand_ym, branch=branch)
+    cube = build_month_attendance_cube(
+        users=[u["user_id"] for u in base_users],
+        year=year,
+        month=month,
+        branch=branch,
+        # 퇴사일자 이후의 근무표는 무시하기 위해 해당 정보를 전달
+        out_ymd_map={u["user_id"]: u.get("out_ymd") for u in base_users},
+    )
+    return base_users, cube
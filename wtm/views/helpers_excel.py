@@ -9,9 +9,9 @@ from django.db import connection
 
 from common import context_processors
 from common.models import Holiday
-from ..services.attendance import build_monthly_metric_details_for_users
-from ..models import Module, Schedule
-from .helpers import sec_to_hhmmss, fetch_base_users_for_month, get_non_business_days
+from ..models import Schedule
+from wtm.services.attendance import branch_modules
+from .helpers import sec_to_hhmmss, get_non_business_days, load_month_cube
 
 
 EXCEL_HEADER_BG = "FFA8E5E8"     # #A8E5E8
@@ -36,9 +36,11 @@ def set_table_border(ws, min_row: int, max_row: int, min_col: int, max_col: int)
             cell.border = thin_border
 
 
-def metric_excel_data(stand_ym: str, metric: str, *, branch) -> dict:
+def metric_excel_data(stand_ym: str, metric: str, *, branch, month_data=None, non_business_days=None) -> dict:
     """
     work_metric 화면과 동일한 데이터(월 그리드)를 엑셀용으로 구성.
+    - month_data: load_month_cube 결과 (base_users, cube). 없으면 여기서 조회/계산
+    - non_business_days: 미영업일 집합. 없으면 여기서 조회
     반환:
         {
             "metric": "late|early|overtime|holiday",
@@ -58,7 +60,7 @@ def metric_excel_data(stand_ym: str, metric: str, *, branch) -> dict:
         raise ValueError("invalid metric")
 
     year, month = int(stand_ym[:4]), int(stand_ym[4:6])
-    base_users = fetch_base_users_for_month(stand_ym, branch=branch)
+    base_users, cube = month_data or load_month_cube(stand_ym, branch=branch)
     day_list = context_processors.get_day_list(stand_ym)
 
     if not base_users:
@@ -72,14 +74,7 @@ def metric_excel_data(stand_ym: str, metric: str, *, branch) -> dict:
             "rows": [],
         }
 
-    uid_list = [u["user_id"] for u in base_users]
-    detail_map = build_monthly_metric_details_for_users(
-        users=uid_list,
-        year=year,
-        month=month,
-        metric=metric,
-        branch=branch,
-    )
+    detail_map = cube.metric_details(metric)
 
     days_order = list(range(1, monthrange(year, month)[1] + 1))
     rows = []
@@ -94,7 +89,8 @@ def metric_excel_data(stand_ym: str, metric: str, *, branch) -> dict:
             "cells": cell_seconds,
         })
 
-    non_business_days = get_non_business_days(year, month, branch=branch)
+    if non_business_days is None:
+        non_business_days = get_non_business_days(year, month, branch=branch)
 
     return {
         "metric": metric,
@@ -194,9 +190,10 @@ def write_metric_sheet(ws, data: dict) -> None:
     set_table_border(ws, 1, ws.max_row, 1, 4 + last_day)
 
 
-def schedule_excel_data(stand_ym: str, *, branch) -> dict:
+def schedule_excel_data(stand_ym: str, *, branch, non_business_days=None) -> dict:
     """
     schedule.py / work_schedule.html 표를 엑셀용으로 구성
+    - non_business_days: 미영업일 집합. 없으면 여기서 조회
     """
     year, month = int(stand_ym[:4]), int(stand_ym[4:6])
     last_day = monthrange(year, month)[1]
@@ -267,7 +264,7 @@ def schedule_excel_data(stand_ym: str, *, branch) -> dict:
         )
     }
 
-    module_map = {m.id: {"cat": m.cat, "name": m.name} for m in Module.objects.filter(branch=branch)}
+    module_map = {mid: {"cat": m.cat, "name": m.name} for mid, m in branch_modules(branch).items()}
 
     rows = []
     for u in base_users:
@@ -314,7 +311,8 @@ def schedule_excel_data(stand_ym: str, *, branch) -> dict:
             "days": day_values,
         })
 
-    non_business_days = get_non_business_days(year, month, branch=branch)
+    if non_business_days is None:
+        non_business_days = get_non_business_days(year, month, branch=branch)
 
     return {
         "stand_ym": stand_ym,
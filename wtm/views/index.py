@@ -35,10 +35,10 @@ def index(request, stand_day=None):
     query = f'''
         SELECT u.dept, u.position, u.emp_name,
             m.start_time, m.end_time,
-            case when STR_TO_DATE(m.start_time, '%%H:%%i') <= STR_TO_DATE('13:00', '%%H:%%i') then 1
+            case when m.start_min <= 780 then 1  -- 13:00 이전 시업
                 else 0
             end as am,
-            case when STR_TO_DATE(m.end_time, '%%H:%%i') >= STR_TO_DATE('14:00', '%%H:%%i') then 1
+            case when m.end_min >= 840 then 1  -- 14:00 이후 종업
                 else 0
             end as pm,
             d.order as do, p.order as po
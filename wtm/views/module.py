@@ -8,6 +8,7 @@ from django.utils import timezone
 
 from ..models import Module
 from ..forms import ModuleForm
+from wtm.services.schedule_cache import bump_schedule_grid
 
 
 @login_required(login_url='common:login')
@@ -38,6 +39,7 @@ def work_module_reorder(request):
 
         for idx, mid in enumerate(ids, start=1):
             Module.objects.filter(id=mid, branch=request.user.branch).update(order=idx)
+        bump_schedule_grid(request.user.branch)  # update()는 시그널이 없음
 
     return JsonResponse({'ok': True})
 
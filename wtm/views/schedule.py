@@ -1,25 +1,206 @@
+import json
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.template.loader import render_to_string
 from django.shortcuts import render, redirect
 from django.db import connection, transaction
 from django.utils import timezone
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from common.models import User
 from common import context_processors
-from ..models import Module, Schedule, Contract
-from .helpers import build_contracts_by_user, get_contract_module_id, get_non_business_days
+from ..models import Module, Schedule
+from wtm.services.attendance import branch_modules, schedule_window
+from wtm.services.schedule_cache import cached_schedule_grid
+from wtm.services.schedule_save import (
+    CELL_CHANGED, CELL_CONFLICT, CELL_MISSING, ScheduleSaveResult, save_schedule_cell, save_schedule_grid,
+)
+from .helpers import ContractTimeline, get_non_business_days
+
+
+def _off_module_id(branch):
+    """휴무일(미영업일+공휴일)에 넣을 OFF 모듈 id (없으면 None)"""
+    return (
+        Module.objects.filter(branch=branch, cat='OFF')
+        .order_by('id')
+        .values_list('id', flat=True)
+        .first()
+    )
 
 
-def work_schedule(request, stand_ym=None):
-    branch = request.branch
-    # 기준년월 값이 없으면 현재로 세팅
-    if stand_ym is None:
-        stand_ym = str(datetime.today().year) + str(datetime.today().month).zfill(2)
+def _schedule_cells(ym: str, day_keys, *, branch) -> dict[int, dict[str, int | None]]:
+    """ym 근무표 전체를 한 번에 읽어 {user_id: {일자 key: 모듈 id}}. ORM 왕복: Schedule(1)"""
+    day_keys = list(day_keys)
+    rows = Schedule.objects.filter(year=ym[0:4], month=ym[4:6], branch=branch).values_list(
+        'user_id', *[f'd{key}_id' for key in day_keys]
+    )
+    return {user_id: dict(zip(day_keys, module_ids)) for user_id, *module_ids in rows}
+
+
+def _contract_cells(user: dict, ym: str, day_keys, holidays, off_module_id, timeline: ContractTimeline) -> dict:
+    """
+    근무표가 없는 직원의 일자별 기본 근로모듈 {일자 key: 모듈 id}
+    - 입사 전이나 최종근로일 후: None
+    - 휴무일(미영업일+공휴일): OFF 모듈
+    - 그 외: 그 날 적용되는 근로계약의 요일 모듈
+    """
+    cells = {}
+    for key in day_keys:
+        ymd = ym + key.zfill(2)
+        if ymd < user['join_date'] or (user['out_date'] is not None and ymd > user['out_date']):
+            cells[key] = None
+        elif int(key) in holidays:
+            cells[key] = off_module_id
+        else:
+            cells[key] = timeline.module_id(user['id'], datetime.strptime(ymd, "%Y%m%d").date())
+    return cells
+
+
+def _fill_next_month(user_list, next_ym, next_day_list, next_holiday_list, off_module_id, timeline, *, branch):
+    """
+    다음달 첫 일요일까지(n1 ~ n6) 근로모듈 매핑
+    - 다음달 근무표가 있으면 근무표에서, 없으면 휴무일(미영업일+공휴일) 세팅 및 근로계약에서 가져옴
+    """
+    next_cells = _schedule_cells(next_ym, next_day_list, branch=branch)
+    for user in user_list:
+        cells = next_cells.get(user['id'])
+        if cells is None:
+            cells = _contract_cells(user, next_ym, next_day_list, next_holiday_list, off_module_id, timeline)
+        for key, module_id in cells.items():
+            user['n' + key] = module_id
+
+
+def _save_posted_grid(request, branch, stand_ym: str, schedule_list, existing_user_ids) -> ScheduleSaveResult:
+    """
+    화면에서 넘어온 그리드(이번달 d1~말일 + 다음달 첫 일요일까지 n1~n6)를 바뀐 셀만 저장
+    - 이번달: 기존 근무표가 있거나, 입사월이 stand_ym 이전인 직원만
+    - 다음달: 말일이 일요일이 아니고, 최종근로일이 다음달 이후인 직원만 (d1 ~ d{일요일} ← n1 ~ n{일요일})
+    """
+    schedule_date = stand_ym + str(context_processors.get_last_day(stand_ym))
+    last_day_weekday = context_processors.get_days(schedule_date)  # 0=월 ~ 6=일
+    next_ym = context_processors.get_month(stand_ym, 1)[0:6]  # 다음달 'YYYYMM'
+    last_day_of_month = int(schedule_date[6:8])  # 말일(28/29/30/31)
+    days_to_copy = 0 if last_day_weekday == 6 else 6 - last_day_weekday
+
+    # join_date / out_date 비교용
+    users = User.objects.filter(branch=branch, id__in=[row['user_id'] for row in schedule_list]).in_bulk()
+
+    this_grid: dict[int, dict[int, int | None]] = {}
+    next_grid: dict[int, dict[int, int | None]] = {}
+    for row in schedule_list:
+        user = users.get(row['user_id'])
+        if user is None:
+            # 방어 코드: 이론상 없어야 함
+            continue
+
+        # 직원의 입사일이 stand_ym의 말일보다 크면, stand_ym 기준 근무표는 없으므로 패스 (기존 근무표는 수정)
+        if user.id in existing_user_ids or stand_ym >= user.join_date.strftime('%Y%m'):
+            this_grid[user.id] = {i: row.get(f'd{i}') for i in range(1, last_day_of_month + 1)}
+
+        # 직원의 최종근로일이 next_ym의 1일보다 작으면, next_ym 기준 근무표는 없으므로 패스
+        if days_to_copy and not (user.out_date is not None and user.out_date.strftime('%Y%m') < next_ym):
+            next_grid[user.id] = {i: row.get(f'n{i}') for i in range(1, days_to_copy + 1)}
+
+    now = timezone.now()
+    result = save_schedule_grid(
+        branch=branch, year=stand_ym[0:4], month=stand_ym[4:6], grid=this_grid, actor=request.user, now=now,
+    )
+    if next_grid:
+        result += save_schedule_grid(
+            branch=branch, year=next_ym[0:4], month=next_ym[4:6], grid=next_grid, actor=request.user, now=now,
+        )
+    return result
+
+
+def _commit_grid(request, branch, stand_ym: str, schedule_list, *, replace: bool):
+    """
+    근무표 등록/수정 공통 저장. 반환: (오류 메시지 | None, ScheduleSaveResult | None)
+    - 등록(replace=False): 이번달 근무표가 이미 있는 직원이 한 명이라도 있으면 '중복된 근무표입니다.'
+    - 수정(replace=True): 이번 그리드에 없는 직원의 이번달 근무표는 삭제
+    """
+    # stand_ym 기준 기존 근무표가 입력되어 있는 user_id 전체
+    existing_users_this_month = set(
+        Schedule.objects.filter(year=stand_ym[0:4], month=stand_ym[4:6], branch=branch)
+        .values_list('user_id', flat=True)
+    )
+    post_user_ids = {row['user_id'] for row in schedule_list}
+
+    if not replace and existing_users_this_month & post_user_ids:
+        return '중복된 근무표입니다.', None
 
+    with transaction.atomic():
+        # 삭제 대상: 기존에는 있었는데, 이번 그리드에는 없는 직원
+        users_to_delete = existing_users_this_month - post_user_ids
+        if replace and users_to_delete:
+            Schedule.objects.filter(
+                year=stand_ym[0:4],
+                month=stand_ym[4:6],
+                user_id__in=users_to_delete,
+                branch=branch,
+            ).delete()
+
+        result = _save_posted_grid(request, branch, stand_ym, schedule_list, existing_users_this_month)
+    return None, result
+
+
+def _parse_grid_payload(payload, *, branch, stand_ym: str) -> list[dict]:
+    """
+    압축 그리드(JSON) → schedule_list ({'user_id', 'd1'~, 'n1'~}, _commit_grid 입력)
+    payload: {"palette": [모듈 id | null, ...], "rows": [[user_id, [d1~말일 팔레트 번호], [n1~ 팔레트 번호]], ...]}
+    - 팔레트는 지점 근로모듈 집합과 한 번에 대조 (조회 1회), 셀은 팔레트 번호 범위만 확인
+    - 형식 오류는 ValueError(메시지)
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("invalid payload")
+    palette = payload.get('palette')
+    rows = payload.get('rows')
+    if not isinstance(palette, list) or not isinstance(rows, list):
+        raise ValueError("palette, rows가 필요합니다.")
+
+    module_ids = {m for m in palette if m is not None}
+    if not all(type(m) is int for m in module_ids):
+        raise ValueError("invalid palette")
+    allowed = set(Module.objects.filter(branch=branch, id__in=module_ids).values_list('id', flat=True))
+    if module_ids - allowed:
+        raise ValueError("지점에 속하지 않은 근로모듈입니다.")
+
+    schedule_date = stand_ym + str(context_processors.get_last_day(stand_ym))
+    last_day_weekday = context_processors.get_days(schedule_date)
+    last_day_of_month = int(schedule_date[6:8])
+    days_to_copy = 0 if last_day_weekday == 6 else 6 - last_day_weekday
+    size = len(palette)
+
+    def cells(values, length):
+        if not isinstance(values, list) or len(values) != length:
+            raise ValueError("일자 수가 맞지 않습니다.")
+        if not all(type(v) is int and 0 <= v < size for v in values):
+            raise ValueError("invalid palette index")
+        return [palette[v] for v in values]
+
+    schedule_list = []
+    seen = set()
+    for row in rows:
+        if not isinstance(row, list) or len(row) not in (2, 3) or type(row[0]) is not int or row[0] in seen:
+            raise ValueError("invalid row")
+        seen.add(row[0])
+        item = {'user_id': row[0]}
+        for i, module_id in enumerate(cells(row[1], last_day_of_month), start=1):
+            item[f'd{i}'] = module_id
+        for i, module_id in enumerate(cells(row[2] if len(row) == 3 else [], days_to_copy), start=1):
+            item[f'n{i}'] = module_id
+        schedule_list.append(item)
+    return schedule_list
+
+
+def _build_schedule_context(stand_ym, *, branch):
+    """
+    근무표 화면 컨텍스트 조립 (직원 SQL + 근무표 + 근로모듈 + 근무표/직원현황 불일치 점검)
+    결과는 (지점, 년월)별로 캐시되므로 요청(사용자/메시지)에 의존하는 값은 넣지 않는다.
+    """
     # stand_ym 기준 근무표가 없으면 패스
-    if Schedule.objects.filter(year=stand_ym[0:4], month=stand_ym[4:6], branch=branch).count() == 0:
-        return render(request, 'wtm/work_schedule.html', {'stand_ym': stand_ym})
+    if not Schedule.objects.filter(year=stand_ym[0:4], month=stand_ym[4:6], branch=branch).exists():
+        return {'stand_ym': stand_ym}
 
     day_list = context_processors.get_day_list(stand_ym)  # ex) {'1':'목', '2':'금', ..., '31':'토'}
 
@@ -73,28 +254,11 @@ def work_schedule(request, stand_ym=None):
                 i = i + 1
             schedule_list.append(d)
 
-    # 이번달 / 다음달 근무표를 한 번에 가져와서 user_id별로 묶기
+    # 이번달 1일 ~ 기준 일요일(schedule_date) 근무표를 한 번에 가져와서 user_id별로 묶기 (다음달 n1 ~ n6 포함)
     user_ids = [row["id"] for row in schedule_list]
-
-    # 이번달 근무표
-    schedules_qs = Schedule.objects.filter(
-        year=stand_ym[0:4],
-        month=stand_ym[4:6],
-        user_id__in=user_ids,
-        branch=branch,
-    )
-    schedule_map = {s.user_id: s for s in schedules_qs}
-
-    # 다음달 근무표 (말일이 일요일이 아닐 때만)
-    next_schedule_map = {}
-    if next_ym is not None:
-        next_schedules_qs = Schedule.objects.filter(
-            year=next_ym[0:4],
-            month=next_ym[4:6],
-            user_id__in=user_ids,
-            branch=branch,
-        )
-        next_schedule_map = {s.user_id: s for s in next_schedules_qs}
+    window_start = datetime.strptime(f"{stand_ym}01", "%Y%m%d").date()
+    window_end = datetime.strptime(schedule_date, "%Y%m%d").date() + timedelta(days=1)
+    _, schedule_map, _ = schedule_window(user_ids, window_start, window_end, branch=branch)
 
     # 모듈 전체를 한 번에 가져와서 "id,cat,name,start,end,color" 문자열로 매핑
     module_list = list(Module.objects.filter(branch=branch))  # 나중에 context에도 그대로 사용
@@ -109,21 +273,10 @@ def work_schedule(request, stand_ym=None):
     for row in schedule_list:
         uid = row["id"]
 
-        # 이번달 근무표 row (있으면)
-        sched = schedule_map.get(uid)
-        if sched is not None:
-            # d1 ~ d31
-            for i in range(1, 32):
-                module_id = getattr(sched, f"d{i}_id", None)
-                row[f"d{i}"] = module_str_map.get(module_id) if module_id else None
-
-        # 다음달 n1 ~ n6 (다음달 근무표가 있고, next_ym이 있는 경우만)
-        if next_ym is not None:
-            next_sched = next_schedule_map.get(uid)
-            if next_sched is not None:
-                for i in range(1, 7):
-                    module_id = getattr(next_sched, f"d{i}_id", None)
-                    row[f"n{i}"] = module_str_map.get(module_id) if module_id else None
+        # 이번달 d1 ~ d31 / 다음달 n1 ~ n6 (근무표가 있는 월의 일자만)
+        for rd, module_id in schedule_map.get(uid, {}).items():
+            key = f"d{rd.day}" if rd.month == window_start.month else f"n{rd.day}"
+            row[key] = module_str_map.get(module_id) if module_id else None
 
         # 직전 직원의 부서명과 비교해서 같으면 'N'을 다르면 'Y' 세팅
         row['dept_diff'] = ('N' if pre_dept == row['dept'] else 'Y')
@@ -163,10 +316,6 @@ def work_schedule(request, stand_ym=None):
         for r in results:
             need_to_add.append(r[0])
 
-    if schedule_list and need_to_add:
-        messages.warning(request, f'근무표 추가 필요 : {need_to_add}')
-        redirect('wtm:work_schedule', stand_ym=stand_ym)
-
     # 근무표와 직원현황이 다른 경우 2 : 근무표 작성 이후 삭제 또는 입사일 변경 등 직원이 있는 경우 (schedule minus user)
     raw_query = '''
         SELECT DISTINCT u.emp_name
@@ -198,11 +347,7 @@ def work_schedule(request, stand_ym=None):
         for r in results:
             need_to_sub.append(r[0])
 
-    if schedule_list and need_to_sub:
-        messages.warning(request, f'근무표 제외 필요 : {need_to_sub}')
-        redirect('wtm:work_schedule', stand_ym=stand_ym)
-
-    context = {
+    return {
         'schedule_list': schedule_list,
         'stand_ym': stand_ym,
         'day_list': day_list,
@@ -211,190 +356,35 @@ def work_schedule(request, stand_ym=None):
         'next_day_list': next_day_list,
         'next_holiday_list': next_holiday_list,
         'module_list': module_list,  # 위에서 만든 list 재사용
+        'need_to_add': need_to_add if schedule_list else [],
+        'need_to_sub': need_to_sub if schedule_list else [],
     }
+
+
+def work_schedule(request, stand_ym=None):
+    branch = request.branch
+    # 기준년월 값이 없으면 현재로 세팅
+    if stand_ym is None:
+        stand_ym = str(datetime.today().year) + str(datetime.today().month).zfill(2)
+
+    # 근무표/근로모듈/직원/공휴일/영업일이 바뀌지 않았으면 캐시된 컨텍스트 사용 (schedule_cache 참고)
+    context = cached_schedule_grid(branch, stand_ym, lambda: _build_schedule_context(stand_ym, branch=branch))
+
+    # 근무표와 직원현황이 다른 경우 안내
+    if context.get('need_to_add'):
+        messages.warning(request, f'근무표 추가 필요 : {context["need_to_add"]}')
+    if context.get('need_to_sub'):
+        messages.warning(request, f'근무표 제외 필요 : {context["need_to_sub"]}')
     return render(request, 'wtm/work_schedule.html', context)
 
 
 @login_required(login_url='common:login')
 def work_schedule_reg(request, stand_ym):
+    # 저장은 work_schedule_grid (압축 그리드 JSON)
     branch = request.user.branch
-    if request.method == 'POST':
-        # -----------------------------
-        # 1. POST 데이터 파싱
-        #    sch_{user_id}_{day} → user별 row(dict) 구성
-        #    값은 Module 객체 대신 "모듈 id(int)"만 저장
-        # -----------------------------
-        def empty_row(user_id: int | None = None):
-            base = {f'd{i}': None for i in range(1, 32)}  # d1 ~ d31
-            base.update({f'n{i}': None for i in range(1, 7)})  # n1 ~ n6
-            base['user_id'] = user_id
-            return base
-
-        rows_by_user: dict[int, dict] = {}
-
-        allowed_module_ids = set(
-            Module.objects.filter(branch=branch).values_list("id", flat=True)
-        )
-
-        for key, value in request.POST.items():
-            if not key.startswith('sch_'):
-                continue
-
-            # key 형식: sch_{user_id}_{day}
-            # 예: sch_15_1, sch_15_31, sch_15_n1 ...
-            _, user_id_str, day_key = key.split('_', 2)
-            user_id = int(user_id_str)
-
-            row = rows_by_user.get(user_id)
-            if row is None:
-                row = empty_row(user_id)
-                rows_by_user[user_id] = row
-
-            module_id = int(value) if value else None
-            if module_id is not None and module_id not in allowed_module_ids:
-                messages.error(request, "지점에 속하지 않은 근로모듈입니다.")
-                return redirect('wtm:work_schedule', stand_ym=stand_ym)
-
-            if day_key.startswith('n'):
-                # n1 ~ n6
-                row[day_key] = module_id
-            else:
-                # 이번달은 d1 ~ d31 로 매핑
-                row[f'd{day_key}'] = module_id
-
-        schedule_list = list(rows_by_user.values())
-
-        # POST로 넘어온 게 없으면 바로 목록으로
-        if not schedule_list:
-            return redirect('wtm:work_schedule', stand_ym=stand_ym)
-
-        # -----------------------------
-        # 2. 기존 근무표 중복 체크
-        # -----------------------------
-        existing_users_this_month = set(
-            Schedule.objects.filter(year=stand_ym[0:4], month=stand_ym[4:6], branch=branch)
-            .values_list('user_id', flat=True)
-        )
 
-        post_user_ids = {row['user_id'] for row in schedule_list}
-        duplicated_users = existing_users_this_month & post_user_ids
-
-        # 기존 코드: 한 명이라도 있으면 '중복된 근무표입니다.' 찍고 바로 work_schedule로
-        if duplicated_users:
-            messages.error(request, '중복된 근무표입니다.')
-            return redirect('wtm:work_schedule', stand_ym=stand_ym)
-
-        # -----------------------------
-        # 3. 공통 날짜 정보 (말일/요일/다음달 등)
-        # -----------------------------
-        # 예: stand_ym = '202512' → '20251231' 같은 형태
-        schedule_date = stand_ym + str(context_processors.get_last_day(stand_ym))
-        last_day_weekday = context_processors.get_days(schedule_date)  # 0=월 ~ 6=일
-        next_ym = context_processors.get_month(stand_ym, 1)[0:6]  # 다음달 'YYYYMM'
-        last_day_of_month = int(schedule_date[6:8])  # 말일(28/29/30/31)
-
-        # -----------------------------
-        # 4. User / 다음달 Schedule 한 번에 로딩
-        # -----------------------------
-        users = User.objects.filter(branch=branch, id__in=post_user_ids).in_bulk()  # {id: User}
-
-        next_schedule_map: dict[int, Schedule] = {}
-        days_to_copy = 0
-        if last_day_weekday != 6:
-            # 다음달 근무표는 d1 ~ d(일요일까지)만 사용
-            days_to_copy = 6 - last_day_weekday
-            next_qs = Schedule.objects.filter(
-                year=next_ym[0:4],
-                month=next_ym[4:6],
-                user_id__in=post_user_ids,
-                branch=branch,
-            )
-            next_schedule_map = {s.user_id: s for s in next_qs}
-
-        now = timezone.now()
-
-        # -----------------------------
-        # 5. 트랜잭션 내에서 이번달 + 다음달 저장
-        # -----------------------------
-        with transaction.atomic():
-            for row in schedule_list:
-                user_id = row['user_id']
-                user = users.get(user_id)
-                if user is None:
-                    # 방어 코드: 이론상 없어야 함
-                    continue
-
-                # 5-1. 이번달 근무표 insert
-                # 직원의 입사일이 stand_ym의 말일보다 크면, stand_ym 기준 근무표은 없으므로 패스
-                if stand_ym < user.join_date.strftime('%Y%m'):
-                    pass
-                else:
-                    obj1 = Schedule(
-                        user_id=user_id,
-                        year=stand_ym[0:4],
-                        month=stand_ym[4:6],
-                        branch=branch,
-                        reg_id=request.user,
-                        reg_date=now,
-                        mod_id=request.user,
-                        mod_date=now,
-                    )
-
-                    # d1 ~ d(말일) 까지만 세팅 (FK id 필드에 직접 모듈 id를 넣음)
-                    for i in range(1, last_day_of_month + 1):
-                        module_id = row.get(f'd{i}')
-                        setattr(obj1, f'd{i}_id', module_id)
-
-                    obj1.save()
-
-                # 5-2. 다음달 (첫 일요일까지) 처리
-                # 말일이 일요일이 아니면 다음달 일요일까지 입력
-                if last_day_weekday != 6:
-                    # 직원의 최종근로일이 next_ym의 1일보다 작으면, next_ym 기준 근무표는 없음
-                    if user.out_date is not None and user.out_date.strftime('%Y%m') < next_ym:
-                        continue
-
-                    obj2 = next_schedule_map.get(user_id)
-                    if obj2 is not None:
-                        # 기존 근무표 update
-                        obj2.mod_id = request.user
-                        obj2.mod_date = now
-                    else:
-                        # 새 근무표 insert
-                        obj2 = Schedule(
-                            user_id=user_id,
-                            year=next_ym[0:4],
-                            month=next_ym[4:6],
-                            branch=branch,
-                            reg_id=request.user,
-                            reg_date=now,
-                            mod_id=request.user,
-                            mod_date=now,
-                        )
-                        next_schedule_map[user_id] = obj2
-
-                    # d1 ~ d{days_to_copy} ← n1 ~ n{days_to_copy}
-                    for i in range(1, days_to_copy + 1):
-                        module_id = row.get(f'n{i}')
-                        setattr(obj2, f'd{i}_id', module_id)
-
-                    obj2.save()
-
-        messages.success(request, '근무표가 등록되었습니다.')
-
-        return redirect('wtm:work_schedule', stand_ym=stand_ym)
-
-    ###########################################
-    ############ GET방식일때 아래로 진행 ############
-    ###########################################
     day_list = context_processors.get_day_list(stand_ym)  # ex) {'1':'목', '2':'금', ..., '31':'토'}
 
-    # 직원별 근로계약 컬럼을 참조하기 위해 day_list를 요일의 영문값으로 세팅
-    week_dict = context_processors.day_of_the_week  # {'mon': '월', 'tue': '화', 'wed': '수', 'thu': '목', 'fri': '금', 'sat': '토', 'sun': '일', }
-    day_list_eng = {}
-    for key, value in day_list.items():
-        day_list_eng[key] = list(week_dict.keys())[list(week_dict.values()).index(value)]
-
     # 기준이 되는 최종 일요일(이번달 말일이 일요일인 경우 or 다음달 첫 일요일) 날짜를 지정 -> 해당 날짜 기준으로 대상 직원 추출
     schedule_date = stand_ym + list(day_list)[-1]
     last_day_weekday = context_processors.get_days(schedule_date)
@@ -439,39 +429,23 @@ def work_schedule_reg(request, stand_ym):
                 i = i + 1
             user_list.append(d)
 
-    # 직원별 계약 정보를 한 번에 불러와서 메모리에 적재
-    contracts_by_user = build_contracts_by_user(user_list, schedule_date, branch=branch)
+    # 직원별 계약 이력을 한 번에 불러와서 메모리에 적재 (일자별 적용 계약은 bisect로 찾음)
+    timeline = ContractTimeline.load(
+        [u['id'] for u in user_list], datetime.strptime(schedule_date, "%Y%m%d").date(), branch=branch,
+    )
 
     # 휴무일(미영업일+공휴일) 날짜만 추출하여 list로 만듬. ex) [1, 9, 10, 11]
     holiday_list = sorted(get_non_business_days(int(stand_ym[0:4]), int(stand_ym[4:6]), branch=branch))
 
     # 휴무일(미영업일+공휴일)은 OFF 모듈로 지정하기 위해 OFF 모듈의 ID 추출
-    off_module_list = list(
-        Module.objects.filter(branch=branch, cat='OFF').values_list('id', flat=True)
-    )
-    off_module_id = (off_module_list[0] if off_module_list else None)
+    off_module_id = _off_module_id(branch)
 
     # 부서간 구분선 표기를 위해 직전 직원의 부서명을 저장할 변수 설정
     pre_dept = None
 
     # user_list에 일자별 근로모듈을 매핑
     for user in user_list:
-        for key, value in day_list_eng.items():
-            # 입사 전이나, 최종근로일 후라면 None으로 세팅
-            if stand_ym + key.zfill(2) < user['join_date'] or (
-                    user['out_date'] is not None and stand_ym + key.zfill(2) > user['out_date']):
-                user[key] = None
-            # 휴무일(미영업일+공휴일)이면 OFF 모듈로 세팅
-            elif int(key) in holiday_list:
-                user[key] = off_module_id
-            else:
-                # 미리 불러온 계약 정보에서 찾기
-                contracts = contracts_by_user.get(user["id"])
-                if not contracts:
-                    user[key] = None
-                else:
-                    target_date = datetime.strptime(stand_ym + key.zfill(2), "%Y%m%d").date()
-                    user[key] = get_contract_module_id(contracts, target_date, value)
+        user.update(_contract_cells(user, stand_ym, day_list, holiday_list, off_module_id, timeline))
 
         # 직전 직원의 부서명과 비교해서 같으면 'N'을 다르면 'Y' 세팅
         user['dept_diff'] = ('N' if pre_dept == user['dept'] else 'Y')
@@ -483,261 +457,22 @@ def work_schedule_reg(request, stand_ym):
     # last_day_weekday가 6(일요일)이면 패스
     if last_day_weekday != 6:
         next_day_list = context_processors.get_day_list(next_ym, 6-last_day_weekday)
-        next_day_list_eng = {}
-        for key, value in next_day_list.items():
-            next_day_list_eng[key] = list(week_dict.keys())[list(week_dict.values()).index(value)]
         next_holiday_list = sorted(get_non_business_days(int(next_ym[0:4]), int(next_ym[4:6]), branch=branch))
-
-        # 기존 근무표가 입력되어 있는 user_id를 가져옴
-        next_schedule_user_list = list(
-            Schedule.objects.filter(
-                year=next_ym[0:4],
-                month=next_ym[4:6],
-                branch=branch,
-            ).values_list('user_id', flat=True)
-        )
-
-        # 근무표를 가져옴
-        next_schedule_origin = Schedule.objects.filter(
-            year=next_ym[0:4],
-            month=next_ym[4:6],
-            branch=branch,
-        )
-
-        # user_list에 일자별 근로모듈을 매핑
-        for user in user_list:
-            # 기존 근무표가 있는 경우 schedule에서 가져옴
-            if user['id'] in next_schedule_user_list:
-                for key, value in next_day_list.items():
-                    user["n"+key] = list(next_schedule_origin.filter(user_id=user['id']).values_list('d' + key + '_id', flat=True))[0]
-            # 기존 근무표가 없는 경우 휴무일(미영업일+공휴일) 세팅 및 contract에서 가져옴
-            else:
-                for key, value in next_day_list_eng.items():
-                    # 입사 전이나, 최종근로일 후라면 None으로 세팅
-                    if next_ym + key.zfill(2) < user['join_date'] or (
-                            user['out_date'] is not None and next_ym + key.zfill(2) > user['out_date']):
-                        user["n"+key] = None
-                    # 휴무일(미영업일+공휴일)이면 OFF 모듈로 세팅
-                    elif int(key) in next_holiday_list:
-                        user["n"+key] = off_module_id
-                    else:
-                        contracts = contracts_by_user.get(user["id"])
-                        if not contracts:
-                            user["n" + key] = None
-                        else:
-                            target_date = datetime.strptime(next_ym + key.zfill(2), "%Y%m%d").date()
-                            user["n" + key] = get_contract_module_id(contracts, target_date, value)
+        _fill_next_month(user_list, next_ym, next_day_list, next_holiday_list, off_module_id, timeline, branch=branch)
 
     module_list = Module.objects.filter(branch=branch).order_by('order', 'id')  # 근로모듈을 입력하기 위함
 
     context = {'stand_ym': stand_ym, 'day_list': day_list, 'user_list': user_list, 'module_list': module_list,
                'holiday_list': holiday_list, 'next_day_list': next_day_list, 'next_holiday_list': next_holiday_list,
-               'next_ym': next_ym}
+               'next_ym': next_ym, 'grid_mode': 'reg'}
     return render(request, 'wtm/work_schedule_reg.html', context)
 
 
 @login_required(login_url='common:login')
 def work_schedule_modify(request, stand_ym):
+    # 저장은 work_schedule_grid (압축 그리드 JSON)
     branch = request.user.branch
-    if request.method == 'POST':
-        # -----------------------------
-        # 1. POST 데이터 파싱
-        #    sch_{user_id}_{day}  → user별 row(dict)로 정리
-        #    값은 Module 인스턴스 대신 "모듈 id(int)"만 저장
-        # -----------------------------
-        # day 필드 초기 템플릿
-        def empty_row(user_id: int | None = None):
-            base = {f'd{i}': None for i in range(1, 32)}
-            base.update({f'n{i}': None for i in range(1, 7)})
-            base['user_id'] = user_id
-            return base
-
-        rows_by_user: dict[int, dict] = {}
-
-        allowed_module_ids = set(
-            Module.objects.filter(branch=branch).values_list("id", flat=True)
-        )
-
-        for key, value in request.POST.items():
-            if not key.startswith('sch_'):
-                continue
-
-            # key 형식: sch_{user_id}_{day}  (day: '1'~'31' 또는 'n1'~'n6')
-            _, user_id_str, day_key = key.split('_', 2)
-            user_id = int(user_id_str)
-
-            row = rows_by_user.get(user_id)
-            if row is None:
-                row = empty_row(user_id)
-                rows_by_user[user_id] = row
-
-            module_id = int(value) if value else None
-            if module_id is not None and module_id not in allowed_module_ids:
-                messages.error(request, "지점에 속하지 않은 근로모듈입니다.")
-                return redirect('wtm:work_schedule', stand_ym=stand_ym)
-
-            if day_key.startswith('n'):
-                # n1 ~ n6 그대로 사용
-                row[day_key] = module_id
-            else:
-                # 이번달은 d1 ~ d31 으로 매핑
-                row[f'd{day_key}'] = module_id
-
-        # dict → list 로 변환 (기존 schedule_list와 동일한 역할)
-        schedule_list = list(rows_by_user.values())
-
-        # -----------------------------
-        # 2. 공통 변수/정보 계산
-        # -----------------------------
-        # stand_ym 기준 기존 근무표가 입력되어 있는 user_id 전체 (삭제용)
-        existing_users_this_month = set(
-            Schedule.objects.filter(year=stand_ym[0:4], month=stand_ym[4:6], branch=branch)
-            .values_list('user_id', flat=True)
-        )
-
-        # 이번 POST에서 넘어온 user_id
-        post_user_ids = {row['user_id'] for row in schedule_list}
-
-        # 삭제 대상: 기존에는 있었는데, 이번 POST에는 없는 유저
-        users_to_delete = existing_users_this_month - post_user_ids
 
-        # 다음달 관련 계산
-        schedule_date = stand_ym + str(context_processors.get_last_day(stand_ym))
-        last_day_weekday = context_processors.get_days(schedule_date)
-        next_ym = context_processors.get_month(stand_ym, 1)[0:6]
-
-        # 한 달의 마지막 일자 (1~말일 d필드만 사용)
-        last_day_of_month = int(schedule_date[6:8])
-
-        # -----------------------------
-        # 3. 한 번에 필요한 User / Schedule 미리 로딩
-        # -----------------------------
-        from django.db import transaction
-
-        with transaction.atomic():
-            # (1) 이번달 근무표 삭제 (삭제 대상만 bulk delete)
-            if users_to_delete:
-                Schedule.objects.filter(
-                    year=stand_ym[0:4],
-                    month=stand_ym[4:6],
-                    user_id__in=users_to_delete,
-                    branch=branch,
-                ).delete()
-
-            # (2) 이번 POST에 포함된 직원 정보 / 근무표 미리 로딩
-            #     - User: join_date / out_date 비교용
-            #     - Schedule: 수정/삽입용 (select_for_update 로 락 걸어도 좋음)
-            users = User.objects.filter(branch=branch, id__in=post_user_ids).in_bulk()  # {id: User}
-
-            current_qs = Schedule.objects.filter(
-                year=stand_ym[0:4],
-                month=stand_ym[4:6],
-                user_id__in=post_user_ids,
-                branch=branch,
-            )
-            current_map = {s.user_id: s for s in current_qs}  # {user_id: Schedule}
-
-            # (3) 다음달 근무표도 미리 로딩 (말일이 일요일이 아닐 때만)
-            next_map: dict[int, Schedule] = {}
-            if last_day_weekday != 6:
-                next_qs = Schedule.objects.filter(
-                    year=next_ym[0:4],
-                    month=next_ym[4:6],
-                    user_id__in=post_user_ids,
-                    branch=branch,
-                )
-                next_map = {s.user_id: s for s in next_qs}
-
-            now = timezone.now()
-
-            # -----------------------------
-            # 4. 이번달 근무표 저장/수정
-            # -----------------------------
-            for row in schedule_list:
-                user_id = row['user_id']
-                user = users.get(user_id)
-                if user is None:
-                    # 이론상 없어야 하지만, 방어적으로
-                    continue
-
-                # 기존 근무표가 존재하는 경우: update
-                obj = current_map.get(user_id)
-                if obj is not None:
-                    obj.mod_id = request.user
-                    obj.mod_date = now
-                else:
-                    # 기존 근무표가 없는 경우 insert
-                    # 직원의 입사일이 stand_ym의 말일보다 크면, stand_ym 기준 근무표는 없으므로 패스
-                    if stand_ym < user.join_date.strftime('%Y%m'):
-                        obj = None
-                    else:
-                        obj = Schedule(
-                            user_id=user_id,
-                            year=stand_ym[0:4],
-                            month=stand_ym[4:6],
-                            branch=branch,
-                            reg_id=request.user,
-                            reg_date=now,
-                            mod_id=request.user,
-                            mod_date=now,
-                        )
-                        current_map[user_id] = obj
-
-                # 실제 d1~d(말일) 값 세팅
-                if obj is not None:
-                    for i in range(1, last_day_of_month + 1):
-                        module_id = row.get(f'd{i}')
-                        # FK: d{i}_id 에 직접 id 세팅
-                        setattr(obj, f'd{i}_id', module_id)
-                    obj.save()
-
-            # -----------------------------
-            # 5. 다음달(첫 일요일까지) 근무표 저장/수정
-            # -----------------------------
-            if last_day_weekday != 6:
-                days_to_copy = 6 - last_day_weekday  # n1 ~ n{days_to_copy} 사용
-
-                for row in schedule_list:
-                    user_id = row['user_id']
-                    user = users.get(user_id)
-                    if user is None:
-                        continue
-
-                    # 직원의 최종근로일이 next_ym의 1일보다 작으면, next_ym 기준 근무표는 없으므로 패스
-                    if user.out_date is not None and user.out_date.strftime('%Y%m') < next_ym:
-                        continue
-
-                    obj2 = next_map.get(user_id)
-                    if obj2 is not None:
-                        # 기존 근무표가 존재하는 경우: update
-                        obj2.mod_id = request.user
-                        obj2.mod_date = now
-                    else:
-                        # 기존 근무표가 없는 경우: insert
-                        obj2 = Schedule(
-                            user_id=user_id,
-                            year=next_ym[0:4],
-                            month=next_ym[4:6],
-                            branch=branch,
-                            reg_id=request.user,
-                            reg_date=now,
-                            mod_id=request.user,
-                            mod_date=now,
-                        )
-                        next_map[user_id] = obj2
-
-                    # d1 ~ d{days_to_copy} ← n1 ~ n{days_to_copy} 매핑
-                    for i in range(1, days_to_copy + 1):
-                        module_id = row.get(f'n{i}')
-                        setattr(obj2, f'd{i}_id', module_id)
-
-                    obj2.save()
-
-        messages.success(request, '근무표가 수정되었습니다.')
-
-        return redirect('wtm:work_schedule', stand_ym=stand_ym)
-
-    ############ GET방식일때 아래로 진행 ############
     # 근무표 수정 기능 설명
     # 1. 해당 stand_ym의 대상 직원 추출
     # 2. 휴무일(미영업일+공휴일) 세팅
@@ -746,12 +481,6 @@ def work_schedule_modify(request, stand_ym):
 
     day_list = context_processors.get_day_list(stand_ym)  # ex) {'1':'목', '2':'금', ..., '31':'토'}
 
-    # 직원별 근로계약 컬럼을 참조하기 위해 day_list를 요일의 영문값으로 세팅
-    week_dict = context_processors.day_of_the_week  # {'mon': '월', 'tue': '화', 'wed': '수', 'thu': '목', 'fri': '금', 'sat': '토', 'sun': '일', }
-    day_list_eng = {}
-    for key, value in day_list.items():
-        day_list_eng[key] = list(week_dict.keys())[list(week_dict.values()).index(value)]
-
     # 기준이 되는 최종 일요일(이번달 말일이 일요일인 경우 or 다음달 첫 일요일) 날짜를 지정 -> 해당 날짜 기준으로 대상 직원 추출
     schedule_date = stand_ym + list(day_list)[-1]
     last_day_weekday = context_processors.get_days(schedule_date)
@@ -801,95 +530,40 @@ def work_schedule_modify(request, stand_ym):
     holiday_list = sorted(get_non_business_days(int(stand_ym[0:4]), int(stand_ym[4:6]), branch=branch))
 
     # 휴무일(미영업일+공휴일)은 OFF 모듈로 지정하기 위해 OFF 모듈의 ID 추출
-    off_module_list = list(
-        Module.objects.filter(branch=branch, cat='OFF').values_list('id', flat=True)
-    )
-    off_module_id = (off_module_list[0] if off_module_list else None)
-
-    # 3) 이번달 근무표 전체, dict로 매핑
-    schedule_origin = Schedule.objects.filter(
-        year=stand_ym[0:4],
-        month=stand_ym[4:6],
-        branch=branch,
-    ).select_related()
-    schedule_user_list = list(schedule_origin.values_list('user_id', flat=True))
-    schedule_map = {s.user_id: s for s in schedule_origin}
-
-    # 4) 다음달(필요시) 근무표 전체, dict로 매핑 + 휴무일(미영업일+공휴일)
-    next_schedule_map = {}
-    next_schedule_user_list = []
-    if last_day_weekday != 6:
-        next_day_list = context_processors.get_day_list(next_ym, 6 - last_day_weekday)
-        next_day_list_eng = {}
-        for key, value in next_day_list.items():
-            next_day_list_eng[key] = list(week_dict.keys())[list(week_dict.values()).index(value)]
-
-        next_holiday_list = sorted(get_non_business_days(int(next_ym[0:4]), int(next_ym[4:6]), branch=branch))
+    off_module_id = _off_module_id(branch)
 
-        next_schedule_origin = Schedule.objects.filter(
-            year=next_ym[0:4],
-            month=next_ym[4:6],
-            branch=branch,
-        ).select_related()
-        next_schedule_user_list = list(next_schedule_origin.values_list('user_id', flat=True))
-        next_schedule_map = {s.user_id: s for s in next_schedule_origin}
+    # 3) 이번달 근무표 전체, {user_id: {일자 key: 모듈 id}}
+    schedule_cells = _schedule_cells(stand_ym, day_list, branch=branch)
 
-    # 5) 계약 전체를 한 번에 불러와 user별로 매핑
+    # 4) 계약 이력을 한 번에 불러와 user별로 매핑
     # schedule_date는 위에서 '기준 마지막 일자(이번달 말 or 다음달 첫 일요일)'로 세팅해 둠
-    contracts_by_user = build_contracts_by_user(user_list, schedule_date, branch=branch)
+    timeline = ContractTimeline.load(
+        [u['id'] for u in user_list], datetime.strptime(schedule_date, "%Y%m%d").date(), branch=branch,
+    )
 
     # 부서간 구분선 표기를 위해 직전 직원의 부서명을 저장할 변수 설정
     pre_dept = None
 
     # user_list에 일자별 근로모듈을 매핑
     for user in user_list:
+        cells = schedule_cells.get(user['id'])
         # 기존 근무표가 있는 경우 schedule에서 가져옴
-        if user['id'] in schedule_user_list:
+        if cells is not None:
             user['is_new'] = False
-            for key, value in day_list_eng.items():
-                user[key] = list(schedule_origin.filter(user_id=user['id']).values_list('d' + key + '_id', flat=True))[0]
+            for key, module_id in cells.items():
                 # None일 경우는 2가지 케이스(계약이 없거나, 전달에 next_ym으로 입력한 경우)인데, 후자의 경우를 위해 근로계약에서 가져옴
-                if user[key] is None:
+                if module_id is None:
                     if int(key) in holiday_list:
-                        user[key] = off_module_id
+                        module_id = off_module_id
                     else:
-                        user[key] = (
-                            Contract.objects.filter(
-                                user_id=user["id"],
-                                branch=branch,
-                                stand_date__lte=datetime.strptime(
-                                    stand_ym + key.zfill(2), "%Y%m%d"
-                                ).date(),
-                            )
-                            .order_by("-stand_date")
-                            .values_list(f"{value}_id", flat=True)
-                            .first()
-                        )
-
-        # 기존 근무표가 없는 경우 휴무일(미영업일+공휴일) 세팅 및 contract에서 가져옴달
+                        target_date = datetime.strptime(stand_ym + key.zfill(2), "%Y%m%d").date()
+                        module_id = timeline.module_id(user['id'], target_date)
+                user[key] = module_id
+
+        # 기존 근무표가 없는 경우 휴무일(미영업일+공휴일) 세팅 및 contract에서 가져옴
         else:
             user['is_new'] = True
-            for key, value in day_list_eng.items():
-                # 입사 전이나, 최종근로일 후라면 None으로 세팅
-                if stand_ym + key.zfill(2) < user['join_date'] or (
-                        user['out_date'] is not None and stand_ym + key.zfill(2) > user['out_date']):
-                    user[key] = None
-                # 휴무일(미영업일+공휴일)이면 OFF 모듈로 세팅
-                elif int(key) in holiday_list:
-                    user[key] = off_module_id
-                else:
-                    user[key] = (
-                        Contract.objects.filter(
-                            user_id=user["id"],
-                            branch=branch,
-                            stand_date__lte=datetime.strptime(
-                                stand_ym + key.zfill(2), "%Y%m%d"
-                            ).date(),
-                        )
-                        .order_by("-stand_date")
-                        .values_list(f"{value}_id", flat=True)
-                        .first()
-                    )
+            user.update(_contract_cells(user, stand_ym, day_list, holiday_list, off_module_id, timeline))
 
         # 직전 직원의 부서명과 비교해서 같으면 'N'을 다르면 'Y' 세팅
         user['dept_diff'] = ('N' if pre_dept == user['dept'] else 'Y')
@@ -901,62 +575,13 @@ def work_schedule_modify(request, stand_ym):
     # last_day_weekday가 6(일요일)이면 패스
     if last_day_weekday != 6:
         next_day_list = context_processors.get_day_list(next_ym, 6 - last_day_weekday)
-        next_day_list_eng = {}
-        for key, value in next_day_list.items():
-            next_day_list_eng[key] = list(week_dict.keys())[list(week_dict.values()).index(value)]
         next_holiday_list = sorted(get_non_business_days(int(next_ym[0:4]), int(next_ym[4:6]), branch=branch))
-
-        # 기존 근무표가 입력되어 있는 user_id를 가져옴
-        next_schedule_user_list = list(
-            Schedule.objects.filter(
-                year=next_ym[0:4],
-                month=next_ym[4:6],
-                branch=branch,
-            ).values_list('user_id', flat=True)
-        )
-
-        # 근무표를 가져옴
-        next_schedule_origin = Schedule.objects.filter(
-            year=next_ym[0:4],
-            month=next_ym[4:6],
-            branch=branch,
-        )
-
-        # user_list에 일자별 근로모듈을 매핑
-        for user in user_list:
-            # 기존 근무표가 있는 경우 schedule에서 가져옴
-            if user['id'] in next_schedule_user_list:
-                for key, value in next_day_list.items():
-                    user["n" + key] = \
-                    list(next_schedule_origin.filter(user_id=user['id']).values_list('d' + key + '_id', flat=True))[0]
-            # 기존 근무표가 없는 경우 휴무일(미영업일+공휴일) 세팅 및 contract에서 가져옴
-            else:
-                for key, value in next_day_list_eng.items():
-                    # 입사 전이나, 최종근로일 후라면 None으로 세팅
-                    if next_ym + key.zfill(2) < user['join_date'] or (
-                            user['out_date'] is not None and next_ym + key.zfill(2) > user['out_date']):
-                        user["n" + key] = None
-                    # 휴무일(미영업일+공휴일)이면 OFF 모듈로 세팅
-                    elif int(key) in next_holiday_list:
-                        user["n" + key] = off_module_id
-                    else:
-                        user["n" + key] = (
-                            Contract.objects.filter(
-                                user_id=user["id"],
-                                branch=branch,
-                                stand_date__lte=datetime.strptime(
-                                    next_ym + key.zfill(2), "%Y%m%d"
-                                ).date(),
-                            )
-                            .order_by("-stand_date")
-                            .values_list(f"{value}_id", flat=True)
-                            .first()
-                        )
+        _fill_next_month(user_list, next_ym, next_day_list, next_holiday_list, off_module_id, timeline, branch=branch)
 
     module_list = Module.objects.filter(branch=branch).order_by('order', 'id')  # 근로모듈을 입력하기 위함
     context = {'stand_ym': stand_ym, 'day_list': day_list, 'user_list': user_list, 'module_list': module_list,
                'holiday_list': holiday_list, 'next_day_list': next_day_list, 'next_holiday_list': next_holiday_list,
-               'next_ym': next_ym}
+               'next_ym': next_ym, 'grid_mode': 'modify'}
     return render(request, 'wtm/work_schedule_reg.html', context)
 
 
@@ -1029,3 +654,118 @@ def work_schedule_popup(request):
         else:
             # 근무표 화면으로
             return redirect('wtm:work_schedule', new_stand_date[0:6])
+
+
+@login_required(login_url='common:login')
+def work_schedule_grid(request, stand_ym):
+    """
+    근무표 등록/수정 화면의 저장 (압축 그리드 JSON)
+    payload: {"mode": "reg" | "modify", "palette": [...], "rows": [...]}  (_parse_grid_payload 참고)
+    응답: {"ok": true, "created": n, "updated": n, "cells": n} / 오류 시 {"ok": false, "msg": ...} (400)
+    """
+    if request.method != 'POST':
+        return JsonResponse({'ok': False, 'msg': 'POST only'}, status=405)
+    branch = request.user.branch
+
+    try:
+        payload = json.loads(request.body.decode('utf-8'))
+        mode = payload.get('mode') if isinstance(payload, dict) else None
+        if mode not in ('reg', 'modify'):
+            raise ValueError("invalid mode")
+        schedule_list = _parse_grid_payload(payload, branch=branch, stand_ym=stand_ym)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return JsonResponse({'ok': False, 'msg': 'invalid json'}, status=400)
+    except ValueError as e:
+        return JsonResponse({'ok': False, 'msg': str(e)}, status=400)
+
+    if not schedule_list:
+        return JsonResponse({'ok': True, 'created': 0, 'updated': 0, 'cells': 0})
+
+    error, result = _commit_grid(request, branch, stand_ym, schedule_list, replace=(mode == 'modify'))
+    if error:
+        return JsonResponse({'ok': False, 'msg': error}, status=400)
+
+    label = '등록' if mode == 'reg' else '수정'
+    messages.success(request, f'근무표가 {label}되었습니다. (변경 {result.cells}칸)')
+    return JsonResponse({'ok': True, 'created': result.created, 'updated': result.updated, 'cells': result.cells})
+
+
+def _cell_payload(module) -> dict:
+    """근무표 셀 1칸 표시 정보 (work_schedule.html 셀과 같은 값)"""
+    if module is None:
+        return {'module_id': None, 'color': '', 'title': '', 'html': ''}
+    cat = module.cat
+    return {
+        'module_id': module.id,
+        'color': context_processors.module_colors.get(module.color, ''),
+        'title': f'{module.name} {module.start_time}~{module.end_time}' if cat in ('소정근로', '휴일근로') else module.name,
+        'html': render_to_string('wtm/schedule_cell.html', {
+            'cat': cat, 'name': module.name, 'start_time': module.start_time, 'end_time': module.end_time,
+        }).strip(),
+    }
+
+
+def _parse_cell_payload(payload, *, branch):
+    """셀 수정 요청 → (user_id, 일자, 모듈 id | None, 이전 모듈 id 인자). 형식이 틀리면 ValueError"""
+    if not isinstance(payload, dict):
+        raise ValueError("invalid payload")
+    try:
+        user_id = int(payload['user_id'])
+        day = datetime.strptime(str(payload['stand_date']), '%Y%m%d').date()
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("invalid user_id / stand_date")
+
+    def module_or_none(raw):
+        if raw in (None, ''):
+            return None
+        try:
+            module_id = int(raw)
+        except (TypeError, ValueError):
+            raise ValueError("invalid module_id")
+        if module_id not in branch_modules(branch):
+            raise ValueError("지점에 속하지 않은 근로모듈입니다.")
+        return module_id
+
+    module_id = module_or_none(payload.get('module_id'))
+    expected = {}
+    if 'prev_module_id' in payload:
+        raw = payload['prev_module_id']
+        try:
+            expected['expected'] = None if raw in (None, '') else int(raw)
+        except (TypeError, ValueError):
+            raise ValueError("invalid prev_module_id")
+    return user_id, day, module_id, expected
+
+
+@login_required(login_url='common:login')
+def work_schedule_cell(request):
+    """
+    근무표 셀 1칸 수정 (근무표 화면 모달)
+    payload: {"user_id": n, "stand_date": "YYYYMMDD", "module_id": n | null, "prev_module_id": n | null}
+      - prev_module_id를 주면 저장된 값이 그대로일 때만 바꾼다. (아니면 409 + 현재 셀)
+    응답: {"ok": true, "changed": bool, "cell": {...}} (_cell_payload 참고) / 오류 시 {"ok": false, "msg": ...}
+    """
+    if request.method not in ('PATCH', 'POST'):
+        return JsonResponse({'ok': False, 'msg': 'PATCH only'}, status=405)
+    branch = request.user.branch
+
+    try:
+        payload = json.loads(request.body.decode('utf-8'))
+        user_id, day, module_id, expected = _parse_cell_payload(payload, branch=branch)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return JsonResponse({'ok': False, 'msg': 'invalid json'}, status=400)
+    except ValueError as e:
+        return JsonResponse({'ok': False, 'msg': str(e)}, status=400)
+
+    result = save_schedule_cell(
+        branch=branch, user_id=user_id, day=day, module_id=module_id, actor=request.user, **expected,
+    )
+    if result.status == CELL_MISSING:
+        return JsonResponse({'ok': False, 'msg': '해당 월 근무표가 없습니다.'}, status=404)
+
+    cell = _cell_payload(branch_modules(branch).get(result.module_id))
+    if result.status == CELL_CONFLICT:
+        return JsonResponse(
+            {'ok': False, 'msg': '다른 사용자가 먼저 수정했습니다. 현재 값으로 표시합니다.', 'cell': cell}, status=409,
+        )
+    return JsonResponse({'ok': True, 'changed': result.status == CELL_CHANGED, 'cell': cell})
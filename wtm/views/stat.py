@@ -12,33 +12,39 @@ from django.shortcuts import render
 from django.utils import timezone
 
 from common import context_processors
-from wtm.services.attendance import build_monthly_attendance_summary_for_users, build_monthly_metric_details_for_users
-from .helpers import sec_to_hhmmss, fetch_base_users_for_month, get_non_business_days
+from wtm.services.attendance import build_monthly_attendance_summary_for_users
+from .helpers import sec_to_hhmmss, get_non_business_days, load_month_cube, fetch_base_users_for_month
 from .helpers_excel import header_fill, header_font, header_align, set_table_border, metric_excel_data, write_metric_sheet, schedule_excel_data, write_schedule_sheet
 
 
-def build_work_status_rows(stand_ym: str | None, *, branch):
+def build_work_status_rows(
+    stand_ym: str | None, *, branch, base_users=None, summary_map=None, engine: str = "store",
+):
     """
     근태기록-월간집계(전체)에서 사용하는 rows 공통 빌더.
+    - base_users: fetch_base_users_for_month 결과. 없으면 여기서 조회
+    - summary_map: 이미 만든 월 근태 큐브의 summary(). 주면 집계를 다시 읽지 않는다 (엑셀)
+    - 집계는 월 집계(AttendanceMonth)를 읽는다. (이번 달은 일별 근태에서 집계)
+    - engine="sql"이면 DB에서 원천을 바로 집계한다. (build_monthly_attendance_summary_for_users 참고)
     """
     stand_ym = stand_ym or timezone.now().strftime("%Y%m")
     year, month = int(stand_ym[:4]), int(stand_ym[4:6])
 
-    base_users = fetch_base_users_for_month(stand_ym, branch=branch)
+    if base_users is None:
+        base_users = fetch_base_users_for_month(stand_ym, branch=branch)
     if not base_users:
         return stand_ym, []
 
-    uid_list = [u["user_id"] for u in base_users]
-    # 퇴사일자 이후의 근무표는 무시하기 위해 해당 정보를 전달
-    out_ymd_map = {u["user_id"]: u.get("out_ymd") for u in base_users}
-
-    summary_map = build_monthly_attendance_summary_for_users(
-        users=uid_list,
-        year=year,
-        month=month,
-        branch=branch,
-        out_ymd_map=out_ymd_map,
-    )
+    if summary_map is None:
+        summary_map = build_monthly_attendance_summary_for_users(
+            users=[u["user_id"] for u in base_users],
+            year=year,
+            month=month,
+            branch=branch,
+            # 퇴사일자 이후의 근무표는 무시하기 위해 해당 정보를 전달
+            out_ymd_map={u["user_id"]: u.get("out_ymd") for u in base_users},
+            engine=engine,
+        )
 
     rows = []
     for u in base_users:
@@ -101,9 +107,16 @@ def work_status_excel(request, stand_ym: str | None = None):
         6) 휴일근로
     """
     branch = request.branch
-    stand_ym, rows = build_work_status_rows(stand_ym, branch=branch)
+    stand_ym = stand_ym or timezone.now().strftime("%Y%m")
     year, month = int(stand_ym[:4]), int(stand_ym[4:6])
 
+    # 대상자 조회 + 월 근태 계산은 1회만 수행하고, 모든 시트가 같은 큐브를 읽는다.
+    month_data = load_month_cube(stand_ym, branch=branch)
+    non_business_days = get_non_business_days(year, month, branch=branch)
+    stand_ym, rows = build_work_status_rows(
+        stand_ym, branch=branch, base_users=month_data[0], summary_map=month_data[1].summary(),
+    )
+
     wb = openpyxl.Workbook()
 
     # Sheet 1: 근태기록(기존 포맷)
@@ -211,7 +224,7 @@ def work_status_excel(request, stand_ym: str | None = None):
 
     # Sheet 2: 근무표
     ws_schedule = wb.create_sheet(title="근무표")
-    schedule_data = schedule_excel_data(stand_ym, branch=branch)
+    schedule_data = schedule_excel_data(stand_ym, branch=branch, non_business_days=non_business_days)
     write_schedule_sheet(ws_schedule, schedule_data)
 
     # Sheets 3~6: 지각/조퇴/연장근로/휴일근로
@@ -223,7 +236,10 @@ def work_status_excel(request, stand_ym: str | None = None):
     ]
     for metric, title in metric_specs:
         ws_metric = wb.create_sheet(title=title)
-        metric_data = metric_excel_data(stand_ym, metric, branch=branch)
+        metric_data = metric_excel_data(
+            stand_ym, metric, branch=branch,
+            month_data=month_data, non_business_days=non_business_days,
+        )
         write_metric_sheet(ws_metric, metric_data)
 
     response = HttpResponse(
@@ -254,9 +270,9 @@ def work_metric(request, metric: str, stand_ym: str | None = None):
     stand_ym = stand_ym or timezone.now().strftime("%Y%m")
     year, month = int(stand_ym[:4]), int(stand_ym[4:6])
 
-    # 1) 대상자 공통 헬퍼
+    # 1) 대상자 + 월 근태 큐브 공통 헬퍼
     branch = request.branch
-    base_users = fetch_base_users_for_month(stand_ym, branch=branch)
+    base_users, cube = load_month_cube(stand_ym, branch=branch)
 
     if not base_users:
         return render(request, "wtm/work_metric.html", {
@@ -274,15 +290,8 @@ def work_metric(request, metric: str, stand_ym: str | None = None):
         get_non_business_days(int(stand_ym[0:4]), int(stand_ym[4:6]), branch=branch)
     )
 
-    # 3) 메트릭 디테일 계산
-    uid_list = [u["user_id"] for u in base_users]
-    detail_map = build_monthly_metric_details_for_users(
-        users=uid_list,
-        year=year,
-        month=month,
-        metric=metric,
-        branch=branch,
-    )
+    # 3) 메트릭 디테일 (큐브에서 읽기)
+    detail_map = cube.metric_details(metric)
 
     # 4) 템플릿 rows 구성 (좌측: 부서/직급/성명/횟수/합계, 오른쪽: 일자별 초)
     days_order = list(range(1, monthrange(year, month)[1] + 1))